@@ -2,8 +2,9 @@
 
 """Returns a page of data from the dataset."""
 
-import csv
-from typing import List, Tuple
+from typing import Iterator, List, Tuple
+
+from names_dataset import DatasetServer
 
 
 def index_range(page: int, page_size: int) -> Tuple[int, int]:
@@ -26,25 +27,9 @@ def index_range(page: int, page_size: int) -> Tuple[int, int]:
     return (start_index, end_index)
 
 
-class Server:
+class Server(DatasetServer):
     """Server class to paginate a database of popular baby names.
     """
-    DATA_FILE = "Popular_Baby_Names.csv"
-
-    def __init__(self):
-        self.__dataset = None
-
-    def dataset(self) -> List[List]:
-        """Cached dataset
-        """
-        if self.__dataset is None:
-            with open(self.DATA_FILE) as f:
-                reader = csv.reader(f)
-                dataset = [row for row in reader]
-            self.__dataset = dataset[1:]
-
-        return self.__dataset
-
     def get_page(self, page: int = 1, page_size: int = 10) -> List[List]:
         """Returns a page of data from the dataset."""
 
@@ -57,3 +42,35 @@ class Server:
             return []
 
         return dataset[start_index:end_index]
+
+    def iter_pages(self, page_size: int = 10) -> Iterator[List[List]]:
+        """Yields every page of the dataset in order."""
+
+        assert type(page_size) is int and page_size > 0
+
+        dataset = self.dataset()
+        for start_index in range(0, len(dataset), page_size):
+            yield dataset[start_index:start_index + page_size]
+
+    def get_pages(self, pages: List[int],
+                  page_size: int = 10) -> List[List[List]]:
+        """Returns several pages of data from the dataset at once,
+        in the order they were requested."""
+
+        assert type(page_size) is int and page_size > 0
+        assert all(type(page) is int and page > 0 for page in pages)
+        if not pages:
+            return []
+
+        dataset = self.dataset()
+        first, last = min(pages), max(pages)
+        if last - first < 2 * len(pages):
+            # Close pages: read the whole span with a single slice
+            offset = (first - 1) * page_size
+            block = dataset[offset:last * page_size]
+            return [block[start_index - offset:end_index - offset]
+                    for start_index, end_index in
+                    (index_range(page, page_size) for page in pages)]
+        return [dataset[start_index:end_index]
+                for start_index, end_index in
+                (index_range(page, page_size) for page in pages)]
@@ -3,56 +3,85 @@
 Deletion-resilient hypermedia pagination
 """
 
-import csv
-from typing import Dict, List
+from typing import Dict, Optional
 
+from live_index import IndexedDataset
+from names_dataset import DatasetServer
 
-class Server:
+
+class Server(DatasetServer):
     """Server class to paginate a database of popular baby names.
     """
-    DATA_FILE = "Popular_Baby_Names.csv"
+    INDEX = IndexedDataset
 
     def __init__(self):
-        self.__dataset = None
+        super().__init__()
         self.__indexed_dataset = None
 
-    def dataset(self) -> List[List]:
-        """Cached dataset
-        """
-        if self.__dataset is None:
-            with open(self.DATA_FILE) as f:
-                reader = csv.reader(f)
-                dataset = [row for row in reader]
-            self.__dataset = dataset[1:]
-
-        return self.__dataset
-
-    def indexed_dataset(self) -> Dict[int, List]:
+    def indexed_dataset(self) -> IndexedDataset:
         """Dataset indexed by sorting position, starting at 0
         """
+        if self.source.due():
+            self.refresh()
         if self.__indexed_dataset is None:
-            dataset = self.dataset()
-            truncated_dataset = dataset[:1000]
-            self.__indexed_dataset = {
-                i: dataset[i] for i in range(len(dataset))
-            }
+            with self.source.lock:
+                if self.__indexed_dataset is None:
+                    self.__indexed_dataset = self.INDEX(self.dataset())
         return self.__indexed_dataset
 
+    def refresh(self) -> Optional[int]:
+        """
+        Picks up the rows appended to DATA_FILE since it was loaded.
+
+        Only the new bytes are parsed. If the file was truncated or
+        rewritten instead, the cached dataset is dropped and loaded again
+        on next use (deletions are lost).
+
+        Returns:
+            int: The number of rows appended, or None after a full reload.
+        """
+        with self.source.lock:
+            appended = super().refresh()
+            if appended is None:
+                self.__indexed_dataset = None
+            elif appended and self.__indexed_dataset is not None:
+                self.__indexed_dataset.extend(appended)
+            return appended
+
+    def close(self) -> None:
+        """
+        Releases the dataset if it was opened, e.g. stops the workers of a
+        sharded one. Deletions are lost; the dataset is opened again on
+        next use.
+        """
+        with self.source.lock:
+            self.__indexed_dataset = None
+            self.source.close()
+
+    def delete(self, index: int) -> bool:
+        """
+        Deletes the row at `index` from the indexed dataset.
+
+        Returns:
+            bool: False if there was no live row at that index.
+        """
+        return self.indexed_dataset().delete(index)
+
+    def restore(self, index: int) -> bool:
+        """
+        Brings back a row previously removed with `delete`.
+
+        Returns:
+            bool: False if the index was out of range or not deleted.
+        """
+        return self.indexed_dataset().restore(index)
+
     def get_hyper_index(self, index: int = None, page_size: int = 10) -> Dict:
         """Get the hypermedia index for a given index and page size"""
         dataset = self.indexed_dataset()
-        dataset_length = len(dataset)
-        assert index is not None and 0 <= index < dataset_length
-
-        data = []
-        next_index = index
-        count = 0
-
-        while count < page_size and next_index < dataset_length:
-            if next_index in dataset:
-                data.append(dataset[next_index])
-                count += 1
-            next_index += 1
+        assert index is not None and 0 <= index < dataset.size
+
+        data, next_index = dataset.page(index, page_size)
 
         return {
             "index": index,
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Keyset (cursor) hypermedia pagination.
+
+Instead of page numbers or raw indexes, pages link to each other through
+opaque, signed cursors that hold the sorting position of the first or last
+row served. Resolving a cursor is a Fenwick tree lookup on the indexed
+dataset, so deep pages cost the same as the first one and deletions never
+shift the rows a cursor points at.
+"""
+
+import base64
+import hashlib
+import hmac
+import os
+import struct
+from typing import Dict, List, Optional, Tuple
+
+BaseServer = __import__('3-hypermedia_del_pagination').Server
+
+CURSOR_VERSION = 1
+AFTER = 0  # rows after the cursor position
+BEFORE = 1  # rows before the cursor position
+# version, direction, sorting position
+CURSOR_PAYLOAD = struct.Struct(">BBQ")
+SIGNATURE_SIZE = 16
+
+
+class Server(BaseServer):
+    """Server class to paginate a database of popular baby names
+    with keyset cursors.
+    """
+
+    def __init__(self, secret: Optional[bytes] = None):
+        """
+        Args:
+            secret (bytes): Key used to sign cursors. Servers that must
+            accept each other's cursors need the same secret; a random one
+            is generated otherwise.
+        """
+        super().__init__()
+        self.secret = secret or os.urandom(32)
+
+    def encode_cursor(self, direction: int, position: int) -> str:
+        """Builds a signed cursor for `direction` from `position`."""
+        payload = CURSOR_PAYLOAD.pack(CURSOR_VERSION, direction, position)
+        signature = hmac.new(self.secret, payload,
+                             hashlib.sha256).digest()[:SIGNATURE_SIZE]
+        token = base64.urlsafe_b64encode(payload + signature)
+        return token.rstrip(b"=").decode("ascii")
+
+    def decode_cursor(self, cursor: str) -> Tuple[int, int]:
+        """
+        Checks the signature of `cursor` and returns its contents.
+
+        Returns:
+            tuple[int, int]: The direction and the sorting position.
+
+        Raises:
+            ValueError: If the cursor is malformed or was not signed with
+            this server's secret.
+        """
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        except (TypeError, ValueError):
+            raise ValueError("invalid cursor")
+        payload, signature = raw[:-SIGNATURE_SIZE], raw[-SIGNATURE_SIZE:]
+        expected = hmac.new(self.secret, payload,
+                            hashlib.sha256).digest()[:SIGNATURE_SIZE]
+        if (len(payload) != CURSOR_PAYLOAD.size
+                or not hmac.compare_digest(signature, expected)):
+            raise ValueError("invalid cursor")
+        version, direction, position = CURSOR_PAYLOAD.unpack(payload)
+        if version != CURSOR_VERSION or direction not in (AFTER, BEFORE):
+            raise ValueError("invalid cursor")
+        return direction, position
+
+    def get_cursor(self, cursor: str = None, page_size: int = 10) -> Dict:
+        """
+        Retrieves the page a cursor points at, along with the cursors of
+        the pages around it. Without a cursor, returns the first page.
+        """
+        assert type(page_size) is int and page_size > 0
+
+        dataset = self.indexed_dataset()
+        if cursor is None:
+            direction, anchor = AFTER, -1
+        else:
+            direction, anchor = self.decode_cursor(cursor)
+
+        def locate(live):
+            """Finds the page and whether there are rows around it."""
+            if direction == AFTER:
+                start = anchor + 1
+                positions = live.next_live(start, page_size)
+            else:
+                start = anchor
+                positions = live.prev_live(anchor, page_size)
+            if positions:
+                first, last = positions[0], positions[-1] + 1
+            else:
+                first = last = start
+            return (positions, first, last,
+                    live.rank(last) < len(live), live.rank(first) > 0)
+
+        positions, first, last, has_next, has_prev = dataset.read(locate)
+        data: List[List] = dataset.rows(positions) if positions else []
+
+        return {
+            "page_size": len(data),
+            "data": data,
+            "next_cursor": (self.encode_cursor(AFTER, last - 1)
+                            if has_next else None),
+            "prev_cursor": (self.encode_cursor(BEFORE, first)
+                            if has_prev else None),
+        }
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Filtered and sorted hypermedia pagination backed by secondary indexes.
+"""
+
+import threading
+from typing import Dict, List, Optional, Sequence
+
+from secondary_index import SortedIndex, build_indexes, intersect
+
+BaseServer = __import__('2-hypermedia_pagination').Server
+index_range = __import__('2-hypermedia_pagination').index_range
+
+
+class Server(BaseServer):
+    """Server class to paginate filtered and sorted views of
+    a database of popular baby names.
+    """
+    HASH_COLUMNS = ("Year of Birth", "Gender", "Ethnicity",
+                    "Child's First Name")
+    SORTED_COLUMNS = ("Count", "Rank")
+
+    def __init__(self):
+        super().__init__()
+        self.__indexes_lock = threading.Lock()
+        self.__indexes = None
+
+    def indexes(self) -> Dict:
+        """Cached secondary indexes, keyed by column name
+        """
+        if self.__indexes is None:
+            dataset = self.dataset()
+            with self.__indexes_lock:
+                if self.__indexes is None:
+                    self.__indexes = build_indexes(dataset, dataset.header,
+                                                   self.HASH_COLUMNS,
+                                                   self.SORTED_COLUMNS)
+        return self.__indexes
+
+    def refresh(self) -> Optional[int]:
+        """
+        Picks up the rows appended to DATA_FILE since it was loaded, and
+        drops the secondary indexes so they are rebuilt on next use.
+        """
+        changed = super().refresh()
+        if changed != 0:
+            with self.__indexes_lock:
+                self.__indexes = None
+        return changed
+
+    def select(self, filters: Optional[Dict[str, str]] = None,
+               order_by: Optional[str] = None) -> Sequence[int]:
+        """
+        Finds the positions of the rows matching `filters`, in the
+        requested order.
+
+        Args:
+            filters (dict): Column name to required value. Every column
+            must be one of `HASH_COLUMNS`.
+            order_by (str): One of `SORTED_COLUMNS`, optionally prefixed
+            with "-" for descending order. Rows with equal values stay in
+            file order either way. File order is used when None.
+
+        Returns:
+            Sequence[int]: The matching row positions.
+        """
+        indexes = self.indexes()
+        descending = order_by is not None and order_by.startswith("-")
+        column = order_by[1:] if descending else order_by
+        assert column is None or column in self.SORTED_COLUMNS
+        assert all(name in self.HASH_COLUMNS for name in filters or {})
+
+        if not filters:
+            if column is None:
+                return range(len(self.dataset()))
+            return indexes[column].sorted_positions(descending)
+
+        positions = intersect([indexes[name].lookup(value)
+                               for name, value in filters.items()])
+        if column is not None:
+            index: SortedIndex = indexes[column]
+            index.sort(positions, descending)
+        return positions
+
+    def get_page(self, page: int = 1, page_size: int = 10,
+                 filters: Optional[Dict[str, str]] = None,
+                 order_by: Optional[str] = None) -> List[List]:
+        """Returns a page of the rows matching `filters`,
+        sorted by `order_by`."""
+        if filters is None and order_by is None:
+            return super().get_page(page, page_size)
+
+        return self._rows(self.select(filters, order_by), page, page_size)
+
+    def get_hyper(self, page: int = 1, page_size: int = 10,
+                  filters: Optional[Dict[str, str]] = None,
+                  order_by: Optional[str] = None) -> Dict:
+        """
+        Retrieves a page of the rows matching `filters`, sorted by
+        `order_by`, along with hypermetadata describing the pagination
+        details.
+        """
+        if filters is None and order_by is None:
+            return super().get_hyper(page, page_size)
+
+        positions = self.select(filters, order_by)
+        data = self._rows(positions, page, page_size)
+        total_pages = (len(positions) + page_size - 1) // page_size
+        return {
+            "page_size": len(data),
+            "page": page,
+            "data": data,
+            "next_page": page + 1 if page < total_pages else None,
+            "prev_page": page - 1 if page > 1 else None,
+            "total_pages": total_pages,
+        }
+
+    def _rows(self, positions: Sequence[int], page: int,
+              page_size: int) -> List[List]:
+        """Returns the rows of one page of `positions`."""
+        assert type(page) is int and type(page_size) is int
+        assert page > 0 and page_size > 0
+
+        start_index, end_index = index_range(page, page_size)
+        dataset = self.dataset()
+        return [dataset[p] for p in positions[start_index:end_index]]
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Precomputed rollups (grouped totals) over the popular baby names, served
+with the same hypermedia pagination metadata as `get_hyper`.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+BaseServer = __import__('2-hypermedia_pagination').Server
+index_range = __import__('2-hypermedia_pagination').index_range
+
+
+class Server(BaseServer):
+    """Server class to paginate grouped totals of
+    a database of popular baby names.
+    """
+    MEASURE = "Count"
+    ROLLUPS = (
+        ("Child's First Name", "Year of Birth"),
+        ("Ethnicity", "Child's First Name"),
+        ("Child's First Name",),
+        ("Year of Birth", "Ethnicity"),
+    )
+    MAX_VIEWS = 64  # sorted views kept, least recently used dropped first
+
+    def __init__(self):
+        super().__init__()
+        self.__rollups_lock = threading.RLock()
+        self.__rollups = None
+        self.__views = OrderedDict()
+        self.__generation = 0  # bumped whenever the rollups change
+
+    def rollups(self) -> Dict[Tuple[str, ...], Dict[Tuple, int]]:
+        """Cached rollups: for every grouping in ROLLUPS, the total of
+        MEASURE per group
+        """
+        if self.__rollups is None:
+            with self.__rollups_lock:
+                if self.__rollups is None:
+                    rollups = {group_by: {} for group_by in self.ROLLUPS}
+                    self._accumulate(rollups, self.dataset())
+                    self.__rollups = rollups
+        return self.__rollups
+
+    def refresh(self) -> Optional[int]:
+        """
+        Picks up the rows appended to DATA_FILE since it was loaded and
+        adds them to the rollups, which are only recomputed from scratch
+        after a full reload.
+        """
+        with self.__rollups_lock:
+            appended = super().refresh()
+            if appended is None:
+                self.__rollups = None
+            elif appended and self.__rollups is not None:
+                dataset = self.dataset()
+                self._accumulate(self.__rollups,
+                                 dataset[len(dataset) - appended:])
+            if appended != 0:
+                self.__views.clear()
+                self.__generation += 1
+            return appended
+
+    def get_group_by(self, group_by: Sequence[str], page: int = 1,
+                     page_size: int = 10) -> Dict:
+        """
+        Retrieves a page of the totals of a rollup, ordered by group,
+        along with hypermetadata describing the pagination details.
+        Every row of `data` holds the group values followed by the total.
+        """
+        group_by = tuple(group_by)
+        return self._hyper(self._view(group_by, None, False),
+                           page, page_size)
+
+    def get_top(self, group_by: Sequence[str], page: int = 1,
+                page_size: int = 10,
+                within: Optional[Dict[str, str]] = None) -> Dict:
+        """
+        Retrieves a page of the groups of a rollup with the highest
+        totals, along with hypermetadata describing the pagination details.
+
+        Args:
+            group_by (Sequence[str]): One of ROLLUPS.
+            within (dict): Restricts the ranking to the groups having these
+            values, e.g. `{"Ethnicity": "HISPANIC"}` for the top names of
+            one ethnicity.
+        """
+        group_by = tuple(group_by)
+        return self._hyper(self._view(group_by, within, True),
+                           page, page_size)
+
+    def _view(self, group_by: Tuple[str, ...],
+              within: Optional[Dict[str, str]], ranked: bool) -> List[List]:
+        """Returns (and caches until the next refresh) the sorted rows of a
+        rollup.
+
+        The groups are copied under the rollups lock, so a concurrent
+        refresh cannot change them while they are read, and sorted outside
+        of it. A view is only cached if no refresh ran meanwhile.
+        """
+        assert group_by in self.ROLLUPS
+        within = within or {}
+        assert all(column in group_by for column in within)
+        key = (group_by, tuple(sorted(within.items())), ranked)
+        positions = [(group_by.index(column), value)
+                     for column, value in within.items()]
+        with self.__rollups_lock:
+            view = self.__views.get(key)
+            if view is not None:
+                self.__views.move_to_end(key)
+                return view
+            generation = self.__generation
+            items = [(group, total)
+                     for group, total in self.rollups()[group_by].items()
+                     if all(group[c] == value for c, value in positions)]
+        if ranked:
+            items.sort(key=lambda item: (-item[1], item[0]))
+        else:
+            items.sort()
+        view = [list(group) + [total] for group, total in items]
+        with self.__rollups_lock:
+            if self.__generation == generation:
+                self.__views[key] = view
+                if len(self.__views) > self.MAX_VIEWS:
+                    self.__views.popitem(last=False)
+        return view
+
+    def _accumulate(self, rollups: Dict, rows) -> None:
+        """Adds the MEASURE of every row to its group in every rollup."""
+        header = self.dataset().header
+        measure = header.index(self.MEASURE)
+        columns = {group_by: [header.index(column) for column in group_by]
+                   for group_by in rollups}
+        for row in rows:
+            value = int(row[measure])
+            for group_by, totals in rollups.items():
+                group = tuple(row[c] for c in columns[group_by])
+                totals[group] = totals.get(group, 0) + value
+
+    @staticmethod
+    def _hyper(rows: List[List], page: int, page_size: int) -> Dict:
+        """Paginates `rows` with the `get_hyper` metadata."""
+        assert type(page) is int and type(page_size) is int
+        assert page > 0 and page_size > 0
+
+        start_index, end_index = index_range(page, page_size)
+        data = rows[start_index:end_index]
+        total_pages = (len(rows) + page_size - 1) // page_size
+        return {
+            "page_size": len(data),
+            "page": page,
+            "data": data,
+            "next_page": page + 1 if page < total_pages else None,
+            "prev_page": page - 1 if page > 1 else None,
+            "total_pages": total_pages,
+        }
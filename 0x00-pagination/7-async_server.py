@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Asyncio HTTP front end for the pagination servers.
+
+The dataset is loaded in a background executor as soon as the service
+starts; meanwhile `/health` answers 503 and so do the data endpoints.
+Once it is loaded, requests run concurrently in the executor, up to a
+bounded number in flight; requests beyond that limit are turned away
+with a 503 instead of queueing up.
+
+Endpoints (GET, JSON responses):
+    /health
+    /page?page=1&page_size=10
+    /hyper?page=1&page_size=10
+    /hyper_index?index=0&page_size=10
+
+Usage:
+    python3 7-async_server.py [port]
+"""
+
+import asyncio
+import json
+import sys
+from concurrent.futures import Executor
+from http import HTTPStatus
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+HyperServer = __import__('2-hypermedia_pagination').Server
+DeletionServer = __import__('3-hypermedia_del_pagination').Server
+
+
+class Server(DeletionServer, HyperServer):
+    """Server class to paginate a database of popular baby names,
+    by page or by index.
+
+    Both bases derive from `names_dataset.DatasetServer` and share its
+    `source` attribute: pages and indexes are read from one dataset.
+    """
+
+
+class PaginationService:
+    """
+    Serves a `Server` over HTTP with asyncio.
+    """
+    MAX_IN_FLIGHT = 64
+    MAX_HEADERS = 100
+    REQUEST_TIMEOUT = 10.0
+
+    def __init__(self, server: Optional[Server] = None,
+                 max_in_flight: Optional[int] = None,
+                 executor: Optional[Executor] = None):
+        """
+        Args:
+            server (Server): The server to expose. Defaults to a new
+            `Server`.
+            max_in_flight (int): The maximum number of requests handled at
+            once. Defaults to MAX_IN_FLIGHT.
+            executor (Executor): Runs the dataset load and the server
+            calls. Defaults to the loop's default executor.
+        """
+        self.server = server or Server()
+        self.executor = executor
+        self._in_flight = asyncio.Semaphore(max_in_flight
+                                            or self.MAX_IN_FLIGHT)
+        self._warm_up: Optional[asyncio.Future] = None
+
+    async def start(self, host: str = "127.0.0.1",
+                    port: int = 8000) -> asyncio.AbstractServer:
+        """Starts loading the dataset and listening for requests."""
+        self._warm_up = asyncio.get_running_loop().run_in_executor(
+            self.executor, self.server.indexed_dataset)
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def wait_ready(self) -> None:
+        """Waits until the dataset is loaded. Raises if loading failed."""
+        assert self._warm_up is not None, "the service is not started"
+        await asyncio.shield(self._warm_up)
+
+    def ready(self) -> bool:
+        """Returns True once the dataset is loaded."""
+        return (self._warm_up is not None and self._warm_up.done()
+                and self._warm_up.exception() is None)
+
+    async def handle(self, reader: asyncio.StreamReader,
+                     writer: asyncio.StreamWriter) -> None:
+        """Answers a single HTTP request, then closes the connection."""
+        try:
+            try:
+                method, target = await asyncio.wait_for(
+                    self._read_request(reader), self.REQUEST_TIMEOUT)
+            except (ValueError, asyncio.TimeoutError,
+                    asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                status, body = HTTPStatus.BAD_REQUEST, {
+                    "error": "malformed request"}
+            else:
+                status, body = await self.dispatch(method, target)
+            self._write_response(writer, status, body)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method: str, target: str) -> Tuple[HTTPStatus,
+                                                               Dict]:
+        """Routes a request to the server and returns its response."""
+        url = urlsplit(target)
+        if method != "GET":
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "GET only"}
+        if url.path == "/health":
+            return self._health()
+        route = {
+            "/page": (self.server.get_page, ("page", "page_size")),
+            "/hyper": (self.server.get_hyper, ("page", "page_size")),
+            "/hyper_index": (self.server.get_hyper_index,
+                             ("index", "page_size")),
+        }.get(url.path)
+        if route is None:
+            return HTTPStatus.NOT_FOUND, {"error": "unknown endpoint"}
+        if not self.ready():
+            return self._health()
+        if self._in_flight.locked():
+            return HTTPStatus.SERVICE_UNAVAILABLE, {"error": "overloaded"}
+
+        call, names = route
+        try:
+            query = dict(parse_qsl(url.query))
+            args = [int(query[name]) for name in names if name in query]
+        except ValueError:
+            return HTTPStatus.BAD_REQUEST, {"error": "invalid parameter"}
+        async with self._in_flight:
+            try:
+                result = await asyncio.get_running_loop().run_in_executor(
+                    self.executor, call, *args)
+            except AssertionError:
+                return HTTPStatus.BAD_REQUEST, {"error": "out of range"}
+        return HTTPStatus.OK, result
+
+    def _health(self) -> Tuple[HTTPStatus, Dict]:
+        """Reports whether the dataset is loaded."""
+        if self.ready():
+            return HTTPStatus.OK, {
+                "status": "ok", "rows": len(self.server.indexed_dataset())}
+        if self._warm_up is not None and self._warm_up.done():
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {
+                "status": "failed", "error": repr(self._warm_up.exception())}
+        return HTTPStatus.SERVICE_UNAVAILABLE, {"status": "loading"}
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Tuple[str,
+                                                                        str]:
+        """Reads the request line and skips the headers. A line longer than
+        the reader's limit raises `asyncio.LimitOverrunError`."""
+        line = await reader.readuntil(b"\r\n")
+        method, target, _ = line.decode("latin-1").split(" ", 2)
+        for _ in range(self.MAX_HEADERS):
+            if await reader.readuntil(b"\r\n") == b"\r\n":
+                return method, target
+        raise ValueError("too many headers")
+
+    @staticmethod
+    def _write_response(writer: asyncio.StreamWriter, status: HTTPStatus,
+                        body: Dict) -> None:
+        """Writes a JSON response."""
+        payload = json.dumps(body).encode("utf-8")
+        writer.write("HTTP/1.1 {} {}\r\n"
+                     "Content-Type: application/json\r\n"
+                     "Content-Length: {}\r\n"
+                     "Connection: close\r\n\r\n".format(
+                         status.value, status.phrase,
+                         len(payload)).encode("latin-1") + payload)
+
+
+async def serve(port: int = 8000) -> None:
+    """Runs the service until cancelled."""
+    listener = await PaginationService().start(port=port)
+    async with listener:
+        await listener.serve_forever()
+
+
+if __name__ == "__main__":
+    asyncio.run(serve(int(sys.argv[1]) if len(sys.argv) > 1 else 8000))
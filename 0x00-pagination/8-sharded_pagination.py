@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Pagination over a dataset split into row-range shards, each held by a
+local worker process.
+"""
+
+from sharded_dataset import ShardedIndex
+
+HyperServer = __import__('2-hypermedia_pagination').Server
+DeletionServer = __import__('3-hypermedia_del_pagination').Server
+
+
+class Server(DeletionServer, HyperServer):
+    """Server class to paginate a database of popular baby names
+    sharded across worker processes.
+
+    Both bases derive from `names_dataset.DatasetServer` and share its
+    `source` attribute: pages and indexes are read from one dataset.
+    """
+    STORAGE = "sharded"
+    STORAGE_OPTIONS = {"shards": 4}
+    INDEX = ShardedIndex
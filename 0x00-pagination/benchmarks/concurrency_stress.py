@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Stress benchmark for concurrent deletion-resilient pagination.
+
+Starts many reader threads calling `get_hyper_index` on one shared
+`Server` while a single writer thread keeps deleting and restoring rows.
+All threads hit the server before its dataset is loaded, to exercise the
+single initialization.
+
+Every page is checked for consistency: there are `page_size` rows unless
+the end was reached, and `next_index` moves forward. The run also fails
+if the dataset was loaded more than once.
+
+Usage (from 0x00-pagination):
+    python3 benchmarks/concurrency_stress.py --readers 16 --seconds 5
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+PACKAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, PACKAGE_DIR)
+
+import names_dataset  # noqa: E402
+
+pagination = __import__('3-hypermedia_del_pagination')
+loads = []
+
+
+def reader(server, page_size, deadline, stats, errors, start):
+    """Requests random pages until the deadline and checks each one."""
+    start.wait()
+    rng = random.Random()
+    pages = 0
+    while time.monotonic() < deadline and not errors:
+        index = rng.randrange(server.indexed_dataset().size)
+        res = server.get_hyper_index(index, page_size)
+        data, next_index = res["data"], res["next_index"]
+        if len(data) > page_size or next_index <= index:
+            errors.append("bad page at {}: {}".format(index, res))
+        elif len(data) < page_size and next_index != \
+                server.indexed_dataset().size:
+            errors.append("short page at {}: {}".format(index, res))
+        pages += 1
+    stats.append(pages)
+
+
+def writer(server, deadline, stats, start):
+    """Deletes and restores random rows until the deadline."""
+    start.wait()
+    rng = random.Random()
+    deleted = []
+    writes = 0
+    while time.monotonic() < deadline:
+        dataset = server.indexed_dataset()
+        if deleted and rng.random() < 0.4:
+            server.restore(deleted.pop(rng.randrange(len(deleted))))
+        else:
+            position = rng.randrange(dataset.size)
+            if server.delete(position):
+                deleted.append(position)
+        writes += 1
+    stats.append(writes)
+
+
+def main():
+    """Runs the stress test and prints throughput figures."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--page-size", type=int, default=10)
+    args = parser.parse_args()
+
+    os.chdir(PACKAGE_DIR)
+    open_dataset = names_dataset.open_dataset
+
+    def counted(*args, **kwargs):
+        loads.append(1)
+        return open_dataset(*args, **kwargs)
+
+    names_dataset.open_dataset = counted
+    server = pagination.Server()
+    start = threading.Event()
+    deadline = time.monotonic() + args.seconds
+    read_stats, write_stats, errors = [], [], []
+    threads = [threading.Thread(target=reader,
+                                args=(server, args.page_size, deadline,
+                                      read_stats, errors, start))
+               for _ in range(args.readers)]
+    threads.append(threading.Thread(target=writer,
+                                    args=(server, deadline, write_stats,
+                                          start)))
+    for thread in threads:
+        thread.start()
+    start.set()
+    for thread in threads:
+        thread.join()
+
+    print("dataset loads: {}".format(len(loads)))
+    print("readers: {}, pages read: {} ({:.0f}/s)".format(
+        args.readers, sum(read_stats), sum(read_stats) / args.seconds))
+    print("writes: {} ({:.0f}/s)".format(
+        sum(write_stats), sum(write_stats) / args.seconds))
+    print("live rows: {}".format(len(server.indexed_dataset())))
+    if len(loads) != 1:
+        errors.append("dataset loaded {} times".format(len(loads)))
+    for error in errors[:5]:
+        print("ERROR:", error)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the pagination servers.
+
+Generates synthetic baby-names CSV files of the requested sizes, then for
+every size and storage backend measures, in a fresh process:
+  - the start-up time (first `get_page` call, dataset load included),
+    once with no cache files (index, snapshot or database) and once when
+    restarting with them in place;
+  - the peak resident set size of the process;
+  - `get_page` / `get_hyper` latency percentiles on shallow and deep pages;
+  - `get_hyper_index` latency percentiles on shallow and deep indexes,
+    with 0%, 10%, 50% and 90% of the rows deleted.
+
+Results are written as JSON so that runs can be compared; `--compare`
+prints the ratio of every metric against an earlier results file.
+
+Usage (from 0x00-pagination):
+    python3 benchmarks/pagination_bench.py --rows 100000 1000000
+    python3 benchmarks/pagination_bench.py --compare old.json
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+PACKAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+HEADER = "Year of Birth,Gender,Ethnicity,Child's First Name,Count,Rank\n"
+YEARS = [str(year) for year in range(2011, 2017)]
+GENDERS = ["FEMALE", "MALE"]
+ETHNICITIES = ["ASIAN AND PACIFIC ISLANDER", "BLACK NON HISPANIC",
+               "HISPANIC", "WHITE NON HISPANIC"]
+STORAGES = ["columnar", "mmap", "sqlite"]
+DELETION_DENSITIES = [0.0, 0.1, 0.5, 0.9]
+CACHE_SUFFIXES = [".idx", ".snap", ".sqlite3"]
+
+
+def generate(path: str, rows: int, seed: int = 0) -> None:
+    """Writes a synthetic names CSV with `rows` data rows."""
+    rng = random.Random(seed)
+    names = ["Name{}".format(i) for i in range(3000)]
+    with open(path, "w") as f:
+        f.write(HEADER)
+        for i in range(rows):
+            f.write("{},{},{},{},{},{}\n".format(
+                rng.choice(YEARS), rng.choice(GENDERS),
+                rng.choice(ETHNICITIES), rng.choice(names),
+                rng.randint(10, 500), i % 100 + 1))
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """Summarizes latencies (in seconds) as microsecond percentiles."""
+    samples = sorted(samples)
+
+    def at(fraction):
+        return round(samples[min(int(fraction * len(samples)),
+                                 len(samples) - 1)] * 1e6, 2)
+
+    return {"p50_us": at(0.5), "p90_us": at(0.9), "p99_us": at(0.99),
+            "max_us": round(samples[-1] * 1e6, 2), "n": len(samples)}
+
+
+def timed(call, args_list) -> Dict[str, float]:
+    """Times `call(*args)` for every argument tuple."""
+    samples = []
+    for args in args_list:
+        start = time.perf_counter()
+        call(*args)
+        samples.append(time.perf_counter() - start)
+    return percentiles(samples)
+
+
+def run_worker(path: str, storage: str, requests: int,
+               full: bool) -> Dict:
+    """
+    Measures one storage backend on one file. Runs in a fresh process so
+    that start-up time and peak RSS are not polluted by earlier runs.
+    """
+    sys.path.insert(0, PACKAGE_DIR)
+    hyper = __import__('2-hypermedia_pagination')
+    deletion = __import__('3-hypermedia_del_pagination')
+
+    class HyperServer(hyper.Server):
+        DATA_FILE = path
+        STORAGE = storage
+
+    class DeletionServer(deletion.Server):
+        DATA_FILE = path
+        STORAGE = storage
+
+    result = {}
+    server = HyperServer()
+    start = time.perf_counter()
+    server.get_page(1, 10)
+    result["start_s"] = round(time.perf_counter() - start, 4)
+    if not full:
+        result["peak_rss_kb"] = peak_rss_kb()
+        return result
+
+    rng = random.Random(1)
+    page_size = 10
+    total_pages = (len(server.dataset()) + page_size - 1) // page_size
+    shallow = [(rng.randint(1, 10), page_size) for _ in range(requests)]
+    deep = [(rng.randint(max(total_pages - 10, 1), total_pages), page_size)
+            for _ in range(requests)]
+    result["get_page"] = {"shallow": timed(server.get_page, shallow),
+                          "deep": timed(server.get_page, deep)}
+    result["get_hyper"] = {"shallow": timed(server.get_hyper, shallow),
+                           "deep": timed(server.get_hyper, deep)}
+
+    result["get_hyper_index"] = {}
+    deleting = DeletionServer()
+    indexed = deleting.indexed_dataset()
+    size = indexed.size
+    positions = list(range(size))
+    rng.shuffle(positions)
+    deleted = 0
+    for density in DELETION_DENSITIES:
+        target = int(size * density)
+        indexed.delete_many(positions[deleted:target])
+        deleted = target
+        live = len(indexed)
+        if not live:
+            continue
+        shallow = [(rng.randrange(min(100, live)), page_size)
+                   for _ in range(requests)]
+        # The last live rows: deep physical positions at any density
+        tail = indexed.read(lambda index: index.prev_live(size, 100))
+        deep = [(rng.choice(tail), page_size) for _ in range(requests)]
+        result["get_hyper_index"]["deleted_{:.0%}".format(density)] = {
+            "shallow": timed(deleting.get_hyper_index, shallow),
+            "deep": timed(deleting.get_hyper_index, deep),
+        }
+    result["peak_rss_kb"] = peak_rss_kb()
+    return result
+
+
+def peak_rss_kb() -> int:
+    """Returns the peak resident set size of this process in KiB."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def measure(path: str, storage: str, requests: int, full: bool) -> Dict:
+    """Runs `run_worker` in a child process and returns its results."""
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--worker", path,
+         storage, str(requests), "full" if full else "start"],
+        check=True, stdout=subprocess.PIPE, cwd=PACKAGE_DIR).stdout
+    return json.loads(output)
+
+
+def flatten(results: Dict, prefix: str = "") -> Dict[str, float]:
+    """Flattens nested results into `a.b.c` keys for comparisons."""
+    flat = {}
+    for key, value in results.items():
+        name = prefix + str(key)
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + "."))
+        elif isinstance(value, (int, float)):
+            flat[name] = value
+    return flat
+
+
+def compare(old_path: str, new_path: str) -> None:
+    """Prints every metric of `new_path` as a ratio of `old_path`."""
+    with open(old_path) as f:
+        old = flatten(json.load(f)["results"])
+    with open(new_path) as f:
+        new = flatten(json.load(f)["results"])
+    for key in sorted(set(old) & set(new)):
+        if key.endswith(".n") or not old[key]:
+            continue
+        ratio = new[key] / old[key]
+        flag = "  REGRESSION" if ratio > 1.2 else ""
+        print("{:<60} {:>12} {:>12} {:>6.2f}x{}".format(
+            key, old[key], new[key], ratio, flag))
+
+
+def main() -> int:
+    """Generates the datasets, runs every measurement and saves them."""
+    if len(sys.argv) > 1 and sys.argv[1] == "--worker":
+        path, storage, requests, mode = sys.argv[2:6]
+        print(json.dumps(run_worker(path, storage, int(requests),
+                                    mode == "full")))
+        return 0
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+",
+                        default=[100000, 1000000, 10000000])
+    parser.add_argument("--storage", nargs="+", default=STORAGES,
+                        choices=STORAGES)
+    parser.add_argument("--requests", type=int, default=500,
+                        help="requests per latency measurement")
+    parser.add_argument("--workdir", default=os.path.join(
+        PACKAGE_DIR, "benchmarks", "data"))
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", metavar="OLD_RESULTS",
+                        help="compare --output against an earlier run")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(args.compare, args.output)
+        return 0
+
+    os.makedirs(args.workdir, exist_ok=True)
+    results = {}
+    for rows in args.rows:
+        path = os.path.abspath(os.path.join(
+            args.workdir, "names_{}.csv".format(rows)))
+        if not os.path.exists(path):
+            print("generating {}".format(path), file=sys.stderr)
+            generate(path, rows)
+        for storage in args.storage:
+            for suffix in CACHE_SUFFIXES:
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+            print("measuring {} rows, {}".format(rows, storage),
+                  file=sys.stderr)
+            first = measure(path, storage, args.requests, full=False)
+            restart = measure(path, storage, args.requests, full=True)
+            restart["first_start_s"] = first["start_s"]
+            restart["first_start_peak_rss_kb"] = first["peak_rss_kb"]
+            results["{}.{}".format(rows, storage)] = restart
+
+    with open(args.output, "w") as f:
+        json.dump({"python": sys.version.split()[0],
+                   "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                   "results": results}, f, indent=2)
+    print("results written to {}".format(args.output), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+
+"""
+This module saves a parsed `ColumnarDataset` as a versioned binary snapshot
+next to its CSV file, and loads it back without parsing any text.
+
+A snapshot is only used while it matches the CSV it was built from: the
+absolute path, size and modification time of the file are stored in its
+header. Loading maps the file with `mmap` and wraps the column buffers in
+`memoryview`s, so rows are read straight from the page cache.
+
+Layout:
+  - a fixed header (magic, format version, CSV size and mtime, length of
+    the metadata block);
+  - a JSON metadata block (CSV path, column names, lookup tables, and the
+    offset, size and typecode of every column buffer);
+  - the column buffers, each aligned on 8 bytes.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from typing import Optional, Tuple
+
+from names_dataset import ColumnarDataset, FileWatch
+
+SNAPSHOT_MAGIC = b"PGSN"
+SNAPSHOT_VERSION = 1
+# magic, version, CSV size, CSV mtime in nanoseconds, metadata size
+SNAPSHOT_HEADER = struct.Struct("<4sIQQQ")
+ALIGNMENT = 8
+
+
+def snapshot_path(csv_path: str) -> str:
+    """Returns where the snapshot of `csv_path` is stored."""
+    return csv_path + ".snap"
+
+
+def save_snapshot(dataset: ColumnarDataset, csv_path: str,
+                  path: Optional[str] = None,
+                  source: Optional[Tuple[int, int]] = None) -> bool:
+    """
+    Writes a snapshot of `dataset`, parsed from `csv_path`.
+
+    Args:
+        dataset (ColumnarDataset): The parsed rows.
+        csv_path (str): The CSV file the rows were read from.
+        path (str): Where to write the snapshot. Defaults to
+        `snapshot_path(csv_path)`.
+        source (tuple): The size and mtime (in nanoseconds) of the CSV
+        file when it was read. Defaults to its current ones.
+
+    Returns:
+        bool: False if the snapshot could not be written.
+    """
+    path = path or snapshot_path(csv_path)
+    temp_path = "{}.{}.tmp".format(path, os.getpid())
+    try:
+        size, mtime = source or FileWatch.stat(csv_path)
+        buffers = dataset.column_buffers()
+        columns = []
+        offset = 0
+        for buffer in buffers:
+            nbytes = len(buffer) * buffer.itemsize
+            columns.append({"typecode": _typecode(buffer), "offset": offset,
+                            "nbytes": nbytes})
+            offset += nbytes + (-nbytes % ALIGNMENT)
+        metadata = json.dumps({
+            "path": os.path.abspath(csv_path),
+            "byteorder": sys.byteorder,
+            "header": dataset.header,
+            "length": len(dataset),
+            "values": dataset.lookup_tables(),
+            "columns": columns,
+        }).encode("utf-8")
+        metadata += b" " * (-(SNAPSHOT_HEADER.size + len(metadata))
+                            % ALIGNMENT)
+        with open(temp_path, "wb") as f:
+            f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION,
+                                         size, mtime, len(metadata)))
+            f.write(metadata)
+            for buffer in buffers:
+                data = bytes(buffer)
+                f.write(data)
+                f.write(b"\0" * (-len(data) % ALIGNMENT))
+        os.replace(temp_path, path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return False
+    return True
+
+
+def load_snapshot(csv_path: str, path: Optional[str] = None,
+                  source: Optional[Tuple[int, int]] = None
+                  ) -> Optional[ColumnarDataset]:
+    """
+    Loads the snapshot of `csv_path` if it is still up to date.
+
+    Args:
+        csv_path (str): The CSV file the snapshot was built from.
+        path (str): Where the snapshot is stored. Defaults to
+        `snapshot_path(csv_path)`.
+        source (tuple): The size and mtime (in nanoseconds) the CSV file
+        must have had. Defaults to its current ones.
+
+    Returns:
+        ColumnarDataset: The rows, backed by the memory-mapped snapshot,
+        or None if there is no usable snapshot.
+    """
+    path = path or snapshot_path(csv_path)
+    try:
+        size, mtime = source or FileWatch.stat(csv_path)
+        with open(path, "rb") as f:
+            header = f.read(SNAPSHOT_HEADER.size)
+            if len(header) != SNAPSHOT_HEADER.size:
+                return None
+            magic, version, csv_size, csv_mtime, meta_size = \
+                SNAPSHOT_HEADER.unpack(header)
+            if (magic, version) != (SNAPSHOT_MAGIC, SNAPSHOT_VERSION) or (
+                    csv_size, csv_mtime) != (size, mtime):
+                return None
+            metadata = json.loads(f.read(meta_size).decode("utf-8"))
+            if (metadata["path"] != os.path.abspath(csv_path)
+                    or metadata["byteorder"] != sys.byteorder):
+                return None
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError, KeyError):
+        return None
+
+    start = SNAPSHOT_HEADER.size + meta_size
+    view = memoryview(data)
+    columns = []
+    try:
+        length = metadata["length"]
+        if len(metadata["columns"]) != len(metadata["header"]):
+            raise ValueError("wrong number of columns")
+        for column in metadata["columns"]:
+            # A truncated or corrupt file must not yield short columns
+            offset = start + column["offset"]
+            nbytes = column["nbytes"]
+            itemsize = struct.calcsize(column["typecode"])
+            if (column["offset"] < 0 or nbytes != length * itemsize
+                    or offset + nbytes > len(data)):
+                raise ValueError("column out of bounds")
+            columns.append(view[offset:offset + nbytes].cast(
+                column["typecode"]))
+        return ColumnarDataset.from_buffers(metadata["header"], columns,
+                                            metadata["values"], length)
+    except (KeyError, TypeError, ValueError, struct.error):
+        del columns
+        view.release()
+        data.close()
+        return None
+
+
+def _typecode(buffer) -> str:
+    """Returns the typecode of an array or the format of a memoryview."""
+    return getattr(buffer, "typecode", None) or buffer.format
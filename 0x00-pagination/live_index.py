@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+
+"""
+This module defines the structures behind deletion-resilient pagination:
+  - `LiveIndex`, a Fenwick (binary indexed) tree over row positions that
+    answers "how many live rows come before position i" and "where is the
+    k-th live row" in O(log n);
+  - `IndexedDataset`, a dict-like view of a dataset keyed by row position
+    that supports deleting and restoring rows without copying them.
+"""
+
+import threading
+import time
+from array import array
+from collections.abc import Mapping
+from typing import Callable, Iterable, Iterator, List, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class LiveIndex:
+    """
+    Fenwick tree counting the live positions in `range(size)`.
+    """
+
+    def __init__(self, size: int):
+        """
+        Initializes the index with every position live.
+
+        Args:
+            size (int): The number of positions to track.
+        """
+        self.size = size
+        self._live = bytearray(b"\x01") * size
+        # With every position live, node i covers exactly i & -i of them.
+        self._tree = array("l", (i & -i for i in range(size + 1)))
+        self._count = size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def is_live(self, position: int) -> bool:
+        """Tells whether `position` is in range and not deleted."""
+        return 0 <= position < self.size and bool(self._live[position])
+
+    def delete(self, position: int) -> bool:
+        """
+        Marks `position` as deleted.
+
+        Returns:
+            bool: False if the position was already deleted.
+        """
+        if not self.is_live(position):
+            return False
+        self._live[position] = 0
+        self._add(position, -1)
+        return True
+
+    def restore(self, position: int) -> bool:
+        """
+        Marks a deleted `position` as live again.
+
+        Returns:
+            bool: False if the position was already live.
+        """
+        if not 0 <= position < self.size or self._live[position]:
+            return False
+        self._live[position] = 1
+        self._add(position, 1)
+        return True
+
+    def rank(self, position: int) -> int:
+        """Returns the number of live positions strictly before `position`."""
+        tree = self._tree
+        total = 0
+        i = min(max(position, 0), self.size)
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def select(self, k: int) -> int:
+        """
+        Returns the position of the live row with rank `k` (0-based).
+
+        Args:
+            k (int): A rank in `range(len(self))`.
+        """
+        tree = self._tree
+        position = 0
+        step = 1 << self.size.bit_length()
+        while step:
+            nxt = position + step
+            if nxt <= self.size and tree[nxt] <= k:
+                position = nxt
+                k -= tree[nxt]
+            step >>= 1
+        return position
+
+    def next_live(self, position: int, count: int) -> List[int]:
+        """
+        Returns up to `count` live positions starting at `position`.
+        """
+        first = self.rank(position)
+        last = min(first + count, self._count)
+        return [self.select(k) for k in range(first, last)]
+
+    def prev_live(self, position: int, count: int) -> List[int]:
+        """
+        Returns up to `count` live positions strictly before `position`,
+        in ascending order.
+        """
+        last = self.rank(position)
+        return [self.select(k) for k in range(max(last - count, 0), last)]
+
+    def grow(self, count: int) -> None:
+        """
+        Adds `count` live positions at the end.
+
+        Each new Fenwick node only covers positions before it, so it is
+        computed from the nodes already there in O(log n).
+        """
+        tree = self._tree
+        for _ in range(count):
+            i = self.size + 1
+            tree.append(self.rank(i - 1) - self.rank(i - (i & -i)) + 1)
+            self._live.append(1)
+            self.size = i
+            self._count += 1
+
+    def _add(self, position: int, delta: int) -> None:
+        """Adds `delta` to the count stored at `position`."""
+        tree = self._tree
+        i = position + 1
+        while i <= self.size:
+            tree[i] += delta
+            i += i & -i
+        self._count += delta
+
+
+class IndexedDataset(Mapping):
+    """
+    Dataset indexed by sorting position, starting at 0.
+
+    Behaves like the `{position: row}` dict it replaces, but keeps only a
+    byte per row plus a Fenwick tree on top of the underlying dataset.
+
+    Reads never take a lock. Writers serialize on a lock and bump a
+    sequence number before and after every change (a seqlock): a reader
+    that saw the number move while it was working simply runs again, so
+    it always returns a result computed against one consistent version.
+    """
+
+    def __init__(self, dataset: Sequence[List]):
+        """
+        Wraps `dataset` with every row live.
+
+        Args:
+            dataset (Sequence[List]): The rows, in sorting order.
+        """
+        self.dataset = dataset
+        self.live = LiveIndex(len(dataset))
+        self._write_lock = threading.Lock()
+        self._sequence = 0
+        self._listeners: List[Callable[[int, int], None]] = []
+
+    def __len__(self) -> int:
+        return len(self.live)
+
+    def __contains__(self, position) -> bool:
+        return isinstance(position, int) and self.live.is_live(position)
+
+    def __getitem__(self, position: int) -> List:
+        if position not in self:
+            raise KeyError(position)
+        return self.dataset[position]
+
+    def __delitem__(self, position: int) -> None:
+        if not self.delete(position):
+            raise KeyError(position)
+
+    def __iter__(self) -> Iterator[int]:
+        for position in range(self.live.size):
+            if self.live.is_live(position):
+                yield position
+
+    @property
+    def size(self) -> int:
+        """The number of positions, deleted ones included."""
+        return self.live.size
+
+    @property
+    def version(self) -> int:
+        """The number of completed writes."""
+        return self._sequence // 2
+
+    def subscribe(self, listener: Callable[[int, int], None]) -> None:
+        """
+        Registers `listener` to be called after every write with the first
+        and last positions it changed.
+        """
+        self._listeners.append(listener)
+
+    def read(self, query: Callable[[LiveIndex], T]) -> T:
+        """
+        Runs `query` against a consistent version of the live index,
+        without locking.
+
+        Args:
+            query (Callable): Receives the `LiveIndex`; must not modify
+            it and may be run more than once.
+        """
+        while True:
+            sequence = self._sequence
+            if not sequence & 1:
+                result = query(self.live)
+                if self._sequence == sequence:
+                    return result
+            time.sleep(0)
+
+    def delete(self, position: int) -> bool:
+        """
+        Deletes the row at `position`.
+
+        Returns:
+            bool: False if there was no live row at that position.
+        """
+        return self.delete_many([position]) == 1
+
+    def restore(self, position: int) -> bool:
+        """
+        Brings back the row at a deleted `position`.
+
+        Returns:
+            bool: False if the position was out of range or already live.
+        """
+        return self.restore_many([position]) == 1
+
+    def delete_many(self, positions: Iterable[int]) -> int:
+        """
+        Deletes the rows at `positions` as a single write.
+
+        Returns:
+            int: The number of rows that were actually deleted.
+        """
+        return self._write(self.live.delete, positions)
+
+    def restore_many(self, positions: Iterable[int]) -> int:
+        """
+        Brings back the rows at `positions` as a single write.
+
+        Returns:
+            int: The number of rows that were actually restored.
+        """
+        return self._write(self.live.restore, positions)
+
+    def extend(self, count: int) -> None:
+        """
+        Indexes `count` rows appended to the end of the dataset.
+        """
+        with self._write_lock:
+            self._sequence += 1
+            first = self.live.size
+            try:
+                self.live.grow(count)
+            finally:
+                self._sequence += 1
+            if count > 0:
+                self._notify(first, first + count - 1)
+
+    def page(self, index: int, page_size: int) -> Tuple[List[List], int]:
+        """
+        Collects up to `page_size` live rows starting at position `index`.
+
+        Returns:
+            tuple[List[List], int]: The rows, and the position right after
+            the last row returned (or the dataset size if it ran out).
+        """
+        positions = self.read(lambda live: live.next_live(index, page_size))
+        if not positions:
+            return [], max(index, self.size)
+        next_index = positions[-1] + 1
+        if len(positions) < page_size:
+            next_index = self.size
+        return self.rows(positions), next_index
+
+    def rows(self, positions: List[int]) -> List[List]:
+        """Fetches the rows at sorted `positions` from the dataset."""
+        first, last = positions[0], positions[-1]
+        if last - first < 2 * len(positions):
+            span = self.dataset[first:last + 1]
+            return [span[p - first] for p in positions]
+        return [self.dataset[p] for p in positions]
+
+    def _write(self, change: Callable[[int], bool],
+               positions: Iterable[int]) -> int:
+        """Applies `change` to every position inside one seqlock write."""
+        with self._write_lock:
+            self._sequence += 1
+            try:
+                changed = [position for position in positions
+                           if change(position)]
+            finally:
+                self._sequence += 1
+            if changed:
+                self._notify(min(changed), max(changed))
+            return len(changed)
+
+    def _notify(self, first: int, last: int) -> None:
+        """Tells the listeners that positions `first..last` changed."""
+        for listener in self._listeners:
+            listener(first, last)
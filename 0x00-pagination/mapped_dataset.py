@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+
+"""
+This module defines the `MappedDataset` class, which serves rows of a CSV
+file straight from a memory map.
+
+A compact row-offset index (an `array('Q')` of byte offsets) is built on
+first use and saved next to the CSV, so later processes only have to load
+the index before serving pages. Reading a slice parses only the rows in it.
+
+The index splits rows on newlines, so quoted fields must not contain line
+breaks (the names CSV has none).
+"""
+
+import csv
+import io
+import mmap
+import os
+import struct
+from array import array
+from typing import List, Optional, Union
+
+from names_dataset import FileWatch
+
+INDEX_MAGIC = b"PGIX"
+INDEX_VERSION = 1
+# magic, version, CSV size, CSV mtime in nanoseconds
+INDEX_HEADER = struct.Struct("<4sIQQ")
+
+
+class MappedDataset:
+    """
+    Read-only list of CSV rows backed by `mmap` and a row-offset index.
+    """
+    LAZY = True
+
+    def __init__(self, path: str, index_path: Optional[str] = None,
+                 encoding: str = "utf-8"):
+        """
+        Maps `path` and loads (or builds and saves) its row-offset index.
+
+        Args:
+            path (str): The CSV file to serve, with a header line.
+            index_path (str): Where the offset index lives. Defaults to
+            `path` with an `.idx` suffix.
+            encoding (str): The text encoding of the CSV file.
+        """
+        self.path = path
+        self.index_path = index_path or path + ".idx"
+        self.encoding = encoding
+        self._file = open(path, "rb")
+        stat = os.fstat(self._file.fileno())
+        self._size = stat.st_size
+        self._mtime = stat.st_mtime_ns
+        if self._size:
+            self._map = mmap.mmap(self._file.fileno(), 0,
+                                  access=mmap.ACCESS_READ)
+        else:
+            self._map = b""
+        self.watch = FileWatch(path, self._size, self._mtime)
+        self._offsets = self._load_index()
+        if self._offsets is None:
+            self._offsets = self._build_index()
+            self._save_index()
+        header = self._parse(0, self._offsets[0])
+        self.header = header[0] if header else []
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[List, List[List]]:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            if start >= stop:
+                return []
+            return self._parse(self._offsets[start], self._offsets[stop])
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError("dataset index out of range")
+        return self._parse(self._offsets[key], self._offsets[key + 1])[0]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def refresh(self) -> Optional[int]:
+        """
+        Maps the rows appended to the CSV since it was opened, extends the
+        offset index and saves it.
+
+        Returns:
+            int: The number of rows appended, or None if the file was
+            truncated or rewritten and has to be opened again.
+        """
+        appended = self.watch.appended()
+        if not appended:
+            return appended if appended is None else 0
+        self._size = self.watch.size
+        self._mtime = self.watch.mtime
+        old_map = self._map
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if isinstance(old_map, mmap.mmap):
+            old_map.close()
+        offsets = array("Q")
+        position = self._size - len(appended)
+        while position < self._size:
+            offsets.append(position)
+            position = self._map.find(b"\n", position) + 1
+        # The old end-of-file sentinel moves to the start of the first new
+        # row, past any line break that completed the previous last row.
+        self._offsets[-1] = offsets[0]
+        self._offsets.extend(offsets[1:])
+        self._offsets.append(self._size)
+        self._save_index()
+        return len(offsets)
+
+    def close(self) -> None:
+        """Releases the memory map and the file handle."""
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def _parse(self, start: int, end: int) -> List[List[str]]:
+        """Parses the CSV rows stored in bytes `[start, end)`."""
+        try:
+            data = self._map[start:end]
+        except ValueError:
+            # `refresh` closed the map this reader had just picked up
+            data = self._map[start:end]
+        text = data.decode(self.encoding)
+        return list(csv.reader(io.StringIO(text, newline=None)))
+
+    def _build_index(self) -> array:
+        """
+        Scans the mapped file once and records where every row starts.
+
+        The first offset is the start of the first data row (just past the
+        header) and the last one is the end of the file, so row `i` spans
+        `offsets[i]:offsets[i + 1]`.
+        """
+        offsets = array("Q")
+        data = self._map
+        position = data.find(b"\n") + 1 if self._size else 0
+        if position == 0:
+            position = self._size
+        while position < self._size:
+            offsets.append(position)
+            position = data.find(b"\n", position) + 1
+            if position == 0:
+                position = self._size
+        offsets.append(self._size)
+        return offsets
+
+    def _load_index(self) -> Optional[array]:
+        """Returns the saved offset index, or None if missing or stale."""
+        try:
+            with open(self.index_path, "rb") as f:
+                header = f.read(INDEX_HEADER.size)
+                if len(header) != INDEX_HEADER.size:
+                    return None
+                magic, version, size, mtime = INDEX_HEADER.unpack(header)
+                if (magic, version, size, mtime) != (
+                        INDEX_MAGIC, INDEX_VERSION, self._size, self._mtime):
+                    return None
+                offsets = array("Q")
+                offsets.frombytes(f.read())
+        except (OSError, ValueError):
+            return None
+        if not offsets or offsets[-1] != self._size:
+            return None
+        return offsets
+
+    def _save_index(self) -> None:
+        """Writes the offset index next to the CSV, if the disk allows."""
+        temp_path = "{}.{}.tmp".format(self.index_path, os.getpid())
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION,
+                                          self._size, self._mtime))
+                f.write(self._offsets.tobytes())
+            os.replace(temp_path, self.index_path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
@@ -0,0 +1,565 @@
+#!/usr/bin/env python3
+
+"""
+This module defines the `ColumnarDataset` class, a compact column-oriented
+store for the popular baby names CSV used by the pagination servers.
+
+Instead of one list of strings per row, every column is kept in a packed
+`array`:
+  - low-cardinality text columns (year, gender, ethnicity, name) are
+    dictionary-encoded as small integer codes plus a lookup table;
+  - numeric columns (Count, Rank) are stored as packed integers.
+
+Rows are only turned back into lists of strings when they are read.
+
+It also defines `FileWatch`, which lets a loaded dataset pick up rows
+appended to its CSV file without parsing it again, and `DatasetSource`,
+which opens the dataset of a pagination server and keeps it up to date,
+and `DatasetServer`, the base class of those servers.
+"""
+
+import csv
+import gzip
+import io
+import os
+import threading
+import time
+from array import array
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+# Code widths tried in order as a column's lookup table grows.
+CODE_TYPECODES = ("B", "H", "I")
+INT_COLUMNS = ("Count", "Rank")
+
+
+class ColumnarDataset:
+    """
+    Column-oriented, dictionary-encoded dataset.
+
+    The object behaves like a read-only list of rows: `len(dataset)`,
+    `dataset[i]` and `dataset[start:end]` return the same values a list of
+    `csv.reader` rows would.
+
+    Rows may be read while one writer appends more, without a lock: the
+    length grows only once a row is complete, and readers go through
+    `_layout`, which is replaced whole whenever a column buffer or lookup
+    table is swapped for a new one.
+    """
+    # Rows are read from memory: fetching a page ahead of time is not
+    # worth a thread (see `prefetch.Prefetcher`).
+    LAZY = False
+
+    def __init__(self, header: List[str],
+                 int_columns: Iterable[str] = INT_COLUMNS):
+        """
+        Initializes an empty dataset.
+
+        Args:
+            header (List[str]): The column names.
+            int_columns (Iterable[str]): Columns to store as packed integers
+            as long as every value is a canonical decimal integer.
+        """
+        self.header = list(header)
+        int_columns = set(int_columns)
+        self._columns = []
+        self._values = []  # lookup table per column, None for int columns
+        self._lookups = []  # value -> code per column, built on demand
+        for name in self.header:
+            if name in int_columns:
+                self._columns.append(array("q"))
+                self._values.append(None)
+                self._lookups.append(None)
+            else:
+                self._columns.append(array(CODE_TYPECODES[0]))
+                self._values.append([])
+                self._lookups.append({})
+        self._publish()
+        self._length = 0
+        self._frozen = False
+        self.watch: Optional[FileWatch] = None
+        self.encoding = "utf-8"
+
+    @classmethod
+    def from_buffers(cls, header: List[str], columns: List[Sequence[int]],
+                     values: List[Optional[List[str]]],
+                     length: int) -> "ColumnarDataset":
+        """
+        Builds a dataset around existing column buffers without copying
+        them, e.g. `memoryview`s of a memory-mapped snapshot.
+
+        The buffers are copied into arrays the first time a row is added.
+
+        Args:
+            header (List[str]): The column names.
+            columns (List[Sequence[int]]): Codes or packed ints per column.
+            values (List[Optional[List[str]]]): Lookup table per column,
+            None for packed int columns.
+            length (int): The number of rows.
+        """
+        dataset = cls(header, ())
+        dataset._columns = list(columns)
+        dataset._values = list(values)
+        dataset._lookups = [None] * len(header)
+        dataset._publish()
+        dataset._length = length
+        dataset._frozen = True
+        return dataset
+
+    def column_buffers(self) -> List[Sequence[int]]:
+        """Returns the code or int buffer of every column."""
+        return list(self._columns)
+
+    def lookup_tables(self) -> List[Optional[List[str]]]:
+        """Returns the lookup table of every column (None for int ones)."""
+        return list(self._values)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[List, List[List]]:
+        if isinstance(key, slice):
+            return [self.row(i) for i in range(*key.indices(self._length))]
+        if key < 0:
+            key += self._length
+        if not 0 <= key < self._length:
+            raise IndexError("dataset index out of range")
+        return self.row(key)
+
+    def __iter__(self):
+        for i in range(self._length):
+            yield self.row(i)
+
+    def row(self, i: int) -> List[str]:
+        """
+        Materializes the row at position `i` as a list of strings.
+
+        Args:
+            i (int): A position in `range(len(self))`.
+
+        Returns:
+            List[str]: The row, exactly as read from the CSV.
+        """
+        row = []
+        for column, values in self._layout:
+            if values is None:
+                row.append(str(column[i]))
+            else:
+                row.append(values[column[i]])
+        return row
+
+    def append(self, row: Sequence[str]) -> None:
+        """
+        Appends one CSV row to the dataset. Empty rows (blank CSV lines)
+        are skipped.
+
+        Args:
+            row (Sequence[str]): The row, one string per column.
+
+        Raises:
+            ValueError: If the row does not have one value per column; the
+            dataset is left unchanged.
+        """
+        if not row:
+            return
+        if len(row) != len(self.header):
+            raise ValueError("row has {} values, expected {}".format(
+                len(row), len(self.header)))
+        if self._frozen:
+            self._thaw()
+        for c, value in enumerate(row):
+            if self._values[c] is None:
+                number = _canonical_int(value)
+                if number is not None:
+                    self._columns[c].append(number)
+                    continue
+                self._encode_column(c)
+            code = self._code(c, value)
+            self._columns[c].append(code)
+        self._length += 1
+
+    def extend(self, rows: Iterable[Sequence[str]]) -> None:
+        """Appends every row of `rows` to the dataset."""
+        for row in rows:
+            self.append(row)
+
+    def concat(self, other: "ColumnarDataset") -> None:
+        """
+        Appends every row of `other`, which must have the same columns.
+
+        The codes of `other` are remapped onto this dataset's lookup tables
+        column by column, so no row is materialized.
+        """
+        if len(other.header) != len(self.header):
+            raise ValueError("datasets have different columns")
+        if self._frozen:
+            self._thaw()
+        for c, column in enumerate(other._columns):
+            values = other._values[c]
+            if values is None and self._values[c] is None:
+                self._columns[c].extend(column)
+                continue
+            if self._values[c] is None:
+                self._encode_column(c)
+            if values is None:
+                codes = [self._code(c, str(number)) for number in column]
+            else:
+                remap = [self._code(c, value) for value in values]
+                codes = [remap[code] for code in column]
+            self._columns[c].extend(codes)
+        self._length += len(other)
+
+    def refresh(self) -> Optional[int]:
+        """
+        Appends the rows added to the source CSV since it was read.
+
+        Returns:
+            int: The number of rows appended, or None if the file was
+            truncated or rewritten and has to be loaded again.
+        """
+        if self.watch is None:
+            return 0
+        appended = self.watch.appended()
+        if appended is None:
+            return None
+        if not appended:
+            return 0
+        length = len(self)
+        self.extend(csv.reader(io.StringIO(appended.decode(self.encoding),
+                                           newline=None)))
+        return len(self) - length
+
+    def nbytes(self) -> int:
+        """Returns the size of the packed column buffers in bytes."""
+        return sum(column.itemsize * len(column) for column in self._columns)
+
+    def _encode_column(self, c: int) -> None:
+        """Turns packed int column `c` into a dictionary-encoded column.
+
+        Readers keep using the int column until the encoded one is
+        complete.
+        """
+        numbers = self._columns[c]
+        values = list(dict.fromkeys(numbers))  # in order of appearance
+        codes = {number: code for code, number in enumerate(values)}
+        typecode = CODE_TYPECODES[-1]
+        for code_type in CODE_TYPECODES:
+            if len(values) <= 1 << (8 * array(code_type).itemsize):
+                typecode = code_type
+                break
+        column = array(typecode, (codes[number] for number in numbers))
+        self._values[c] = [str(number) for number in values]
+        self._lookups[c] = None  # rebuilt from the values on demand
+        self._columns[c] = column
+        self._publish()
+
+    def _code(self, c: int, value: str) -> int:
+        """Returns the code of `value` in column `c`, adding it if new."""
+        lookup = self._lookups[c]
+        if lookup is None:
+            lookup = {v: code for code, v in enumerate(self._values[c])}
+            self._lookups[c] = lookup
+        code = lookup.get(value)
+        if code is None:
+            code = len(self._values[c])
+            self._values[c].append(value)
+            lookup[value] = code
+            self._widen(c)
+        return code
+
+    def _thaw(self) -> None:
+        """Copies borrowed column buffers into arrays before a write."""
+        self._columns = [column if isinstance(column, array)
+                         else array(column.format, column)
+                         for column in self._columns]
+        self._publish()
+        self._frozen = False
+
+    def _widen(self, c: int) -> None:
+        """Switches column `c` to a wider code type once it needs one."""
+        column = self._columns[c]
+        if len(self._values[c]) <= 1 << (8 * column.itemsize):
+            return
+        for typecode in CODE_TYPECODES:
+            if len(self._values[c]) <= 1 << (8 * array(typecode).itemsize):
+                self._columns[c] = array(typecode, column)
+                self._publish()
+                return
+
+    def _publish(self) -> None:
+        """Hands the current column buffers and lookup tables to the
+        readers, in a single assignment."""
+        self._layout = tuple(zip(self._columns, self._values))
+
+
+def _canonical_int(value: str) -> Optional[int]:
+    """
+    Parses `value` as an int only if printing it back gives the same text.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        return None
+    if str(number) != value or not -(1 << 63) <= number < 1 << 63:
+        return None
+    return number
+
+
+class FileWatch:
+    """
+    Tracks how much of a file has been read, to tell apart appends from
+    rewrites.
+
+    Besides the size and modification time, it remembers the last bytes
+    read: if they changed, the file was rewritten rather than appended to.
+    """
+
+    TAIL_SIZE = 64
+
+    def __init__(self, path: str, size: int, mtime: int):
+        """
+        Args:
+            path (str): The watched file.
+            size (int): How many bytes of it have been read.
+            mtime (int): Its modification time in nanoseconds at that point.
+        """
+        self.path = path
+        self.size = size
+        self.mtime = mtime
+        self.tail = self._read(max(size - self.TAIL_SIZE, 0), size)
+
+    @classmethod
+    def stat(cls, path: str) -> Tuple[int, int]:
+        """Returns the size and mtime (in nanoseconds) of `path`."""
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
+
+    def appended(self) -> Optional[bytes]:
+        """
+        Reads the complete lines appended since the last call.
+
+        Returns:
+            bytes: The new lines (empty if nothing changed), or None if the
+            file was truncated or rewritten. Compressed files can only be
+            reread as a whole.
+        """
+        size, mtime = self.stat(self.path)
+        if (size, mtime) == (self.size, self.mtime):
+            return b""
+        if (size <= self.size or self.path.endswith(".gz")
+                or self._read(self.size - len(self.tail),
+                              self.size) != self.tail):
+            return None
+        data = self._read(self.size, size)
+        skip = 0
+        if self.tail and not self.tail.endswith(b"\n"):
+            # The last line read had no line break. It was complete only if
+            # the new bytes start with one; otherwise it was extended.
+            skip = 2 if data.startswith(b"\r\n") else \
+                int(data.startswith(b"\n"))
+            if not skip:
+                return None
+        data = data[:data.rfind(b"\n") + 1]  # leave partial lines for later
+        self.size += len(data)
+        self.mtime = mtime
+        self.tail = (self.tail + data)[-self.TAIL_SIZE:]
+        return data[skip:]
+
+    def _read(self, start: int, end: int) -> bytes:
+        """Reads bytes `[start, end)` of the watched file."""
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            return f.read(end - start)
+
+
+def load_dataset(path: str, workers: int = 0, encoding: str = "utf-8",
+                 snapshot: bool = True) -> ColumnarDataset:
+    """
+    Reads a CSV file with a header line into a `ColumnarDataset`.
+
+    Args:
+        path (str): The CSV file to read. Files ending in ".gz" are
+        decompressed as a stream.
+        workers (int): When above 1, parse the file in that many processes
+        (see `parallel_ingest`).
+        encoding (str): The text encoding of the CSV file.
+        snapshot (bool): Load the rows from a binary snapshot of the file
+        when an up-to-date one exists, and write one after parsing
+        otherwise (see `dataset_snapshot`).
+
+    Returns:
+        ColumnarDataset: Every data row of the file, header excluded.
+    """
+    # The watch starts where the rows read end, so that rows appended
+    # while the file is read are neither lost nor read twice: the snapshot
+    # and parallel loaders read the `size` bytes seen here, the serial
+    # loader reads to the end of the file and tells where that was (its
+    # mtime is then taken afterwards: only a different size can follow).
+    size, mtime = FileWatch.stat(path)
+    dataset = None
+    if snapshot:
+        from dataset_snapshot import load_snapshot, save_snapshot
+        dataset = load_snapshot(path, source=(size, mtime))
+    if dataset is not None:
+        snapshot = False
+    elif workers > 1:
+        from parallel_ingest import parallel_load
+        dataset = parallel_load(path, workers, encoding=encoding, size=size)
+    elif path.endswith(".gz"):
+        with gzip.open(path, "rt", encoding=encoding) as f:
+            reader = csv.reader(f)
+            dataset = ColumnarDataset(next(reader, []))
+            dataset.extend(reader)
+    else:
+        with open(path, encoding=encoding) as f:
+            reader = csv.reader(f)
+            dataset = ColumnarDataset(next(reader, []))
+            dataset.extend(reader)
+            size = f.buffer.tell()
+        mtime = FileWatch.stat(path)[1]
+    if snapshot:
+        save_snapshot(dataset, path, source=(size, mtime))
+    dataset.encoding = encoding
+    dataset.watch = FileWatch(path, size, mtime)
+    return dataset
+
+
+class DatasetSource:
+    """
+    The dataset served by a pagination server, opened on first use, and
+    how it follows the rows appended to its file.
+
+    Nothing watches the file in the background: `refresh` reads what was
+    appended since the last call. Servers call it when `due` says that
+    `interval` seconds went by since then (see their REFRESH_INTERVAL);
+    without an interval, picking up appended rows is up to the callers.
+    """
+
+    def __init__(self, path: str, storage: str = "columnar",
+                 options: Optional[dict] = None,
+                 interval: Optional[float] = None):
+        """
+        Args:
+            path (str): The CSV file to serve.
+            storage (str): The backend (see `open_dataset`).
+            options (dict): Keyword arguments for the backend.
+            interval (float): Seconds between two automatic refreshes, or
+            None to only refresh when asked.
+        """
+        self.path = path
+        self.storage = storage
+        self.options = dict(options or {})
+        self.interval = interval
+        self.lock = threading.RLock()
+        self.dataset = None
+        self.checked = 0.0  # time.monotonic() of the last refresh
+
+    def get(self):
+        """Returns the dataset, opening it on first use."""
+        if self.dataset is None:
+            with self.lock:
+                if self.dataset is None:
+                    self.dataset = open_dataset(self.path, self.storage,
+                                                **self.options)
+                    self.checked = time.monotonic()
+        return self.dataset
+
+    def due(self) -> bool:
+        """Tells whether the open dataset should be refreshed now."""
+        return (self.interval is not None and self.dataset is not None
+                and time.monotonic() - self.checked >= self.interval)
+
+    def refresh(self) -> Optional[int]:
+        """
+        Picks up the rows appended to the file since it was read.
+
+        Only the new bytes are parsed. If the file was truncated or
+        rewritten instead, the dataset is dropped and opened again on next
+        use.
+
+        Returns:
+            int: The number of rows appended, or None after a full reload.
+        """
+        with self.lock:
+            self.checked = time.monotonic()
+            if self.dataset is None:
+                return 0
+            appended = self.dataset.refresh()
+            if appended is None:
+                self.dataset = None
+            return appended
+
+    def close(self) -> None:
+        """Closes the dataset if it was opened and its backend holds
+        resources (connections, worker processes); it is opened again on
+        next use."""
+        with self.lock:
+            dataset, self.dataset = self.dataset, None
+        if dataset is not None and hasattr(dataset, "close"):
+            dataset.close()
+
+
+class DatasetServer:
+    """
+    Base of the pagination servers: serves DATA_FILE, opened on first use
+    with the STORAGE backend, through a `DatasetSource`.
+    """
+    DATA_FILE = "Popular_Baby_Names.csv"
+    STORAGE = "columnar"
+    STORAGE_OPTIONS = {}
+    # Seconds between the checks for rows appended to DATA_FILE, made when
+    # the dataset is used; None leaves them to the callers of `refresh`.
+    REFRESH_INTERVAL = None
+
+    def __init__(self):
+        self.source = DatasetSource(self.DATA_FILE, self.STORAGE,
+                                    self.STORAGE_OPTIONS,
+                                    self.REFRESH_INTERVAL)
+
+    def dataset(self) -> Sequence[List]:
+        """Cached dataset
+        """
+        if self.source.due():
+            self.refresh()
+        return self.source.get()
+
+    def refresh(self) -> Optional[int]:
+        """
+        Picks up the rows appended to DATA_FILE since it was loaded.
+
+        Only the new bytes are parsed. If the file was truncated or
+        rewritten instead, the cached dataset is dropped and loaded again
+        on next use.
+
+        Returns:
+            int: The number of rows appended, or None after a full reload.
+        """
+        return self.source.refresh()
+
+
+def open_dataset(path: str, storage: str = "columnar", **options):
+    """
+    Opens `path` with the requested storage backend.
+
+    Args:
+        path (str): The CSV file to serve.
+        storage (str): "columnar" loads every row into a `ColumnarDataset`;
+        "mmap" serves rows from a `MappedDataset` memory map; "sqlite"
+        serves rows from a `SQLiteDataset` database file; "sharded" splits
+        the rows across the worker processes of a `ShardedDataset`.
+        **options: Keyword arguments for the backend.
+
+    Returns:
+        A read-only sequence of rows.
+    """
+    if storage == "columnar":
+        return load_dataset(path, **options)
+    if storage == "mmap":
+        from mapped_dataset import MappedDataset
+        return MappedDataset(path, **options)
+    if storage == "sqlite":
+        from sqlite_dataset import SQLiteDataset
+        return SQLiteDataset(path, **options)
+    if storage == "sharded":
+        from sharded_dataset import ShardedDataset
+        return ShardedDataset(path, **options)
+    raise ValueError("unknown storage: {}".format(storage))
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+
+"""
+This module defines the `PageCache` class, an LRU cache of encoded
+hypermedia responses that sits in front of a pagination `Server`.
+
+Responses are stored as the final JSON bytes, keyed by `(page, page_size)`
+for `get_hyper` and `(index, page_size)` for `get_hyper_index`, so a hit
+skips both the page lookup and the encoding.
+
+Entries stay correct as the data changes:
+  - `get_hyper` keys include the dataset length, so appended rows make
+    the old pages unreachable and they age out;
+  - deleting, restoring or appending rows drops the `get_hyper_index`
+    entries whose `[index, next_index]` range covers a changed position
+    (a short last page ends at the dataset size, where rows are appended);
+  - a reloaded dataset clears the cache.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+
+class PageCache:
+    """
+    Bounded LRU cache of encoded `get_hyper` / `get_hyper_index` responses.
+    """
+
+    def __init__(self, server, max_entries: int = 256):
+        """
+        Args:
+            server: A pagination `Server` with `get_hyper` and/or
+            `get_hyper_index`.
+            max_entries (int): The maximum number of cached responses.
+        """
+        assert type(max_entries) is int and max_entries > 0
+        self.server = server
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[Tuple, bytes]" = OrderedDict()
+        self._spans: Dict[Tuple, Tuple[int, int]] = {}  # index key -> span
+        self._lock = threading.Lock()
+        self._dataset = None
+        self._indexed = None
+
+    def get_hyper(self, page: int = 1, page_size: int = 10) -> bytes:
+        """Returns `server.get_hyper(page, page_size)` encoded as JSON."""
+        dataset = self._current_dataset()
+        key = ("page", page, page_size, len(dataset))
+        encoded = self._lookup(key)
+        if encoded is None:
+            encoded = self._encode(self.server.get_hyper(page, page_size))
+            self._store(key, encoded)
+        return encoded
+
+    def get_hyper_index(self, index: int = None,
+                        page_size: int = 10) -> bytes:
+        """Returns `server.get_hyper_index(index, page_size)` encoded as
+        JSON."""
+        indexed = self._current_indexed()
+        assert index is not None and 0 <= index < indexed.size
+        key = ("index", index, page_size)
+        encoded = self._lookup(key)
+        if encoded is None:
+            version = indexed.version
+            res = self.server.get_hyper_index(index, page_size)
+            encoded = self._encode(res)
+            self._store(key, encoded, (index, res["next_index"]),
+                        (indexed, version))
+        return encoded
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the hit, miss, eviction and invalidation counters."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+
+    def clear(self) -> None:
+        """Drops every cached response."""
+        with self._lock:
+            self._entries.clear()
+            self._spans.clear()
+
+    def _invalidate(self, first: int, last: int) -> None:
+        """Drops the index entries whose span covers `first..last`."""
+        with self._lock:
+            stale = [key for key, (index, next_index) in self._spans.items()
+                     if index <= last and first <= next_index]
+            for key in stale:
+                del self._entries[key]
+                del self._spans[key]
+            self.invalidations += len(stale)
+
+    def _lookup(self, key: Tuple):
+        """Returns the cached bytes for `key`, or None on a miss."""
+        with self._lock:
+            encoded = self._entries.get(key)
+            if encoded is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return encoded
+
+    def _store(self, key: Tuple, encoded: bytes, span=None,
+               built_from=None) -> None:
+        """
+        Caches `encoded`, evicting the least recently used entries.
+
+        Args:
+            span (tuple): The `(index, next_index)` range of an index entry.
+            built_from (tuple): The `(indexed, version)` the entry was
+            built from. The entry is dropped if a write completed since:
+            writers bump the version before they call `_invalidate`, and
+            that call waits for the lock held here, so a write either is
+            seen here or invalidates the entry afterwards.
+        """
+        with self._lock:
+            if built_from is not None:
+                indexed, version = built_from
+                if indexed is not self._indexed or indexed.version != version:
+                    return
+            self._entries[key] = encoded
+            self._entries.move_to_end(key)
+            if span is not None:
+                self._spans[key] = span
+            while len(self._entries) > self.max_entries:
+                old_key, _ = self._entries.popitem(last=False)
+                self._spans.pop(old_key, None)
+                self.evictions += 1
+
+    def _current_dataset(self):
+        """Returns the server's dataset, clearing the cache if it was
+        reloaded."""
+        dataset = self.server.dataset()
+        if dataset is not self._dataset:
+            self.clear()
+            self._dataset = dataset
+        return dataset
+
+    def _current_indexed(self):
+        """Returns the server's indexed dataset, clearing the cache and
+        following the new one if it was reloaded."""
+        indexed = self.server.indexed_dataset()
+        if indexed is not self._indexed:
+            with self._lock:
+                if indexed is not self._indexed:
+                    self._entries.clear()
+                    self._spans.clear()
+                    indexed.subscribe(self._invalidate)
+                    self._indexed = indexed
+        return indexed
+
+    @staticmethod
+    def _encode(res: Dict) -> bytes:
+        """Encodes a response as compact JSON."""
+        return json.dumps(res, separators=(",", ":")).encode("utf-8")
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+
+"""
+This module parses large CSV files into a `ColumnarDataset` with a pool of
+worker processes.
+
+Plain files are split on newline boundaries into byte ranges that every
+worker reads on its own. Gzip-compressed files cannot be seeked into, so
+they are decompressed as a stream in the parent process and handed to the
+workers in newline-aligned blocks. Either way the parsed chunks are
+concatenated in file order, giving the same rows as the serial loader.
+
+Like `MappedDataset`, chunking splits rows on newlines, so quoted fields
+must not contain line breaks.
+"""
+
+import csv
+import gzip
+import io
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Tuple
+
+from names_dataset import ColumnarDataset
+
+# Target size of the blocks handed to the workers.
+CHUNK_SIZE = 4 << 20
+
+
+def parallel_load(path: str, workers: int = None,
+                  chunk_size: int = CHUNK_SIZE,
+                  encoding: str = "utf-8",
+                  size: int = None) -> ColumnarDataset:
+    """
+    Reads a CSV file with a header line into a `ColumnarDataset` using a
+    process pool.
+
+    Args:
+        path (str): The CSV file to read, optionally gzip-compressed
+        (".gz" suffix).
+        workers (int): The number of worker processes. Defaults to the
+        number of CPUs.
+        chunk_size (int): The approximate number of bytes per task.
+        encoding (str): The text encoding of the CSV file.
+        size (int): How many bytes of a plain file to read. Defaults to
+        its current size.
+
+    Returns:
+        ColumnarDataset: Every data row of the file, header excluded.
+    """
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        if path.endswith(".gz"):
+            header, chunks = _submit_stream(pool, path, chunk_size,
+                                            encoding, 2 * workers)
+        else:
+            header, chunks = _submit_ranges(pool, path, chunk_size,
+                                            encoding, size)
+        dataset = ColumnarDataset(header)
+        for chunk in chunks:
+            dataset.concat(chunk)
+    return dataset
+
+
+def parse_range(path: str, start: int, end: int, header: List[str],
+                encoding: str) -> ColumnarDataset:
+    """
+    Parses the rows stored in bytes `[start, end)` of `path`.
+
+    Runs in a worker process.
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return parse_block(data, header, encoding)
+
+
+def parse_block(data: bytes, header: List[str],
+                encoding: str) -> ColumnarDataset:
+    """
+    Parses a newline-aligned block of CSV rows.
+
+    Runs in a worker process.
+    """
+    chunk = ColumnarDataset(header)
+    chunk.extend(csv.reader(io.StringIO(data.decode(encoding),
+                                        newline=None)))
+    return chunk
+
+
+def split_ranges(path: str, chunk_size: int,
+                 size: int = None) -> Tuple[bytes, List[Tuple[int, int]]]:
+    """
+    Splits the data rows of `path` into newline-aligned byte ranges.
+
+    Args:
+        size (int): How many bytes of the file to split. Defaults to its
+        current size.
+
+    Returns:
+        tuple: The raw header line, and the `(start, end)` ranges.
+    """
+    if size is None:
+        size = os.path.getsize(path)
+    ranges = []
+    with open(path, "rb") as f:
+        header = f.readline()
+        start = f.tell()
+        while start < size:
+            f.seek(min(start + chunk_size, size))
+            f.readline()
+            end = min(f.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return header, ranges
+
+
+def _parse_header(line: bytes, encoding: str) -> List[str]:
+    """Parses the header line of the CSV file."""
+    rows = list(csv.reader(io.StringIO(line.decode(encoding), newline=None)))
+    return rows[0] if rows else []
+
+
+def _submit_ranges(pool, path, chunk_size, encoding, size=None):
+    """Queues one task per byte range of a plain CSV file."""
+    raw_header, ranges = split_ranges(path, chunk_size, size)
+    header = _parse_header(raw_header, encoding)
+    futures = [pool.submit(parse_range, path, start, end, header, encoding)
+               for start, end in ranges]
+    return header, (future.result() for future in futures)
+
+
+def _submit_stream(pool, path, chunk_size, encoding, limit):
+    """Queues one task per decompressed block of a gzip CSV file."""
+    stream = gzip.open(path, "rb")
+    header = _parse_header(stream.readline(), encoding)
+    return header, _stream_results(pool, stream, chunk_size, header,
+                                   encoding, limit)
+
+
+def _stream_results(pool, stream, chunk_size, header, encoding,
+                    limit) -> Iterator[ColumnarDataset]:
+    """
+    Feeds newline-aligned blocks of `stream` to the pool and yields the
+    parsed chunks in order, keeping a bounded number of blocks in flight.
+    """
+    pending = deque()
+    with stream:
+        rest = b""
+        while True:
+            block = stream.read(chunk_size)
+            if not block:
+                break
+            block = rest + block
+            cut = block.rfind(b"\n") + 1
+            if cut == 0:
+                rest = block
+                continue
+            block, rest = block[:cut], block[cut:]
+            pending.append(pool.submit(parse_block, block, header, encoding))
+            if len(pending) >= limit:
+                yield pending.popleft().result()
+        if rest:
+            pending.append(pool.submit(parse_block, rest, header, encoding))
+    while pending:
+        yield pending.popleft().result()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+
+"""
+This module defines the `Prefetcher` class, which sits in front of a
+pagination `Server` and fetches the page a client is most likely to ask
+for next: the `next_page` of a `get_hyper` response, or the `next_index`
+of a `get_hyper_index` response.
+
+Next pages are built by a background thread and kept in a small bounded
+buffer. Prefetching is only worth it when reading a page is slow, so it
+only runs for backends marked `LAZY` (mmap, SQLite and sharded storage),
+unless forced.
+
+A buffered page is only served while the data it was built from is
+unchanged: `get_hyper` pages are tied to the dataset and its length,
+`get_hyper_index` pages to the indexed dataset and its version.
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+
+
+class Prefetcher:
+    """
+    Serves `get_hyper` / `get_hyper_index` and prefetches the next page.
+    """
+
+    def __init__(self, server, max_pages: int = 4, always: bool = False):
+        """
+        Args:
+            server: A pagination `Server` with `get_hyper` and/or
+            `get_hyper_index`.
+            max_pages (int): The maximum number of prefetched pages kept.
+            always (bool): Prefetch even if the backend is not `LAZY`.
+        """
+        assert type(max_pages) is int and max_pages > 0
+        self.server = server
+        self.max_pages = max_pages
+        self.always = always
+        self.requests = 0
+        self.scheduled = 0
+        self.used = 0
+        self.wasted = 0
+        self._buffer: "OrderedDict[Tuple, Tuple[Future, Tuple]]" = \
+            OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1,
+                                            thread_name_prefix="prefetch")
+
+    def get_hyper(self, page: int = 1, page_size: int = 10) -> Dict:
+        """Returns `server.get_hyper(page, page_size)`, then prefetches
+        its next page."""
+        dataset = self.server.dataset()
+        state = (dataset, len(dataset))
+        res = self._take(("page", page, page_size), state)
+        if res is None:
+            res = self.server.get_hyper(page, page_size)
+        if res["next_page"] is not None and self._enabled(dataset):
+            self._schedule(("page", res["next_page"], page_size), state,
+                           self.server.get_hyper, res["next_page"],
+                           page_size)
+        return res
+
+    def get_hyper_index(self, index: int = None,
+                        page_size: int = 10) -> Dict:
+        """Returns `server.get_hyper_index(index, page_size)`, then
+        prefetches its next page."""
+        indexed = self.server.indexed_dataset()
+        state = (indexed, indexed.version)
+        res = self._take(("index", index, page_size), state)
+        if res is None:
+            res = self.server.get_hyper_index(index, page_size)
+        next_index = res["next_index"]
+        if (next_index < indexed.size
+                and self._enabled(self.server.dataset())):
+            self._schedule(("index", next_index, page_size), state,
+                           self.server.get_hyper_index, next_index,
+                           page_size)
+        return res
+
+    def stats(self) -> Dict[str, int]:
+        """Returns how many prefetched pages were used and wasted."""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "scheduled": self.scheduled,
+                "used": self.used,
+                "wasted": self.wasted,
+                "buffered": len(self._buffer),
+                "max_pages": self.max_pages,
+            }
+
+    def clear(self) -> None:
+        """Drops every prefetched page."""
+        with self._lock:
+            while self._buffer:
+                self._discard(self._buffer.popitem()[1][0])
+
+    def close(self) -> None:
+        """Drops the prefetched pages and stops the background thread."""
+        self.clear()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _enabled(self, dataset) -> bool:
+        """Tells whether pages of `dataset` are worth prefetching."""
+        return self.always or getattr(dataset, "LAZY", False)
+
+    def _take(self, key: Tuple, state: Tuple) -> Optional[Dict]:
+        """Returns the prefetched response for `key` if it was built from
+        `state`, or None."""
+        with self._lock:
+            self.requests += 1
+            entry = self._buffer.pop(key, None)
+            if entry is None:
+                return None
+            future, built_from = entry
+            if built_from[0] is not state[0] or built_from[1] != state[1]:
+                self._discard(future)
+                return None
+        try:
+            res = future.result()
+        except Exception:
+            # Let the caller run the request itself and see the error.
+            res = None
+        with self._lock:
+            if res is None:
+                self.wasted += 1
+            else:
+                self.used += 1
+        return res
+
+    def _schedule(self, key: Tuple, state: Tuple, call: Callable,
+                  *args) -> None:
+        """Builds the response for `key` in the background, evicting the
+        oldest prefetched pages beyond `max_pages`."""
+        with self._lock:
+            if key in self._buffer:
+                return
+            try:
+                future = self._executor.submit(call, *args)
+            except RuntimeError:
+                return  # closed
+            self._buffer[key] = (future, state)
+            self.scheduled += 1
+            while len(self._buffer) > self.max_pages:
+                self._discard(self._buffer.popitem(last=False)[1][0])
+
+    def _discard(self, future: Future) -> None:
+        """Counts a prefetched page that will never be served. Must be
+        called with the lock held."""
+        future.cancel()
+        self.wasted += 1
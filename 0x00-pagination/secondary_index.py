@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+
+"""
+This module defines secondary indexes over the columns of a dataset:
+  - `HashIndex` maps every value of a categorical column to the sorted
+    positions (posting list) of the rows holding it;
+  - `SortedIndex` keeps the row positions ordered by a numeric column, in
+    both directions.
+
+Both are built with a single pass over the rows and stored in packed
+`array('I')` buffers.
+"""
+
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Sequence
+
+
+class HashIndex:
+    """
+    Posting lists of row positions for every value of one column.
+    """
+
+    def __init__(self, column: str):
+        """
+        Initializes an empty index.
+
+        Args:
+            column (str): The name of the indexed column.
+        """
+        self.column = column
+        self.postings: Dict[str, array] = {}
+
+    def add(self, position: int, value: str) -> None:
+        """Records that the row at `position` holds `value`."""
+        posting = self.postings.get(value)
+        if posting is None:
+            posting = self.postings[value] = array("I")
+        posting.append(position)
+
+    def lookup(self, value: str) -> array:
+        """Returns the sorted positions of the rows holding `value`."""
+        return self.postings.get(value, array("I"))
+
+
+class SortedIndex:
+    """
+    Row positions ordered by the integer value of one column.
+    """
+
+    def __init__(self, column: str):
+        """
+        Initializes an empty index.
+
+        Args:
+            column (str): The name of the indexed column.
+        """
+        self.column = column
+        self._keys = array("q")
+        self.order = array("I")
+        self.ranks = array("I")
+        self.descending_order = array("I")
+        self.descending_ranks = array("I")
+
+    def add(self, position: int, value: str) -> None:
+        """Records the value of the row at `position`."""
+        self._keys.append(int(value))
+
+    def build(self) -> None:
+        """Sorts the positions collected by `add`, in ascending and
+        descending order. Ties keep file order either way."""
+        keys = self._keys
+        self.order = array("I", sorted(range(len(keys)),
+                                       key=keys.__getitem__))
+        self.descending_order = array("I", sorted(
+            range(len(keys)), key=lambda position: -keys[position]))
+        self.ranks = _ranks(self.order)
+        self.descending_ranks = _ranks(self.descending_order)
+        self._keys = array("q")
+
+    def sorted_positions(self, descending: bool = False) -> array:
+        """Returns every position, ordered by the column."""
+        return self.descending_order if descending else self.order
+
+    def sort(self, positions: List[int], descending: bool = False) -> None:
+        """Sorts `positions` in place by the column."""
+        ranks = self.descending_ranks if descending else self.ranks
+        positions.sort(key=ranks.__getitem__)
+
+
+def _ranks(order: Sequence[int]) -> array:
+    """Returns the rank of every position of a permutation."""
+    ranks = array("I", bytes(4 * len(order)))
+    for rank, position in enumerate(order):
+        ranks[position] = rank
+    return ranks
+
+
+def build_indexes(dataset: Sequence[List], header: List[str],
+                  hash_columns: Iterable[str],
+                  sorted_columns: Iterable[str]) -> Dict:
+    """
+    Builds the requested indexes with one pass over `dataset`.
+
+    Args:
+        dataset (Sequence[List]): The rows to index.
+        header (List[str]): The column names of the rows.
+        hash_columns (Iterable[str]): Columns that get a `HashIndex`.
+        sorted_columns (Iterable[str]): Columns that get a `SortedIndex`.
+
+    Returns:
+        dict: The indexes, keyed by column name.
+    """
+    indexes = {}
+    targets = []
+    for column in hash_columns:
+        indexes[column] = HashIndex(column)
+        targets.append((header.index(column), indexes[column]))
+    for column in sorted_columns:
+        indexes[column] = SortedIndex(column)
+        targets.append((header.index(column), indexes[column]))
+    for position, row in enumerate(dataset):
+        for c, index in targets:
+            index.add(position, row[c])
+    for index in indexes.values():
+        if isinstance(index, SortedIndex):
+            index.build()
+    return indexes
+
+
+def intersect(postings: List[Sequence[int]]) -> List[int]:
+    """
+    Intersects sorted posting lists.
+
+    Walks the shortest list and binary-searches the others, so the cost
+    depends on the size of the postings, not on the size of the dataset.
+    """
+    if not postings:
+        return []
+    postings = sorted(postings, key=len)
+    shortest, others = postings[0], postings[1:]
+    result = []
+    for position in shortest:
+        for posting in others:
+            i = bisect_left(posting, position)
+            if i == len(posting) or posting[i] != position:
+                break
+        else:
+            result.append(position)
+    return result
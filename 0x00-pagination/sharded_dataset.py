@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+
+"""
+This module splits the rows of a CSV file across local worker processes.
+
+`ShardedDataset` cuts the file into contiguous, newline-aligned byte
+ranges, one per shard. Every shard is a process that parses its own range
+and keeps its rows in an `IndexedDataset`, so deletions are tracked where
+the rows live. The coordinator only keeps the first position and the live
+row count of every shard:
+  - a slice is scattered to the shards it overlaps and the parts are
+    gathered back in order; the requests are all sent before any reply is
+    read, so the shards work on them in parallel;
+  - `ShardedIndex` pages over live rows shard after shard, skipping the
+    shards whose rows are all deleted without asking them; its `live`
+    answers the `LiveIndex` queries the same way.
+
+Rows appended to the CSV go to the last shard.
+
+Like `MappedDataset`, ranges are split on newlines, so quoted fields must
+not contain line breaks.
+"""
+
+import csv
+import io
+import multiprocessing
+import os
+import threading
+import time
+from bisect import bisect_right
+from typing import (Callable, Iterable, Iterator, List, Optional, Tuple,
+                    TypeVar, Union)
+
+from live_index import IndexedDataset
+from names_dataset import FileWatch
+from parallel_ingest import _parse_header, parse_range, split_ranges
+
+T = TypeVar("T")
+
+
+class ShardedDataset:
+    """
+    Read-only list of CSV rows held by worker processes.
+    """
+    LAZY = True
+
+    def __init__(self, path: str, shards: Optional[int] = None,
+                 encoding: str = "utf-8"):
+        """
+        Starts one worker process per shard and waits for them to load.
+
+        Args:
+            path (str): The CSV file to serve, with a header line.
+            shards (int): The number of shards. Defaults to the number of
+            CPUs. Small files may get fewer shards.
+            encoding (str): The text encoding of the CSV file.
+        """
+        self.path = path
+        self.encoding = encoding
+        size, mtime = FileWatch.stat(path)
+        shards = shards or os.cpu_count() or 1
+        raw_header, ranges = split_ranges(path, -(-size // shards) or 1,
+                                          size)
+        if not ranges:
+            # Keep one (empty) shard to receive appended rows.
+            ranges = [(size, size)]
+        self.header = _parse_header(raw_header, encoding)
+
+        self._connections = []
+        self._processes = []
+        for start, end in ranges:
+            connection, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_serve_shard, daemon=True,
+                args=(child, path, start, end, self.header, encoding))
+            process.start()
+            child.close()
+            self._connections.append(connection)
+            self._processes.append(process)
+        self._locks = [threading.Lock() for _ in ranges]
+        self._sizes = [connection.recv() for connection in self._connections]
+        self._live = list(self._sizes)
+        self._starts = []
+        self._length = 0
+        for shard_size in self._sizes:
+            self._starts.append(self._length)
+            self._length += shard_size
+        self.watch = FileWatch(path, size, mtime)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[List, List[List]]:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._length)
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            if start >= stop:
+                return []
+            first, last = self.shard_of(start), self.shard_of(stop - 1)
+            parts = self._scatter([
+                (shard, "slice",
+                 max(start - self._starts[shard], 0),
+                 min(stop - self._starts[shard], self._sizes[shard]))
+                for shard in range(first, last + 1)])
+            return [row for part in parts for row in part]
+        if key < 0:
+            key += self._length
+        if not 0 <= key < self._length:
+            raise IndexError("dataset index out of range")
+        shard = self.shard_of(key)
+        return self._call(shard, "row", key - self._starts[shard])
+
+    def __iter__(self) -> Iterator[List[str]]:
+        for start in range(0, self._length, 10000):
+            yield from self[start:start + 10000]
+
+    @property
+    def live_counts(self) -> List[int]:
+        """The number of live (not deleted) rows of every shard."""
+        return list(self._live)
+
+    def shard_of(self, index: int) -> int:
+        """Returns the shard holding the row at position `index`."""
+        return max(bisect_right(self._starts, index) - 1, 0)
+
+    def refresh(self) -> Optional[int]:
+        """
+        Sends the rows appended to the CSV since it was loaded to the last
+        shard.
+
+        Returns:
+            int: The number of rows appended, or None if the CSV was
+            truncated or rewritten and has to be opened again (the workers
+            are then stopped).
+        """
+        appended = self.watch.appended()
+        if appended is None:
+            self.close()
+            return None
+        if not appended:
+            return 0
+        shard = len(self._sizes) - 1
+        with self._locks[shard]:
+            count = self._request(shard, "extend", appended)
+            self._sizes[shard] += count
+            self._live[shard] += count
+            self._length += count
+        return count
+
+    def close(self) -> None:
+        """Stops the worker processes."""
+        for shard, connection in enumerate(self._connections):
+            with self._locks[shard]:
+                try:
+                    connection.send(("close",))
+                except (OSError, ValueError):
+                    pass
+                connection.close()
+        for process in self._processes:
+            process.join()
+
+    def _call(self, shard: int, command: str, *args):
+        """Runs one command on one shard."""
+        with self._locks[shard]:
+            return self._request(shard, command, *args)
+
+    def _request(self, shard: int, command: str, *args):
+        """Sends a command to a shard whose lock is held, and returns the
+        reply."""
+        connection = self._connections[shard]
+        connection.send((command, *args))
+        return _unwrap(connection.recv())
+
+    def _scatter(self, requests: List[Tuple]) -> List:
+        """
+        Sends `(shard, command, *args)` requests, in increasing shard order,
+        to their shards at once, then gathers the replies in order.
+        """
+        locks = [self._locks[request[0]] for request in requests]
+        for lock in locks:
+            lock.acquire()
+        try:
+            for shard, *command in requests:
+                self._connections[shard].send(tuple(command))
+            replies = [self._connections[shard].recv()
+                       for shard, *_ in requests]
+        finally:
+            for lock in locks:
+                lock.release()
+        return [_unwrap(reply) for reply in replies]
+
+
+class ShardedLiveIndex:
+    """
+    Read-only `LiveIndex` over the live rows of every shard.
+
+    Every call asks the shards it needs, skipping those whose rows are all
+    deleted; positions are global.
+    """
+
+    def __init__(self, dataset: ShardedDataset):
+        self.dataset = dataset
+
+    def __len__(self) -> int:
+        return sum(self.dataset._live)
+
+    @property
+    def size(self) -> int:
+        """The number of positions, deleted ones included."""
+        return len(self.dataset)
+
+    def is_live(self, position: int) -> bool:
+        """Tells whether `position` is in range and not deleted."""
+        dataset = self.dataset
+        if not 0 <= position < len(dataset):
+            return False
+        shard = dataset.shard_of(position)
+        return dataset._call(shard, "is_live",
+                             position - dataset._starts[shard])
+
+    def rank(self, position: int) -> int:
+        """Returns the number of live positions strictly before `position`."""
+        dataset = self.dataset
+        if position >= len(dataset):
+            return len(self)
+        if position <= 0:
+            return 0
+        shard = dataset.shard_of(position)
+        rank = sum(dataset._live[:shard])
+        if dataset._live[shard]:
+            rank += dataset._call(shard, "rank",
+                                  position - dataset._starts[shard])
+        return rank
+
+    def select(self, k: int) -> int:
+        """Returns the position of the live row with rank `k` (0-based)."""
+        dataset = self.dataset
+        for shard, live in enumerate(dataset._live):
+            if k < live:
+                return dataset._starts[shard] + dataset._call(
+                    shard, "select", k)
+            k -= live
+        return len(dataset)
+
+    def next_live(self, position: int, count: int) -> List[int]:
+        """Returns up to `count` live positions starting at `position`."""
+        dataset = self.dataset
+        position = max(position, 0)
+        positions: List[int] = []
+        shard = dataset.shard_of(position)
+        local = position - dataset._starts[shard]
+        while shard < len(dataset._sizes) and len(positions) < count:
+            if dataset._live[shard] and local < dataset._sizes[shard]:
+                start = dataset._starts[shard]
+                positions += [start + p for p in dataset._call(
+                    shard, "next_live", local, count - len(positions))]
+            shard += 1
+            local = 0
+        return positions
+
+    def prev_live(self, position: int, count: int) -> List[int]:
+        """
+        Returns up to `count` live positions strictly before `position`,
+        in ascending order.
+        """
+        dataset = self.dataset
+        position = min(position, len(dataset))
+        if position <= 0:
+            return []
+        positions: List[int] = []
+        shard = dataset.shard_of(position - 1)
+        local = position - dataset._starts[shard]
+        while shard >= 0 and len(positions) < count:
+            if dataset._live[shard]:
+                start = dataset._starts[shard]
+                positions[:0] = [start + p for p in dataset._call(
+                    shard, "prev_live", local, count - len(positions))]
+            shard -= 1
+            local = dataset._sizes[shard] if shard >= 0 else 0
+        return positions
+
+
+class ShardedIndex:
+    """
+    Deletion-resilient view of a `ShardedDataset`, with the same interface
+    as `IndexedDataset`.
+
+    Deletions and restorations go through this view: they are writes of a
+    seqlock, so `read` sees the live rows of every shard at one version.
+    `page` asks each shard in turn, and a page spanning several shards may
+    observe a deletion made in between.
+    """
+
+    def __init__(self, dataset: ShardedDataset):
+        self.dataset = dataset
+        self.live = ShardedLiveIndex(dataset)
+        self._write_lock = threading.Lock()
+        self._sequence = 0
+        self._listeners: List[Callable[[int, int], None]] = []
+
+    def __len__(self) -> int:
+        """The number of live rows."""
+        return sum(self.dataset._live)
+
+    @property
+    def size(self) -> int:
+        """The number of positions, deleted rows included."""
+        return len(self.dataset)
+
+    @property
+    def version(self) -> int:
+        """The number of completed writes."""
+        return self._sequence // 2
+
+    def subscribe(self, listener: Callable[[int, int], None]) -> None:
+        """
+        Registers `listener` to be called after every write with the first
+        and last positions it changed.
+        """
+        self._listeners.append(listener)
+
+    def read(self, query: Callable[[ShardedLiveIndex], T]) -> T:
+        """
+        Runs `query` against a consistent version of the live rows (see
+        `IndexedDataset.read`).
+        """
+        while True:
+            sequence = self._sequence
+            if not sequence & 1:
+                result = query(self.live)
+                if self._sequence == sequence:
+                    return result
+            time.sleep(0)
+
+    def delete(self, index: int) -> bool:
+        """Deletes the row at `index`. Returns False if it was not live."""
+        return self.delete_many([index]) == 1
+
+    def restore(self, index: int) -> bool:
+        """Brings back a deleted row. Returns False if it was not deleted."""
+        return self.restore_many([index]) == 1
+
+    def delete_many(self, indexes: Iterable[int]) -> int:
+        """Deletes the rows at `indexes` as a single write. Returns the
+        number of rows that were actually deleted."""
+        return self._write("delete", indexes, -1)
+
+    def restore_many(self, indexes: Iterable[int]) -> int:
+        """Brings back the rows at `indexes` as a single write. Returns the
+        number of rows that were actually restored."""
+        return self._write("restore", indexes, 1)
+
+    def extend(self, count: int) -> None:
+        """Rows appended with `ShardedDataset.refresh` are already live in
+        the last shard: tells the listeners about them."""
+        if count <= 0:
+            return
+        with self._write_lock:
+            self._sequence += 2  # an empty write: only the version moves
+            last = len(self.dataset) - 1
+            self._notify(last - count + 1, last)
+
+    def page(self, index: int, page_size: int) -> Tuple[List[List], int]:
+        """
+        Collects up to `page_size` live rows starting at position `index`.
+
+        Returns:
+            tuple[List[List], int]: The rows, and the position right after
+            the last row returned (or the dataset size if it ran out).
+        """
+        dataset = self.dataset
+        rows = []
+        shard = dataset.shard_of(index)
+        local = index - dataset._starts[shard]
+        while shard < len(dataset._sizes):
+            if dataset._live[shard] and local < dataset._sizes[shard]:
+                part, next_local = dataset._call(
+                    shard, "page", local, page_size - len(rows))
+                rows += part
+                if len(rows) == page_size:
+                    return rows, dataset._starts[shard] + next_local
+            shard += 1
+            local = 0
+        return rows, max(index, len(dataset))
+
+    def rows(self, positions: List[int]) -> List[List]:
+        """Fetches the rows at sorted `positions` from their shards."""
+        dataset = self.dataset
+        requests = []
+        for position in positions:
+            shard = dataset.shard_of(position)
+            if not requests or requests[-1][0] != shard:
+                requests.append((shard, "rows", []))
+            requests[-1][2].append(position - dataset._starts[shard])
+        return [row for part in dataset._scatter(requests) for row in part]
+
+    def _write(self, command: str, indexes: Iterable[int],
+               delta: int) -> int:
+        """Deletes or restores rows inside one seqlock write, and updates
+        the live counts of their shards."""
+        dataset = self.dataset
+        with self._write_lock:
+            self._sequence += 1
+            try:
+                changed = []
+                for index in indexes:
+                    if not 0 <= index < len(dataset):
+                        continue
+                    shard = dataset.shard_of(index)
+                    with dataset._locks[shard]:
+                        if dataset._request(shard, command,
+                                            index - dataset._starts[shard]):
+                            dataset._live[shard] += delta
+                            changed.append(index)
+            finally:
+                self._sequence += 1
+            if changed:
+                self._notify(min(changed), max(changed))
+            return len(changed)
+
+    def _notify(self, first: int, last: int) -> None:
+        """Tells the listeners that positions `first..last` changed."""
+        for listener in self._listeners:
+            listener(first, last)
+
+
+def _serve_shard(connection, path: str, start: int, end: int,
+                 header: List[str], encoding: str) -> None:
+    """
+    Loads bytes `[start, end)` of `path` and answers the coordinator's
+    commands until it closes the connection.
+
+    Runs in a worker process.
+    """
+    rows = parse_range(path, start, end, header, encoding)
+    indexed = IndexedDataset(rows)
+    connection.send(len(rows))
+
+    def extend(data: bytes) -> int:
+        count = len(rows)
+        rows.extend(csv.reader(io.StringIO(data.decode(encoding),
+                                           newline=None)))
+        count = len(rows) - count
+        indexed.extend(count)
+        return count
+
+    commands = {
+        "slice": lambda first, last: rows[first:last],
+        "row": rows.__getitem__,
+        "page": indexed.page,
+        "rows": indexed.rows,
+        "is_live": indexed.live.is_live,
+        "rank": indexed.live.rank,
+        "select": indexed.live.select,
+        "next_live": indexed.live.next_live,
+        "prev_live": indexed.live.prev_live,
+        "delete": indexed.delete,
+        "restore": indexed.restore,
+        "extend": extend,
+    }
+    with connection:
+        while True:
+            try:
+                command, *args = connection.recv()
+            except EOFError:
+                return
+            if command == "close":
+                return
+            try:
+                connection.send((True, commands[command](*args)))
+            except Exception as error:
+                connection.send((False, error))
+
+
+def _unwrap(reply: Tuple[bool, object]):
+    """Returns the result of a shard's reply, or raises its error."""
+    ok, result = reply
+    if not ok:
+        raise result
+    return result
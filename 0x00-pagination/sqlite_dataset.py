@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+
+"""
+This module defines the `SQLiteDataset` class, which serves the rows of a
+CSV file from a local SQLite database instead of process memory.
+
+The CSV is imported once into `<csv>.sqlite3`, with the row position as
+the integer primary key. Every process opening the same CSV then shares
+that file: pages are primary-key range queries run through a pool of at
+most `pool_size` connections.
+
+The database remembers which version of the CSV it holds (size, mtime and
+schema version). Rows appended to the CSV are imported incrementally; a
+rewritten CSV is imported again from scratch.
+"""
+
+import csv
+import io
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional, Sequence, Union
+
+from names_dataset import FileWatch
+
+SCHEMA_VERSION = 1
+BATCH_SIZE = 10000
+
+
+class SQLiteDataset:
+    """
+    Read-only list of CSV rows stored in a SQLite database.
+    """
+    LAZY = True
+
+    def __init__(self, path: str, db_path: Optional[str] = None,
+                 pool_size: int = 4, encoding: str = "utf-8"):
+        """
+        Opens the database of `path`, importing the CSV if needed.
+
+        Args:
+            path (str): The CSV file to serve, with a header line.
+            db_path (str): The SQLite file. Defaults to `path` with a
+            `.sqlite3` suffix.
+            pool_size (int): The maximum number of connections open at
+            once; readers wait for one to be returned beyond that. A
+            reader iterating over the rows holds one until it is done.
+            encoding (str): The text encoding of the CSV file.
+        """
+        self.path = path
+        self.db_path = db_path or path + ".sqlite3"
+        self.encoding = encoding
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+        self.pool_size = pool_size
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = \
+            queue.LifoQueue()
+        self._opened = 0
+        self._pool_lock = threading.Lock()
+        self.watch = self._stored_watch() or self._import()
+        self._load_schema()
+        # Catch up with rows appended since the import, or start over if
+        # the CSV was rewritten.
+        if self.refresh() is None:
+            self.close()
+            self._import()
+            self._load_schema()
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[List, List[List]]:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._length)
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            if start >= stop:
+                return []
+            with self._connection() as db:
+                return [list(row) for row in db.execute(
+                    self._select + " WHERE id >= ? AND id < ? ORDER BY id",
+                    (start, stop))]
+        if key < 0:
+            key += self._length
+        if not 0 <= key < self._length:
+            raise IndexError("dataset index out of range")
+        with self._connection() as db:
+            return list(db.execute(self._select + " WHERE id = ?",
+                                   (key,)).fetchone())
+
+    def __iter__(self) -> Iterator[List[str]]:
+        with self._connection() as db:
+            for row in db.execute(self._select + " ORDER BY id"):
+                yield list(row)
+
+    def refresh(self) -> Optional[int]:
+        """
+        Imports the rows appended to the CSV since the last import.
+
+        Returns:
+            int: The number of rows appended, or None if the CSV was
+            truncated or rewritten and has to be opened again.
+        """
+        appended = self.watch.appended()
+        if not appended:
+            return appended if appended is None else 0
+        rows = csv.reader(io.StringIO(appended.decode(self.encoding),
+                                      newline=None))
+        with self._connection() as db:
+            # Another process sharing the database may have imported the
+            # same rows already; ids are derived from the CSV, so its rows
+            # are identical and ours are skipped.
+            try:
+                count = self._insert(db, rows, self._length)
+                self._save_source(db)
+                db.commit()
+            except BaseException:
+                db.rollback()
+                raise
+        self._length += count
+        return count
+
+    def close(self) -> None:
+        """Closes every idle connection."""
+        while True:
+            try:
+                db = self._pool.get_nowait()
+            except queue.Empty:
+                return
+            db.close()
+            with self._pool_lock:
+                self._opened -= 1
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrows a connection from the pool, opening one if none is
+        idle and fewer than `pool_size` are open, waiting for one
+        otherwise."""
+        try:
+            db = self._pool.get_nowait()
+        except queue.Empty:
+            with self._pool_lock:
+                can_open = self._opened < self.pool_size
+                if can_open:
+                    self._opened += 1
+            if can_open:
+                try:
+                    db = sqlite3.connect(self.db_path,
+                                         check_same_thread=False)
+                except sqlite3.Error:
+                    with self._pool_lock:
+                        self._opened -= 1
+                    raise
+            else:
+                db = self._pool.get()
+        try:
+            yield db
+        finally:
+            self._pool.put(db)
+
+    def _load_schema(self) -> None:
+        """Reads the column names and the row count of the database."""
+        with self._connection() as db:
+            self.header = [name for name, in db.execute(
+                "SELECT name FROM columns ORDER BY position")]
+            self._length = db.execute(
+                "SELECT COUNT(*) FROM rows").fetchone()[0]
+        self._select = "SELECT {} FROM rows".format(
+            ", ".join(_column(c) for c in range(len(self.header))))
+
+    def _stored_watch(self) -> Optional[FileWatch]:
+        """Returns a watch matching what the database holds, if usable."""
+        if not os.path.exists(self.db_path):
+            return None
+        try:
+            db = sqlite3.connect(self.db_path)
+            try:
+                meta = dict(db.execute("SELECT key, value FROM meta"))
+            finally:
+                db.close()
+            if (int(meta["schema_version"]) != SCHEMA_VERSION
+                    or meta["source"] != os.path.abspath(self.path)):
+                return None
+            return FileWatch(self.path, int(meta["source_size"]),
+                             int(meta["source_mtime"]))
+        except (sqlite3.Error, KeyError, ValueError, OSError):
+            return None
+
+    def _import(self) -> FileWatch:
+        """
+        Imports the whole CSV into a fresh database file, then moves it in
+        place so that other processes never see a partial import.
+        """
+        temp_path = "{}.{}.tmp".format(self.db_path, os.getpid())
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        db = sqlite3.connect(temp_path)
+        try:
+            with open(self.path, encoding=self.encoding) as f:
+                reader = csv.reader(f)
+                header = next(reader, [])
+                columns = ", ".join("{} TEXT".format(_column(c))
+                                    for c in range(len(header)))
+                db.execute("CREATE TABLE meta "
+                           "(key TEXT PRIMARY KEY, value TEXT)")
+                db.execute("CREATE TABLE columns "
+                           "(position INTEGER PRIMARY KEY, name TEXT)")
+                db.execute("CREATE TABLE rows "
+                           "(id INTEGER PRIMARY KEY, {})".format(columns))
+                db.executemany("INSERT INTO columns VALUES (?, ?)",
+                               enumerate(header))
+                self._insert(db, reader, 0, len(header))
+                # Rows appended meanwhile were read: start watching after
+                # them, with the mtime they gave the file
+                size = f.buffer.tell()
+                mtime = FileWatch.stat(self.path)[1]
+            self.watch = FileWatch(self.path, size, mtime)
+            self._save_source(db)
+            db.commit()
+        finally:
+            db.close()
+        os.replace(temp_path, self.db_path)
+        return self.watch
+
+    def _insert(self, db: sqlite3.Connection, rows: Iterable[Sequence[str]],
+                first_id: int, width: Optional[int] = None) -> int:
+        """
+        Inserts `rows` with ids starting at `first_id`, in batches. Empty
+        rows (blank CSV lines) are skipped.
+
+        Raises:
+            ValueError: If a row does not have one value per column.
+        """
+        width = width if width is not None else len(self.header)
+        statement = "INSERT OR IGNORE INTO rows VALUES (?{})".format(
+            ", ?" * width)
+        count = 0
+        batch = []
+        for row in rows:
+            if not row:
+                continue
+            if len(row) != width:
+                raise ValueError("row has {} values, expected {}".format(
+                    len(row), width))
+            batch.append((first_id + count, *row))
+            count += 1
+            if len(batch) == BATCH_SIZE:
+                db.executemany(statement, batch)
+                batch = []
+        if batch:
+            db.executemany(statement, batch)
+        return count
+
+    def _save_source(self, db: sqlite3.Connection) -> None:
+        """Records which version of the CSV the database holds, unless it
+        already holds a later one."""
+        stored = db.execute(
+            "SELECT value FROM meta WHERE key = 'source_size'").fetchone()
+        if stored is not None and int(stored[0]) > self.watch.size:
+            return
+        db.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", [
+            ("schema_version", str(SCHEMA_VERSION)),
+            ("source", os.path.abspath(self.path)),
+            ("source_size", str(self.watch.size)),
+            ("source_mtime", str(self.watch.mtime)),
+        ])
+
+
+def _column(c: int) -> str:
+    """Returns the SQL name of the column at position `c`."""
+    return "c{}".format(c)
@@ -26,3 +26,5 @@ except AssertionError:
 print(server.get_page(1, 3))
 print(server.get_page(3, 2))
 print(server.get_page(3000, 100))
+print(server.get_pages([3, 1], 2))
+print(sum(1 for _ in server.iter_pages(100)))
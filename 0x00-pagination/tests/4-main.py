@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Main file
+"""
+
+Server = __import__('4-cursor_pagination').Server
+
+server = Server()
+
+res = server.get_cursor(page_size=2)
+print(res.get('data'))
+
+# 1- follow the next cursor
+res = server.get_cursor(res.get('next_cursor'), 2)
+print(res.get('data'))
+
+# 2- delete a row before the cursor -> the next page does not shift
+server.delete(0)
+nxt = server.get_cursor(res.get('next_cursor'), 2)
+print(nxt.get('data'))
+
+# 3- walk back from the first row of that page
+print(server.get_cursor(nxt.get('prev_cursor'), 2).get('data'))
+
+# 4- a tampered cursor is rejected
+try:
+    server.get_cursor(res.get('next_cursor')[:-2] + "xx", 2)
+except ValueError:
+    print("ValueError raised with a tampered cursor")
+
+print(server.get_cursor(server.encode_cursor(1, 3), 10).get('prev_cursor'))
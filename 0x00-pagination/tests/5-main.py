@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Main file
+"""
+
+Server = __import__('5-filtered_pagination').Server
+
+server = Server()
+
+filters = {"Year of Birth": "2012", "Ethnicity": "HISPANIC"}
+
+print(server.get_page(1, 3, filters=filters, order_by="Rank"))
+print("---")
+print(server.get_page(1, 3, order_by="-Count"))
+print("---")
+print(server.get_hyper(2, 2, filters={"Child's First Name": "Olivia"}))
+print("---")
+print(server.get_page(1, 3, filters={"Gender": "NOBODY"}))
+print("---")
+
+# Descending order keeps ties in file order, with or without filters
+filters = {"Ethnicity": "HISPANIC"}
+everything = server.select(order_by="-Rank")
+matching = set(server.select(filters))
+print(list(server.select(filters, "-Rank"))
+      == [p for p in everything if p in matching])
+print(all(a < b for a, b in zip(everything, everything[1:])
+          if server.dataset()[a][5] == server.dataset()[b][5]))
+print([row[5] for row in server.get_page(1, 3, order_by="-Rank")])
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Main file
+"""
+
+Server = __import__('6-name_rollups').Server
+
+server = Server()
+
+print(server.get_top(("Child's First Name",), 1, 3))
+print("---")
+print(server.get_top(("Ethnicity", "Child's First Name"), 1, 3,
+                     within={"Ethnicity": "HISPANIC"}))
+print("---")
+print(server.get_group_by(("Year of Birth", "Ethnicity"), 2, 4))
+print("---")
+print(server.get_group_by(("Child's First Name", "Year of Birth"), 3000, 10))
+print("---")
+
+# Rows appended and refreshed while other threads read the rollups
+import os
+import shutil
+import tempfile
+import threading
+
+directory = tempfile.mkdtemp()
+path = os.path.join(directory, "names.csv")
+shutil.copy(Server.DATA_FILE, path)
+
+
+class LiveServer(Server):
+    DATA_FILE = path
+    STORAGE_OPTIONS = {"snapshot": False}
+    MAX_VIEWS = 4
+
+
+server = LiveServer()
+server.rollups()
+errors = []
+
+
+def read():
+    try:
+        for i in range(200):
+            server.get_top(("Ethnicity", "Child's First Name"), 1, 1,
+                           within={"Ethnicity": "HISPANIC"})
+            server.get_top(("Year of Birth", "Ethnicity"), 1, 1,
+                           within={"Year of Birth": str(2011 + i % 6)})
+    except Exception as error:
+        errors.append(error)
+
+
+readers = [threading.Thread(target=read) for _ in range(4)]
+for reader in readers:
+    reader.start()
+for _ in range(20):
+    with open(path, "a") as f:
+        f.write("\n2016,FEMALE,HISPANIC,Zoe,1000,1")
+    server.refresh()
+for reader in readers:
+    reader.join()
+with open(path, "a") as f:
+    f.write("\n")
+print(server.refresh(), errors)
+print(server.get_top(("Child's First Name",), 1, 1))
+print(len(server._Server__views) <= LiveServer.MAX_VIEWS)
+shutil.rmtree(directory)
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Main file
+"""
+
+import asyncio
+
+PaginationService = __import__('7-async_server').PaginationService
+
+
+async def get(port, target):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write("GET {} HTTP/1.1\r\nHost: localhost\r\n\r\n".format(
+        target).encode())
+    response = await reader.read()
+    writer.close()
+    head, body = response.split(b"\r\n\r\n", 1)
+    return head.split(b"\r\n")[0].decode(), body.decode()
+
+
+async def main():
+    service = PaginationService()
+    listener = await service.start(port=0)
+    port = listener.sockets[0].getsockname()[1]
+    async with listener:
+        await service.wait_ready()
+        print(*await get(port, "/health"))
+        print(*await get(port, "/page?page=3&page_size=2"))
+        print(*await get(port, "/hyper?page=2&page_size=2"))
+        responses = await asyncio.gather(*(
+            get(port, "/hyper_index?index={}&page_size=1".format(i))
+            for i in range(3)))
+        for response in responses:
+            print(*response)
+        print(*await get(port, "/page?page=0"))
+        print(*await get(port, "/nowhere"))
+        print(*await get(port, "/page?page=1&x=" + "y" * 100000))
+
+
+asyncio.run(main())
+
+# Both base servers read the one dataset of their common base
+server = __import__('7-async_server').Server()
+print(server.get_page(2, 3) == [server.indexed_dataset()[i]
+                                for i in range(3, 6)])
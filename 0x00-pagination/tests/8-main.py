@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Main file
+"""
+
+Server = __import__('8-sharded_pagination').Server
+
+server = Server()
+dataset = server.dataset()
+print(len(dataset), len(dataset.live_counts))
+
+# A page spanning the first two shards
+boundary = dataset.live_counts[0]
+page_size = 4
+page = boundary // page_size + 1
+start = (page - 1) * page_size
+print(server.get_page(page, page_size) ==
+      server.get_page(1, boundary + 4)[start:start + page_size])
+print(server.get_hyper(page, 2)["next_page"])
+
+# Delete the rows around the boundary
+for index in range(boundary - 2, boundary + 3):
+    server.delete(index)
+print(len(server.indexed_dataset()), dataset.live_counts[:2])
+print(server.get_hyper_index(boundary - 3, 2))
+
+# The live index answers like the one of an unsharded dataset
+import json
+import multiprocessing
+import random
+
+IndexedDataset = __import__('live_index').IndexedDataset
+PageCache = __import__('page_cache').PageCache
+CursorServer = __import__('4-cursor_pagination').Server
+ShardedIndex = __import__('sharded_dataset').ShardedIndex
+
+indexed = server.indexed_dataset()
+reference = IndexedDataset(dataset[:])
+for index in range(boundary - 2, boundary + 3):
+    reference.delete(index)
+random.seed(0)
+points = [0, boundary - 2, boundary, len(dataset) - 1, len(dataset)] + [
+    random.randrange(len(dataset)) for _ in range(20)]
+print(all(indexed.read(lambda live: (
+    live.is_live(p), live.rank(p), live.select(p),
+    live.next_live(p, 7), live.prev_live(p, 7))) ==
+    reference.read(lambda live: (
+        live.is_live(p), live.rank(p), live.select(p),
+        live.next_live(p, 7), live.prev_live(p, 7)))
+    for p in points))
+print(indexed.rows([0, boundary + 3, len(dataset) - 1]) ==
+      [dataset[0], dataset[boundary + 3], dataset[-1]])
+
+# A page cache follows the deletions
+cache = PageCache(server)
+before = json.loads(cache.get_hyper_index(boundary + 3, 2))["data"]
+server.delete(boundary + 3)
+after = json.loads(cache.get_hyper_index(boundary + 3, 2))["data"]
+print(before[1] == after[0], cache.stats()["invalidations"])
+server.restore(boundary + 3)
+
+server.close()
+
+
+# Cursors over a sharded dataset
+class ShardedCursorServer(CursorServer):
+    """A cursor server over a sharded dataset"""
+    STORAGE = "sharded"
+    STORAGE_OPTIONS = {"shards": 4}
+    INDEX = ShardedIndex
+
+
+server = ShardedCursorServer()
+boundary = server.dataset().live_counts[0]
+for index in range(boundary - 2, boundary + 3):
+    server.delete(index)
+res = server.get_cursor(page_size=boundary - 3)
+res = server.get_cursor(res["next_cursor"], 2)
+print(res["data"] == [server.dataset()[boundary - 3],
+                      server.dataset()[boundary + 3]])
+res = server.get_cursor(res["prev_cursor"], 2)
+print(res["data"] == server.dataset()[boundary - 5:boundary - 3])
+server.close()
+
+# Closing a server that never loaded its dataset starts no worker
+Server().close()
+print(multiprocessing.active_children())
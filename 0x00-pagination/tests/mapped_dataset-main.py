@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Main file
+"""
+import csv
+import os
+import shutil
+import tempfile
+
+MappedDataset = __import__('mapped_dataset').MappedDataset
+
+
+class CountingDataset(MappedDataset):
+    """Counts the times the offset index is built"""
+    builds = 0
+
+    def _build_index(self):
+        CountingDataset.builds += 1
+        return super()._build_index()
+
+
+directory = tempfile.mkdtemp()
+path = os.path.join(directory, "names.csv")
+with open(path, "w") as f:
+    f.write("Rank,Name\n" + "".join('{},"n, {}"\n'.format(i, i)
+                                    for i in range(50)))
+with open(path) as f:
+    rows = list(csv.reader(f))[1:]
+
+# 1- rows and slices are parsed from the map
+dataset = CountingDataset(path)
+print(dataset.header, len(dataset), dataset[0], dataset[-1])
+print(dataset[10:20] == rows[10:20], dataset[::7] == rows[::7],
+      dataset[45:100] == rows[45:], dataset[30:10])
+print(os.path.exists(path + ".idx"), CountingDataset.builds)
+dataset.close()
+
+# 2- the saved index is reused
+dataset = CountingDataset(path)
+print(dataset[:] == rows, CountingDataset.builds)
+
+# 3- appended rows are mapped, and the old map is released
+old_map = dataset._map
+with open(path, "a") as f:
+    f.write("50,x\n51,y\n")
+print(dataset.refresh(), len(dataset), dataset[-2:], old_map.closed)
+dataset.close()
+print(CountingDataset(path)[-1], CountingDataset.builds)
+
+# 4- an index left behind by another version of the file is rebuilt
+shutil.copy(path + ".idx", path + ".old")
+with open(path, "a") as f:
+    f.write("52,z\n")
+shutil.copy(path + ".old", path + ".idx")
+dataset = CountingDataset(path)
+print(len(dataset), dataset[-1], CountingDataset.builds)
+dataset.close()
+with open(path + ".idx", "r+b") as f:
+    f.truncate(30)
+dataset = CountingDataset(path)
+print(len(dataset), dataset[-1], CountingDataset.builds)
+dataset.close()
+shutil.rmtree(directory)
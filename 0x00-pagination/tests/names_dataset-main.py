@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Main file
+"""
+
+ColumnarDataset = __import__('names_dataset').ColumnarDataset
+
+dataset = ColumnarDataset(["Rank", "Name"])
+
+# 1- blank CSV lines are skipped
+dataset.append(["1", "x"])
+dataset.append([])
+dataset.append(["2", "y"])
+print(len(dataset), dataset[:])
+
+# 2- rows of the wrong width are rejected before any column changes
+for row in (["3"], ["3", "z", "extra"]):
+    try:
+        dataset.append(row)
+    except ValueError as error:
+        print("ValueError:", error)
+print(len(dataset), dataset[-1])
+
+# 3- rows appended to the file are picked up, partial lines later
+import os
+import shutil
+import tempfile
+import threading
+
+load_dataset = __import__('names_dataset').load_dataset
+Server = __import__('2-hypermedia_pagination').Server
+
+directory = tempfile.mkdtemp()
+path = os.path.join(directory, "names.csv")
+with open(path, "w") as f:
+    f.write("Rank,Name\n1,a\n2,b\n")
+
+dataset = load_dataset(path)
+with open(path, "a") as f:
+    f.write("3,c\n4,")
+print(dataset.refresh(), len(dataset))
+with open(path, "a") as f:
+    f.write("d\n")
+print(dataset.refresh(), dataset[-1])
+
+# 4- the snapshot of an appended file is not used, and nothing is read twice
+dataset = load_dataset(path)
+with open(path, "a") as f:
+    f.write("5,e\n")
+dataset = load_dataset(path)
+print(len(dataset), dataset.refresh(), len(dataset))
+
+# 5- a rewritten file is loaded again
+with open(path, "w") as f:
+    f.write("Rank,Name\n9,z\n")
+print(dataset.refresh())
+
+
+# 6- a server with a REFRESH_INTERVAL follows the file by itself
+class LiveServer(Server):
+    DATA_FILE = path
+    REFRESH_INTERVAL = 0
+
+
+server = LiveServer()
+print(server.get_hyper(1, 1)["total_pages"])
+with open(path, "a") as f:
+    f.write("10,y\n")
+print(server.get_hyper(1, 1)["total_pages"])
+
+# 7- rows read while a column switches from ints to text stay consistent
+dataset = ColumnarDataset(["Rank", "Name"])
+for i in range(1000):
+    dataset.append([str(i), "x"])
+expected = dataset[:1000]
+seen = set()
+
+
+def read():
+    for _ in range(200):
+        seen.add(dataset[:1000] == expected)
+
+
+reader = threading.Thread(target=read)
+reader.start()
+for i in range(300):
+    dataset.append(["n{}".format(i), "x"])
+reader.join()
+print(seen, dataset[999], dataset[1000])
+
+# 8- a truncated or corrupt snapshot is not used, the CSV is parsed again
+import json
+snapshot = __import__('dataset_snapshot')
+
+with open(path, "w") as f:
+    f.write("Rank,Name\n" + "".join("{},n{}\n".format(i, i)
+                                    for i in range(100)))
+load_dataset(path)
+snap = snapshot.snapshot_path(path)
+print(snapshot.load_snapshot(path)[99])
+with open(snap, "rb") as f:
+    data = f.read()
+with open(snap, "wb") as f:
+    f.write(data[:-200])
+print(snapshot.load_snapshot(path), load_dataset(path)[99])
+
+with open(snap, "rb") as f:
+    header = f.read(snapshot.SNAPSHOT_HEADER.size)
+    metadata = json.loads(f.read(snapshot.SNAPSHOT_HEADER.unpack(header)[4]))
+    columns = f.read()
+metadata["columns"][0]["nbytes"] -= 1
+metadata = json.dumps(metadata).encode("utf-8")
+header = snapshot.SNAPSHOT_HEADER.unpack(header)[:4] + (len(metadata),)
+with open(snap, "wb") as f:
+    f.write(snapshot.SNAPSHOT_HEADER.pack(*header) + metadata + columns)
+print(snapshot.load_snapshot(path), len(load_dataset(path)))
+shutil.rmtree(directory)
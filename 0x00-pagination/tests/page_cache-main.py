@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Main file
+"""
+import json
+
+PageCache = __import__('page_cache').PageCache
+IndexedDataset = __import__('live_index').IndexedDataset
+
+
+class Server:
+    """A server over 25 made-up rows, with the hypermedia index only"""
+
+    def __init__(self):
+        self.rows = [[str(i)] for i in range(25)]
+        self.indexed = IndexedDataset(self.rows)
+
+    def indexed_dataset(self):
+        return self.indexed
+
+    def get_hyper_index(self, index=None, page_size=10):
+        data, next_index = self.indexed.page(index, page_size)
+        return {"index": index, "next_index": next_index,
+                "page_size": page_size, "data": data}
+
+
+def show(res):
+    res = json.loads(res)
+    print(res["index"], res["next_index"], [row[0] for row in res["data"]])
+
+
+server = Server()
+cache = PageCache(server)
+
+# 1- the short last page sees the rows appended after it was cached
+show(cache.get_hyper_index(20, 10))
+server.rows.extend([str(i)] for i in range(25, 30))
+server.indexed.extend(5)
+show(cache.get_hyper_index(20, 10))
+
+# 2- deleting a row of a cached page drops it, other pages stay cached
+show(cache.get_hyper_index(0, 5))
+show(cache.get_hyper_index(10, 5))
+server.indexed.delete(3)
+show(cache.get_hyper_index(0, 5))
+show(cache.get_hyper_index(10, 5))
+
+# 3- restoring it drops the page again
+server.indexed.restore(3)
+show(cache.get_hyper_index(0, 5))
+
+# 4- a page built while a write completed is not kept
+version = server.indexed.version
+res = cache._encode(server.get_hyper_index(15, 5))
+server.indexed.delete(16)
+cache._store(("index", 15, 5), res, (15, 20), (server.indexed, version))
+show(cache.get_hyper_index(15, 5))
+
+print(cache.stats())
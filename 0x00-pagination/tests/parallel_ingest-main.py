@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Main file
+"""
+import gzip
+import os
+import shutil
+import tempfile
+
+load_dataset = __import__('names_dataset').load_dataset
+parallel_load = __import__('parallel_ingest').parallel_load
+
+directory = tempfile.mkdtemp()
+small = os.path.join(directory, "small.csv")
+with open(small, "w", newline="") as f:
+    f.write('Rank,Name\r\n1,a\r\n\r\n2,"b, c"\r\n3,d\n\n10,e\n' +
+            "".join("{},n{}\n".format(i, i % 7) for i in range(100)))
+names = os.path.join(directory, "names.csv")
+shutil.copy("Popular_Baby_Names.csv", names)
+
+# Small chunks put many boundaries inside the file
+for path, chunk_size in ((small, 16), (names, 4096)):
+    with open(path, "rb") as f, gzip.open(path + ".gz", "wb") as out:
+        out.write(f.read())
+    serial = load_dataset(path, snapshot=False)[:]
+    for source in (path, path + ".gz"):
+        parallel = parallel_load(source, workers=3, chunk_size=chunk_size)
+        print(os.path.basename(source), len(parallel),
+              parallel[:] == serial,
+              load_dataset(source, snapshot=False)[:] == serial)
+shutil.rmtree(directory)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Main file
+"""
+
+Prefetcher = __import__('prefetch').Prefetcher
+IndexedDataset = __import__('live_index').IndexedDataset
+
+
+class Server:
+    """A server over 25 made-up rows"""
+
+    def __init__(self):
+        self.rows = [[str(i)] for i in range(25)]
+        self.indexed = IndexedDataset(self.rows)
+
+    def dataset(self):
+        return self.rows
+
+    def indexed_dataset(self):
+        return self.indexed
+
+    def get_hyper(self, page=1, page_size=10):
+        start = (page - 1) * page_size
+        total_pages = (len(self.rows) + page_size - 1) // page_size
+        return {"page": page, "data": self.rows[start:start + page_size],
+                "next_page": page + 1 if page < total_pages else None}
+
+    def get_hyper_index(self, index=None, page_size=10):
+        data, next_index = self.indexed.page(index, page_size)
+        return {"index": index, "next_index": next_index,
+                "page_size": page_size, "data": data}
+
+
+def show(res):
+    print(res.get("index", res.get("page")),
+          [row[0] for row in res["data"]])
+
+
+server = Server()
+prefetcher = Prefetcher(server, always=True)
+
+# 1- the next page is served from the buffer
+show(prefetcher.get_hyper_index(0, 5))
+show(prefetcher.get_hyper_index(5, 5))
+print(prefetcher.stats())
+
+# 2- the last pages are still prefetched once rows are deleted
+for index in range(6):
+    server.indexed.delete(index)
+prefetcher.clear()
+show(prefetcher.get_hyper_index(15, 5))
+show(prefetcher.get_hyper_index(20, 5))
+print(prefetcher.stats())
+
+# 3- a page prefetched before a deletion is dropped, not served
+show(prefetcher.get_hyper_index(10, 5))
+server.indexed.delete(17)
+show(prefetcher.get_hyper_index(15, 5))
+print(prefetcher.stats())
+
+# 4- get_hyper pages are dropped when rows are appended
+show(prefetcher.get_hyper(1, 10))
+show(prefetcher.get_hyper(2, 10))
+server.rows.append(["25"])
+show(prefetcher.get_hyper(3, 10))
+print(prefetcher.stats())
+prefetcher.close()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Main file
+"""
+import os
+import shutil
+import tempfile
+import threading
+
+SQLiteDataset = __import__('sqlite_dataset').SQLiteDataset
+
+directory = tempfile.mkdtemp()
+path = os.path.join(directory, "names.csv")
+with open(path, "w") as f:
+    f.write("Rank,Name\n" + "".join("{},n{}\n".format(i, i)
+                                    for i in range(1000)))
+dataset = SQLiteDataset(path, pool_size=2)
+print(len(dataset), dataset[999])
+
+# 1- many readers share at most pool_size connections
+results = set()
+
+
+def read():
+    for start in range(0, 1000, 10):
+        results.add(dataset[start:start + 10] == [
+            [str(i), "n{}".format(i)] for i in range(start, start + 10)])
+
+
+readers = [threading.Thread(target=read) for _ in range(8)]
+for reader in readers:
+    reader.start()
+for reader in readers:
+    reader.join()
+print(results, dataset._opened)
+
+# 2- a reader waits while every connection is in use
+rows = []
+with dataset._connection(), dataset._connection():
+    reader = threading.Thread(target=lambda: rows.append(dataset[5]))
+    reader.start()
+    reader.join(0.2)
+    print(reader.is_alive())
+reader.join()
+print(reader.is_alive(), rows, dataset._opened)
+
+dataset.close()
+print(dataset._opened)
+
+# 3- blank lines are skipped, rows of the wrong width are rejected
+path = os.path.join(directory, "blank.csv")
+with open(path, "w") as f:
+    f.write("Rank,Name\n1,a\n\n2,b\n")
+dataset = SQLiteDataset(path)
+print(len(dataset), dataset[:])
+with open(path, "a") as f:
+    f.write("\n3,c\n")
+print(dataset.refresh(), dataset[-1])
+with open(path, "a") as f:
+    f.write("4,d\n5\n")
+try:
+    dataset.refresh()
+except ValueError as error:
+    print("ValueError:", error)
+print(len(dataset), dataset[:][-1])
+
+# 4- the columns are not indexed: rows are only looked up by id
+with dataset._connection() as db:
+    print(db.execute("SELECT name FROM sqlite_master "
+                     "WHERE type = 'index' AND tbl_name = 'rows'").fetchall())
+dataset.close()
+shutil.rmtree(directory)
@@ -11,18 +11,26 @@ from base_caching import BaseCaching
 class BasicCache(BaseCaching):
     """
     Basic cache implementation.
+
+    Unbounded unless a capacity is given; then the oldest insertion is
+    discarded first.
     """
+    MAX_ITEMS = None
 
-    def put(self, key, item):
+    def put(self, key, item, ttl=None):
         """
         Puts an item in the cache.
 
         Args:
             key (str): The key to associate with the item.
             item (object): The data to store in the cache.
+            ttl (float): Seconds before the item expires. Defaults to the
+            cache's default_ttl.
         """
         if key is not None and item is not None:
-            self.cache_data[key] = item
+            self._expire(key)
+            self._make_room(key, item)
+            self._store(key, item, ttl)
 
     def get(self, key):
         """
@@ -34,4 +42,13 @@ class BasicCache(BaseCaching):
         Returns:
             object: The value associated with the key, or None if not found.
         """
+        self._expire(key)
         return self.cache_data.get(key, None)
+
+    def _evict(self, key):
+        """
+        Returns the oldest inserted key other than `key`.
+        """
+        for oldest in self.cache_data:
+            if oldest != key:
+                return oldest
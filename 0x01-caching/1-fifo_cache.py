@@ -2,6 +2,8 @@
 
 """A caching system that implements the First-In-First-Out (FIFO) algorithm."""
 
+from collections import OrderedDict
+
 from base_caching import BaseCaching
 
 
@@ -10,28 +12,33 @@ class FIFOCache(BaseCaching):
     A caching system that implements the First-In-First-Out (FIFO) algorithm.
     """
 
-    def __init__(self):
+    def __init__(self, max_items=None, max_weight=None, sizer=None,
+                 default_ttl=None, clock=None):
         """Initializes an empty cache with a FIFO eviction strategy."""
-        super().__init__()
-        self.cache_order = []
+        super().__init__(max_items, max_weight, sizer,
+                         default_ttl, clock)
+        # Keys from oldest to newest insertion, with O(1) removal
+        self.cache_order = OrderedDict()
 
-    def put(self, key, item):
+    def put(self, key, item, ttl=None):
         """
         Adds a key-value pair to the cache, following FIFO eviction.
 
         Args:
             key (str): The key to associate with the item.
             item (object): The data to store in the cache.
+            ttl (float): Seconds before the item expires. Defaults to the
+            cache's default_ttl.
         """
 
-        if len(self.cache_data) >= BaseCaching.MAX_ITEMS:
-            discarded_key = self.cache_order.pop(0)
-            del self.cache_data[discarded_key]
-            print(f"DISCARD: {discarded_key}")
+        # Every put makes room as if it added a new key
+        self._expire(key)
+        self._make_room(item=item)
 
         if key is not None and item is not None:
-            self.cache_data[key] = item
-            self.cache_order.append(key)
+            self._store(key, item, ttl)
+            # A replaced key keeps its place in the queue
+            self.cache_order.setdefault(key)
 
     def get(self, key):
         """
@@ -43,4 +50,17 @@ class FIFOCache(BaseCaching):
         Returns:
             object: The value associated with the key, or None if not found.
         """
+        self._expire(key)
         return self.cache_data.get(key, None)
+
+    def _evict(self, key):
+        """
+        Pops the oldest key of the insertion order.
+        """
+        return self.cache_order.popitem(last=False)[0]
+
+    def _unlink(self, key):
+        """
+        Removes an expired key from the order.
+        """
+        del self.cache_order[key]
@@ -5,24 +5,37 @@ A caching system that implements the Least Frequently Used
 (LFU) algorithm.
 """
 
+from collections import OrderedDict
+
 from base_caching import BaseCaching
 
 
 class LFUCache(BaseCaching):
     """
     A caching system that implements the Least Frequently Used (LFU) algorithm.
+
+    Keys are kept in one bucket per frequency, ordered from least to most
+    recently used, so get, put and eviction are all O(1).
     """
+    # Halve every frequency after this many operations (0 disables aging),
+    # so that keys that were hot long ago do not stay in the cache forever.
+    # Aging walks every key, so it should not run more often than every
+    # MAX_ITEMS operations.
+    AGING_PERIOD = 0
 
-    def __init__(self):
+    def __init__(self, max_items=None, max_weight=None, sizer=None,
+                 default_ttl=None, clock=None):
         """
         Initialize the LFUCache.
         """
-        super().__init__()
+        super().__init__(max_items, max_weight, sizer,
+                         default_ttl, clock)
         self.freq = {}  # store the frequency of each key
-        self.usage = {}  # store the usage time of each key
-        self.time = 0  # store the current time
+        self.buckets = {}  # frequency -> keys, least recently used first
+        self.min_freq = 0  # lowest frequency in the cache
+        self.operations = 0  # operations since the last aging
 
-    def put(self, key, item):
+    def put(self, key, item, ttl=None):
         """
         Assigns the item value for the key in the cache.
         If key or item is None, this method does nothing.
@@ -33,40 +46,28 @@ class LFUCache(BaseCaching):
         Args:
             key (str): the key of the item.
             item (any): the item to be stored.
+            ttl (float): seconds before the item expires. Defaults to the
+            cache's default_ttl.
         """
         if key is None or item is None:
             return
 
+        self._expire(key)
+        # If the cache is full, discard the least recently used
+        # key among the least frequently used ones
+        self._make_room(key, item)
         if key in self.cache_data:
             # If the key already exists,
             # update the item and increment its frequency
-            self.cache_data[key] = item
-            self.freq[key] += 1
-            self.usage[key] = self.time
-            self.time += 1
+            self._store(key, item, ttl)
+            self._touch(key)
         else:
-            if len(self.cache_data) >= BaseCaching.MAX_ITEMS:
-                # If the cache is full, find the least frequently used
-                # key to discard
-                lfu_keys = [k for k, v in self.freq.items()
-                            if v == min(self.freq.values())]
-
-                if len(lfu_keys) == 1:
-                    lfu_key = lfu_keys[0]
-                else:
-                    # If there's a tie, find the least recently used
-                    # key among them
-                    lfu_key = min(lfu_keys, key=lambda k: self.usage[k])
-                print("DISCARD:", lfu_key)
-                del self.cache_data[lfu_key]
-                del self.freq[lfu_key]
-                del self.usage[lfu_key]
-
             # Add the new key and item to the cache
-            self.cache_data[key] = item
+            self._store(key, item, ttl)
             self.freq[key] = 1
-            self.usage[key] = self.time
-            self.time += 1
+            self.buckets.setdefault(1, OrderedDict())[key] = None
+            self.min_freq = 1
+        self._tick()
 
     def get(self, key):
         """
@@ -80,9 +81,86 @@ class LFUCache(BaseCaching):
             any: the item value linked to the key,
             or None if the key doesn't exist.
         """
+        self._expire(key)
         if key is None or key not in self.cache_data:
             return None
-        self.freq[key] += 1
-        self.usage[key] = self.time
-        self.time += 1
+        self._touch(key)
+        self._tick()
         return self.cache_data[key]
+
+    def _evict(self, key):
+        """
+        Pops the least recently used key other than `key` among the
+        least frequently used ones.
+        """
+        if self.min_freq not in self.buckets:
+            # Several keys were evicted in a row (weight limit)
+            self.min_freq = min(self.buckets)
+        freq = self.min_freq
+        bucket = self.buckets[freq]
+        lfu_key = next(iter(bucket))
+        if lfu_key == key:
+            if len(bucket) == 1:
+                # `key` is alone at the lowest frequency
+                freq = min(f for f in self.buckets if f > freq)
+                bucket = self.buckets[freq]
+            lfu_key = next(k for k in bucket if k != key)
+        del bucket[lfu_key]
+        if not bucket:
+            del self.buckets[freq]
+        del self.freq[lfu_key]
+        return lfu_key
+
+    def _unlink(self, key):
+        """
+        Removes an expired key from its frequency bucket.
+        """
+        freq = self.freq.pop(key)
+        bucket = self.buckets[freq]
+        del bucket[key]
+        if not bucket:
+            # min_freq is fixed up by the next eviction or insertion
+            del self.buckets[freq]
+
+    def _touch(self, key):
+        """
+        Moves a key to the most recently used end of the next
+        frequency bucket.
+        """
+        freq = self.freq[key]
+        bucket = self.buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[freq]
+            if self.min_freq == freq:
+                self.min_freq = freq + 1
+        self.freq[key] = freq + 1
+        self.buckets.setdefault(freq + 1, OrderedDict())[key] = None
+
+    def _tick(self):
+        """
+        Counts an operation and ages the frequencies when due.
+        """
+        if not self.AGING_PERIOD:
+            return
+        self.operations += 1
+        if self.operations >= self.AGING_PERIOD:
+            self.operations = 0
+            self.age()
+
+    def age(self):
+        """
+        Halves the frequency of every key (keeping at least 1).
+
+        Keys merged into the same bucket keep their recency order within
+        their old bucket; keys from a lower frequency come first.
+        """
+        buckets = {}
+        for freq in sorted(self.buckets):
+            aged = max(freq // 2, 1)
+            bucket = buckets.setdefault(aged, OrderedDict())
+            for key in self.buckets[freq]:
+                bucket[key] = None
+                self.freq[key] = aged
+        self.buckets = buckets
+        self.min_freq = min(buckets) if buckets else 0
@@ -0,0 +1,137 @@
+#!/usr/bin/python3
+
+"""
+A caching system that implements the Adaptive Replacement Cache (ARC)
+algorithm.
+"""
+
+from collections import OrderedDict
+
+from base_caching import BaseCaching
+
+
+class ARCCache(BaseCaching):
+    """
+    A caching system that implements the Adaptive Replacement Cache (ARC)
+    algorithm.
+
+    Items seen once live in `recent` (T1), items seen again in `frequent`
+    (T2), both in LRU order. The keys last discarded from each list are
+    remembered in the ghost lists `recent_ghosts` (B1) and
+    `frequent_ghosts` (B2): putting a ghost key again shifts the target
+    size of `recent` (p) towards the list that lost it. A scan of new keys
+    only goes through `recent`, so it cannot flush `frequent`.
+
+    Every operation is O(1); each ghost list holds at most max_items keys.
+    """
+
+    def __init__(self, max_items=None, max_weight=None, sizer=None,
+                 default_ttl=None, clock=None):
+        """
+        Initializes an empty cache with an ARC eviction strategy.
+        """
+        super().__init__(max_items, max_weight, sizer,
+                         default_ttl, clock)
+        if self.max_items is None:
+            raise ValueError("max_items must be set")
+        self.recent = OrderedDict()  # T1: seen once, LRU first
+        self.frequent = OrderedDict()  # T2: seen twice or more, LRU first
+        self.recent_ghosts = OrderedDict()  # B1: discarded from T1
+        self.frequent_ghosts = OrderedDict()  # B2: discarded from T2
+        self.target = 0  # p: target size of T1
+
+    def put(self, key, item, ttl=None):
+        """
+        Adds a key-value pair to the cache, following ARC eviction.
+
+        Args:
+            key (str): The key to associate with the item.
+            item (object): The data to store in the cache.
+            ttl (float): Seconds before the item expires. Defaults to the
+            cache's default_ttl.
+        """
+        if key is None or item is None:
+            return
+
+        self._expire(key)
+        capacity = self.max_items
+        if key in self.cache_data:
+            self._make_room(key, item)
+            self.recent.pop(key, None)
+            self.frequent[key] = None
+            self.frequent.move_to_end(key)
+        elif key in self.recent_ghosts:
+            # T1 was too small: grow its target
+            self.target = min(capacity, self.target + max(
+                len(self.frequent_ghosts) // len(self.recent_ghosts), 1))
+            self._make_room(key, item)
+            self.recent_ghosts.pop(key, None)
+            self.frequent[key] = None
+        elif key in self.frequent_ghosts:
+            # T2 was too small: shrink the target of T1
+            self.target = max(0, self.target - max(
+                len(self.recent_ghosts) // len(self.frequent_ghosts), 1))
+            self._make_room(key, item)
+            self.frequent_ghosts.pop(key, None)
+            self.frequent[key] = None
+        else:
+            # Keep the ghost lists within bounds
+            if len(self.recent) + len(self.recent_ghosts) >= capacity:
+                if self.recent_ghosts:
+                    self.recent_ghosts.popitem(last=False)
+            elif (len(self.cache_data) + len(self.recent_ghosts)
+                    + len(self.frequent_ghosts) >= 2 * capacity):
+                if self.frequent_ghosts:
+                    self.frequent_ghosts.popitem(last=False)
+            self._make_room(key, item)
+            self.recent[key] = None
+
+        self._store(key, item, ttl)
+
+    def get(self, key):
+        """
+        Gets an item from the cache.
+
+        Args:
+            key (str): The key of the item to retrieve.
+
+        Returns:
+            object: The value associated with the key, or None if not found.
+        """
+        self._expire(key)
+        if key is None or key not in self.cache_data:
+            return None
+        # A second access promotes the key to T2
+        self.recent.pop(key, None)
+        self.frequent[key] = None
+        self.frequent.move_to_end(key)
+        return self.cache_data[key]
+
+    def _evict(self, key):
+        """
+        Moves the LRU key of T1 or T2 (other than `key`) to its ghost
+        list, depending on the target size of T1.
+        """
+        recent = self._oldest(self.recent, key)
+        frequent = self._oldest(self.frequent, key)
+        if recent is not None and (
+                frequent is None or len(self.recent) > self.target
+                or (key in self.frequent_ghosts
+                    and len(self.recent) == self.target)):
+            discarded_key, keys, ghosts = recent, self.recent, \
+                self.recent_ghosts
+        else:
+            discarded_key, keys, ghosts = frequent, self.frequent, \
+                self.frequent_ghosts
+        del keys[discarded_key]
+        ghosts[discarded_key] = None
+        if len(ghosts) > self.max_items:
+            ghosts.popitem(last=False)
+        return discarded_key
+
+    def _unlink(self, key):
+        """
+        Removes an expired key from T1 or T2.
+        """
+        self.recent.pop(key, None)
+        self.frequent.pop(key, None)
@@ -0,0 +1,108 @@
+#!/usr/bin/python3
+
+"""A caching system that implements the 2Q algorithm."""
+
+from collections import OrderedDict
+
+from base_caching import BaseCaching
+
+
+class TwoQueueCache(BaseCaching):
+    """
+    A caching system that implements the (full) 2Q algorithm.
+
+    New keys enter `incoming` (A1in), a FIFO queue. Keys pushed out of it
+    are remembered in `outgoing` (A1out), a FIFO queue of keys only; a key
+    put again while it is remembered there has proven itself and goes to
+    `main` (Am), an LRU list. A scan of new keys only cycles through
+    `incoming`, so it cannot flush `main`.
+
+    Every operation is O(1); `outgoing` holds at most half of max_items
+    keys.
+    """
+    IN_RATIO = 0.25  # share of max_items that `incoming` aims for
+    OUT_RATIO = 0.5  # number of keys remembered, as a share of max_items
+
+    def __init__(self, max_items=None, max_weight=None, sizer=None,
+                 default_ttl=None, clock=None):
+        """
+        Initializes an empty cache with a 2Q eviction strategy.
+        """
+        super().__init__(max_items, max_weight, sizer,
+                         default_ttl, clock)
+        if self.max_items is None:
+            raise ValueError("max_items must be set")
+        self.incoming = OrderedDict()  # A1in: first seen, oldest first
+        self.outgoing = OrderedDict()  # A1out: keys out of A1in
+        self.main = OrderedDict()  # Am: seen again, least recent first
+        self.max_incoming = max(1, int(self.max_items * self.IN_RATIO))
+        self.max_outgoing = max(1, int(self.max_items * self.OUT_RATIO))
+
+    def put(self, key, item, ttl=None):
+        """
+        Adds a key-value pair to the cache, following 2Q eviction.
+
+        Args:
+            key (str): The key to associate with the item.
+            item (object): The data to store in the cache.
+            ttl (float): Seconds before the item expires. Defaults to the
+            cache's default_ttl.
+        """
+        if key is None or item is None:
+            return
+
+        self._expire(key)
+        remembered = key in self.outgoing
+        self._make_room(key, item)
+        if key in self.main:
+            self.main.move_to_end(key)
+        elif key in self.incoming:
+            pass  # A1in is a FIFO queue: hits do not reorder it
+        elif remembered:
+            self.outgoing.pop(key, None)
+            self.main[key] = None
+        else:
+            self.incoming[key] = None
+
+        self._store(key, item, ttl)
+
+    def get(self, key):
+        """
+        Gets an item from the cache.
+
+        Args:
+            key (str): The key of the item to retrieve.
+
+        Returns:
+            object: The value associated with the key, or None if not found.
+        """
+        self._expire(key)
+        if key is None or key not in self.cache_data:
+            return None
+        if key in self.main:
+            self.main.move_to_end(key)
+        return self.cache_data[key]
+
+    def _evict(self, key):
+        """
+        Pops the oldest key of A1in (other than `key`) into A1out if A1in
+        is over its share, or else the least recently used key of Am.
+        """
+        incoming = self._oldest(self.incoming, key)
+        main = self._oldest(self.main, key)
+        if incoming is not None and (len(self.incoming) > self.max_incoming
+                                     or main is None):
+            del self.incoming[incoming]
+            self.outgoing[incoming] = None
+            if len(self.outgoing) > self.max_outgoing:
+                self.outgoing.popitem(last=False)
+            return incoming
+        del self.main[main]
+        return main
+
+    def _unlink(self, key):
+        """
+        Removes an expired key from A1in or Am.
+        """
+        self.incoming.pop(key, None)
+        self.main.pop(key, None)
@@ -0,0 +1,137 @@
+#!/usr/bin/python3
+
+"""A caching system that implements the W-TinyLFU algorithm."""
+
+from collections import OrderedDict
+
+from base_caching import BaseCaching
+from count_min_sketch import CountMinSketch
+
+
+class TinyLFUCache(BaseCaching):
+    """
+    A caching system that implements the Window TinyLFU (W-TinyLFU)
+    algorithm.
+
+    New keys enter `window`, a small LRU list. The key leaving the window
+    only enters the main cache if it was used more often than the key the
+    main cache would discard for it; access counts come from a Count-Min
+    sketch that also remembers keys which are no longer cached. The main
+    cache is a segmented LRU: keys start in `probation` and move to
+    `protected` when used again. A scan of new keys is stopped at the
+    window, since scanned keys are rarely used more than the main ones.
+
+    Every operation is O(1) (amortized for the sketch halving), and the
+    sketch has a fixed size.
+    """
+    WINDOW_RATIO = 0.01  # share of max_items for the window
+    PROTECTED_RATIO = 0.8  # share of the main cache for protected keys
+
+    def __init__(self, max_items=None, max_weight=None, sizer=None,
+                 default_ttl=None, clock=None):
+        """
+        Initializes an empty cache with a W-TinyLFU eviction strategy.
+        """
+        super().__init__(max_items, max_weight, sizer,
+                         default_ttl, clock)
+        if self.max_items is None:
+            raise ValueError("max_items must be set")
+        self.window = OrderedDict()  # least recently used first
+        self.probation = OrderedDict()
+        self.protected = OrderedDict()
+        self.max_window = max(1, int(self.max_items * self.WINDOW_RATIO))
+        self.max_protected = max(1, int(
+            (self.max_items - self.max_window) * self.PROTECTED_RATIO))
+        self.sketch = CountMinSketch(max(self.max_items, 16))
+
+    def put(self, key, item, ttl=None):
+        """
+        Adds a key-value pair to the cache, following W-TinyLFU eviction.
+
+        Args:
+            key (str): The key to associate with the item.
+            item (object): The data to store in the cache.
+            ttl (float): Seconds before the item expires. Defaults to the
+            cache's default_ttl.
+        """
+        if key is None or item is None:
+            return
+
+        self._expire(key)
+        self.sketch.add(key)
+        self._make_room(key, item)
+        if key in self.cache_data:
+            self._touch(key)
+        else:
+            self.window[key] = None
+            # Overflowing keys wait in probation while there is room
+            while len(self.window) > self.max_window:
+                moved, _ = self.window.popitem(last=False)
+                self.probation[moved] = None
+
+        self._store(key, item, ttl)
+
+    def get(self, key):
+        """
+        Gets an item from the cache.
+
+        Args:
+            key (str): The key of the item to retrieve.
+
+        Returns:
+            object: The value associated with the key, or None if not found.
+        """
+        self._expire(key)
+        if key is None:
+            return None
+        self.sketch.add(key)
+        if key not in self.cache_data:
+            return None
+        self._touch(key)
+        return self.cache_data[key]
+
+    def _touch(self, key):
+        """
+        Records a hit: moves the key to the most recently used end of its
+        segment, promoting it from probation to protected.
+        """
+        if key in self.window:
+            self.window.move_to_end(key)
+        elif key in self.protected:
+            self.protected.move_to_end(key)
+        else:
+            del self.probation[key]
+            self.protected[key] = None
+            if len(self.protected) > self.max_protected:
+                demoted, _ = self.protected.popitem(last=False)
+                self.probation[demoted] = None
+
+    def _evict(self, key):
+        """
+        Lets the oldest window key (the candidate) and the key the main
+        cache would discard (the victim) compete: the one used less often
+        is discarded, and a winning candidate joins probation.
+        """
+        candidate = self._oldest(self.window, key)
+        victim = self._oldest(self.probation, key)
+        if victim is None:
+            victim = self._oldest(self.protected, key)
+        if candidate is None or (
+                victim is not None and self.sketch.estimate(candidate)
+                > self.sketch.estimate(victim)):
+            if candidate is not None:
+                del self.window[candidate]
+                self.probation[candidate] = None
+            self.probation.pop(victim, None)
+            self.protected.pop(victim, None)
+            return victim
+        del self.window[candidate]
+        return candidate
+
+    def _unlink(self, key):
+        """
+        Removes an expired key from its segment.
+        """
+        self.window.pop(key, None)
+        self.probation.pop(key, None)
+        self.protected.pop(key, None)
@@ -2,6 +2,8 @@
 
 """A caching system that implements the Last-In-First-Out (LIFO) algorithm."""
 
+from collections import OrderedDict
+
 from base_caching import BaseCaching
 
 
@@ -11,28 +13,34 @@ class LIFOCache(BaseCaching):
     A caching system that implements the Last-In-First-Out (LIFO) algorithm.
     """
 
-    def __init__(self):
+    def __init__(self, max_items=None, max_weight=None, sizer=None,
+                 default_ttl=None, clock=None):
         """Initializes an empty cache with a LIFO eviction strategy."""
-        super().__init__()
-        self.cache_order = []
+        super().__init__(max_items, max_weight, sizer,
+                         default_ttl, clock)
+        # Keys from oldest to newest put, with O(1) removal
+        self.cache_order = OrderedDict()
 
-    def put(self, key, item):
+    def put(self, key, item, ttl=None):
         """
         Adds a key-value pair to the cache, following LIFO eviction.
 
         Args:
             key (str): The key to associate with the item.
             item (object): The data to store in the cache.
+            ttl (float): Seconds before the item expires. Defaults to the
+            cache's default_ttl.
         """
 
-        if len(self.cache_data) >= BaseCaching.MAX_ITEMS:
-            discarded_key = self.cache_order.pop()
-            del self.cache_data[discarded_key]
-            print(f"DISCARD: {discarded_key}")
+        # Every put makes room as if it added a new key
+        self._expire(key)
+        self._make_room(item=item)
 
         if key is not None and item is not None:
-            self.cache_data[key] = item
-            self.cache_order.append(key)
+            self._store(key, item, ttl)
+            # A replaced key becomes the newest one
+            self.cache_order[key] = None
+            self.cache_order.move_to_end(key)
 
     def get(self, key):
         """
@@ -44,4 +52,17 @@ class LIFOCache(BaseCaching):
         Returns:
             object: The value associated with the key, or None if not found.
         """
+        self._expire(key)
         return self.cache_data.get(key, None)
+
+    def _evict(self, key):
+        """
+        Pops the newest key of the put order.
+        """
+        return self.cache_order.popitem()[0]
+
+    def _unlink(self, key):
+        """
+        Removes an expired key from the order.
+        """
+        del self.cache_order[key]
@@ -2,6 +2,8 @@
 
 """A caching system that implements the Most Recently Used (MRU) algorithm."""
 
+from collections import OrderedDict
+
 from base_caching import BaseCaching
 
 
@@ -10,38 +12,39 @@ class MRUCache(BaseCaching):
     A caching system that implements the Most Recently Used (MRU) algorithm.
     """
 
-    def __init__(self):
+    def __init__(self, max_items=None, max_weight=None, sizer=None,
+                 default_ttl=None, clock=None):
         """
         Initializes an empty cache with an MRU eviction strategy.
         """
-        super().__init__()
-        self.cache_order = []  # Track insertion order for MRU eviction
+        super().__init__(max_items, max_weight, sizer,
+                         default_ttl, clock)
+        # Keys from least to most recently used, with O(1) moves
+        self.cache_order = OrderedDict()
 
-    def put(self, key, item):
+    def put(self, key, item, ttl=None):
         """
         Adds a key-value pair to the cache, following MRU eviction.
 
         Args:
             key (str): The key to associate with the item.
             item (object): The data to store in the cache.
+            ttl (float): Seconds before the item expires. Defaults to the
+            cache's default_ttl.
         """
 
         if key is None or item is None:
             return
 
+        self._expire(key)
+        self._make_room(key, item)
         if key in self.cache_data:
-            # Move accessed key to the end of the order list (MRU)
-            self.cache_order.remove(key)
-            self.cache_order.append(key)
+            # Move accessed key to the end of the order (MRU)
+            self.cache_order.move_to_end(key)
         else:
-            if len(self.cache_data) >= BaseCaching.MAX_ITEMS:
-                # MRU eviction: remove most recently used entry (last element)
-                discarded_key = self.cache_order.pop()
-                del self.cache_data[discarded_key]
-                print(f"DISCARD: {discarded_key}")
-            self.cache_order.append(key)  # Update insertion order
+            self.cache_order[key] = None  # Update access order
 
-        self.cache_data[key] = item
+        self._store(key, item, ttl)
 
     def get(self, key):
         """
@@ -53,9 +56,24 @@ class MRUCache(BaseCaching):
         Returns:
             object: The value associated with the key, or None if not found.
         """
+        self._expire(key)
         if key is None or key not in self.cache_data:
             return None
-        # Move accessed key to the end of the order list (MRU)
-        self.cache_order.remove(key)
-        self.cache_order.append(key)
+        # Move accessed key to the end of the order (MRU)
+        self.cache_order.move_to_end(key)
         return self.cache_data[key]
+
+    def _evict(self, key):
+        """
+        Pops the most recently used key other than `key`.
+        """
+        for discarded_key in reversed(self.cache_order):
+            if discarded_key != key:
+                del self.cache_order[discarded_key]
+                return discarded_key
+
+    def _unlink(self, key):
+        """
+        Removes an expired key from the access order.
+        """
+        del self.cache_order[key]
@@ -0,0 +1,175 @@
+#!/usr/bin/python3
+
+"""A thread-safe cache that spreads keys over independently locked shards."""
+
+from cache_stats import merge
+
+LRUCache = __import__('3-lru_cache').LRUCache
+
+
+class ShardedCache():
+    """
+    A thread-safe cache made of several caches of one policy (shards).
+
+    Each key belongs to the shard picked by its hash, and each shard has
+    its own lock, so threads working on different shards do not wait for
+    each other. The capacity is split evenly between the shards (there
+    are never more shards than items or weight units allowed) and each
+    shard evicts on its own: the policy is applied per shard, not across
+    the whole cache. With a single shard, this is the policy behind one
+    global lock. A shard's lock is the one its `get_or_load` uses.
+
+    max_weight is a soft bound: a shard keeps an item heavier than its
+    share by itself (see `BaseCaching.is_full`), so the total weight can
+    go over max_weight by up to one such item per shard.
+
+    It offers the interface of the `BaseCaching` classes, but is not one:
+    the state lives in the shards, and `stats` adds theirs up.
+    """
+
+    def __init__(self, policy=LRUCache, shards=8, max_items=None,
+                 max_weight=None, sizer=None, default_ttl=None, clock=None):
+        """
+        Initializes empty shards.
+
+        Args:
+            policy (type): The `BaseCaching` subclass run by every shard.
+            shards (int): The number of shards, lowered to max_items or
+            max_weight if either is smaller.
+            max_items (int): The maximum number of items of the whole
+            cache. Defaults to the policy's MAX_ITEMS, unless max_weight
+            is given.
+            max_weight (int): The maximum total weight of the whole cache,
+            split between the shards (a soft bound, see above).
+            sizer, default_ttl, clock: Passed to every shard.
+        """
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+        if max_items is None and max_weight is None:
+            max_items = policy.MAX_ITEMS
+        self.max_items = max_items
+        self.max_weight = max_weight
+        self.policy = policy
+        for bound in (max_items, max_weight):
+            if bound is not None:
+                shards = min(shards, max(bound, 1))
+        self.shards = [
+            policy(items, weight, sizer, default_ttl, clock)
+            for items, weight in zip(_split(max_items, shards),
+                                     _split(max_weight, shards))]
+        self.locks = [shard.lock for shard in self.shards]
+
+    @property
+    def cache_data(self):
+        """
+        A snapshot of the items of every shard.
+        """
+        data = {}
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                data.update(shard.cache_data)
+        return data
+
+    @property
+    def weight(self):
+        """
+        The total weight of the items of every shard (0 unless max_weight
+        is set).
+        """
+        weight = 0
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                weight += shard.weight
+        return weight
+
+    def print_cache(self):
+        """
+        Prints the items of every shard, sorted by key.
+        """
+        data = self.cache_data
+        print("Current cache:")
+        for key in sorted(data.keys()):
+            print("{}: {}".format(key, data.get(key)))
+
+    def put(self, key, item, ttl=None):
+        """
+        Adds a key-value pair to the shard of the key.
+
+        Args:
+            key (str): The key to associate with the item.
+            item (object): The data to store in the cache.
+            ttl (float): Seconds before the item expires. Defaults to the
+            cache's default_ttl.
+        """
+        if key is None or item is None:
+            return
+        index = self._shard(key)
+        with self.locks[index]:
+            self.shards[index].put(key, item, ttl)
+
+    def get(self, key):
+        """
+        Gets an item from the shard of the key.
+
+        Args:
+            key (str): The key of the item to retrieve.
+
+        Returns:
+            object: The value associated with the key, or None if not found.
+        """
+        if key is None:
+            return None
+        index = self._shard(key)
+        with self.locks[index]:
+            return self.shards[index].get(key)
+
+    def get_or_load(self, key, loader, ttl=None, refresh_after=None):
+        """
+        Gets an item, loading it if it is missing (see
+        `BaseCaching.get_or_load`). Loads are shared per shard.
+        """
+        return self.shards[self._shard(key)].get_or_load(
+            key, loader, ttl, refresh_after)
+
+    async def aget_or_load(self, key, loader, ttl=None, refresh_after=None):
+        """
+        Same as `get_or_load`, with `loader(key)` a coroutine function.
+        """
+        return await self.shards[self._shard(key)].aget_or_load(
+            key, loader, ttl, refresh_after)
+
+    def stats(self):
+        """
+        Returns the stats of the shards added up (see `BaseCaching.stats`).
+        """
+        snapshots = []
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                snapshots.append(shard.stats())
+        return merge(snapshots)
+
+    def sample_latency(self, every=64, bounds=None):
+        """
+        Samples the latency of the calls of every shard (see
+        `BaseCaching.sample_latency`).
+        """
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                shard.sample_latency(every, bounds)
+
+    def _shard(self, key):
+        """
+        Returns the index of the shard holding `key`.
+        """
+        return hash(key) % len(self.shards)
+
+
+def _split(bound, shards):
+    """
+    Returns the share of each shard of a capacity bound: the shares add
+    up to the bound, the first ones taking one more unit if needed.
+    """
+    if bound is None:
+        return [None] * shards
+    share, extra = divmod(bound, shards)
+    return [share + (i < extra) for i in range(shards)]
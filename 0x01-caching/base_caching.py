@@ -1,18 +1,91 @@
 #!/usr/bin/python3
 """ BaseCaching module
 """
+import asyncio
+import functools
+import sys
+import threading
+import time
+from concurrent.futures import Future
+
+from cache_stats import LatencyHistogram
+from timer_wheel import TimerWheel
+
 
 class BaseCaching():
     """ BaseCaching defines:
       - constants of your caching system
       - where your data are stored (in a dictionary)
+      - the capacity of a cache: a number of items and/or a total weight
+      - how long items live (TTL), if they expire
+      - how missing items are loaded (`get_or_load`)
+      - what a cache did so far (`stats`)
+
+    The `get` and `put` of every subclass are wrapped to count hits,
+    misses and puts, once per call made from outside the cache: calls of
+    `super().get()` or `super().put()` by an override are not counted
+    again.
     """
     MAX_ITEMS = 4
+    TIMER_TICK = 1.0  # resolution of the proactive expiry, in seconds
+
+    def __init_subclass__(cls, **kwargs):
+        """ Wraps the `get` and `put` defined by a subclass with the
+        counters of `stats`
+        """
+        super().__init_subclass__(**kwargs)
+        if "get" in cls.__dict__:
+            cls.get = _counted_get(cls.__dict__["get"])
+        if "put" in cls.__dict__:
+            cls.put = _counted_put(cls.__dict__["put"])
 
-    def __init__(self):
+    def __init__(self, max_items=None, max_weight=None, sizer=None,
+                 default_ttl=None, clock=None):
         """ Initiliaze
+
+        Args:
+            max_items (int): The maximum number of items. Defaults to
+            MAX_ITEMS, unless max_weight is given: the weight alone then
+            bounds the cache.
+            max_weight (int): The maximum total weight of the items, or
+            None for no limit.
+            sizer (callable): Returns the weight of an item. Defaults to
+            its estimated size in bytes (`sys.getsizeof`).
+            default_ttl (float): How long items live, in seconds, unless
+            `put` is given a ttl. None means forever.
+            clock (callable): Returns the current time in seconds.
+            Defaults to `time.monotonic`.
         """
+        if max_items is None and max_weight is None:
+            max_items = self.MAX_ITEMS
+        if max_items is not None and max_items < 1:
+            raise ValueError("max_items must be at least 1")
+        if max_weight is not None and max_weight < 0:
+            raise ValueError("max_weight must not be negative")
         self.cache_data = {}
+        self.max_items = max_items
+        self.max_weight = max_weight
+        self.sizer = sizer or sys.getsizeof
+        self.weights = {}  # weight of each item, when max_weight is set
+        self.weight = 0
+        self.default_ttl = default_ttl
+        self.clock = clock or time.monotonic
+        self.deadlines = {}  # expiry time of each item that expires
+        self.timers = TimerWheel(self.clock(), self.TIMER_TICK)
+        # Guards the cache in get_or_load; put and get do not take it.
+        self.lock = threading.Lock()
+        self.flights = {}  # key -> Future of the load in progress
+        self.loaded_at = {}  # time each loaded item was loaded
+        self.refreshes = set()  # background refresh tasks (asyncio)
+        self.hits = 0
+        self.misses = 0
+        self.puts = 0
+        self.evictions = {"capacity": 0, "expired": 0}
+        self.latencies = None  # op -> LatencyHistogram, when sampled
+        self.sample_every = None
+        # calls of get and of put left before their next sampled one
+        self.until_get = self.until_put = 0
+        self.depth = 0  # counted get and put calls in progress
 
     def print_cache(self):
         """ Print the cache
@@ -21,8 +94,8 @@ class BaseCaching():
         for key in sorted(self.cache_data.keys()):
             print("{}: {}".format(key, self.cache_data.get(key)))
 
-    def put(self, key, item):
-        """ Add an item in the cache
+    def put(self, key, item, ttl=None):
+        """ Add an item in the cache, for `ttl` seconds if given
         """
         raise NotImplementedError("put must be implemented in your cache class")
 
@@ -30,3 +103,356 @@ class BaseCaching():
         """ Get an item by key
         """
         raise NotImplementedError("get must be implemented in your cache class")
+
+    def stats(self):
+        """ Returns a snapshot of what the cache did so far: lookups
+        (`hits`, `misses`, `hit_ratio`), `puts`, `evictions` by reason
+        (capacity or expired), the current `size` and `weight` (None
+        unless max_weight is set), and the `latency` histograms of `get`
+        and `put` if they are sampled
+        """
+        lookups = self.hits + self.misses
+        stats = {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "puts": self.puts,
+            "evictions": dict(self.evictions),
+            "size": len(self.cache_data),
+            "weight": self.weight if self.max_weight is not None else None,
+        }
+        if self.latencies is not None:
+            stats["latency"] = {op: histogram.snapshot()
+                                for op, histogram in self.latencies.items()}
+        return stats
+
+    def sample_latency(self, every=64, bounds=None):
+        """ Times one `get` call out of `every`, and one `put` call out of
+        `every`, into latency histograms, starting anew; None stops timing
+
+        Args:
+            every (int): The number of calls of an operation per sampled
+            call.
+            bounds (tuple): The upper bounds of the histogram buckets, in
+            seconds. Defaults to `LatencyHistogram.BOUNDS`.
+        """
+        if every is None:
+            self.latencies = self.sample_every = None
+            return
+        if every < 1:
+            raise ValueError("every must be at least 1")
+        self.sample_every = self.until_get = self.until_put = every
+        self.latencies = {"get": LatencyHistogram(bounds),
+                          "put": LatencyHistogram(bounds)}
+
+    def is_full(self, key=None, item=None):
+        """ Tells whether an item must be discarded before `item` can be
+        stored under `key`
+
+        Replacing a cached key frees its own slot and weight first. The
+        item being stored is never discarded: once every other item is
+        gone, an item heavier than max_weight is kept by itself.
+        """
+        others = len(self.cache_data) - (key in self.cache_data)
+        if others == 0:
+            return False
+        if self.max_items is not None and others >= self.max_items:
+            return True
+        if self.max_weight is not None:
+            weight = self.weight - self.weights.get(key, 0)
+            if item is not None:
+                weight += self.sizer(item)
+            return weight > self.max_weight
+        return False
+
+    def get_or_load(self, key, loader, ttl=None, refresh_after=None):
+        """ Gets an item, calling `loader(key)` to load and put it if it is
+        missing
+
+        Concurrent callers missing the same key share a single load: one
+        of them runs the loader while the others wait for its result.
+        Errors raised by the loader reach every caller of that load and
+        are not cached; a None result is returned but not cached.
+
+        Waiting for a load run by `aget_or_load` on the event loop of the
+        calling thread would block that loop for good: it raises
+        RuntimeError instead.
+
+        Args:
+            key (str): The key of the item.
+            loader (callable): Returns the item of a key.
+            ttl (float): Seconds before a loaded item expires.
+            refresh_after (float): Once a loaded item is that many seconds
+            old, it is still returned but loaded again in a background
+            thread.
+        """
+        item, flight, leader = self._claim(key, refresh_after)
+        if item is not None:
+            if leader:
+                threading.Thread(target=self._refresh,
+                                 args=(key, loader, ttl, flight),
+                                 daemon=True).start()
+            return item
+        if not leader:
+            if flight.loop is not None and flight.loop is _running_loop():
+                raise RuntimeError("the load of {!r} runs on the event loop "
+                                   "of this thread: use aget_or_load"
+                                   .format(key))
+            return flight.result()
+        try:
+            item = loader(key)
+        except BaseException as error:
+            self._land(key, flight, error=error)
+            raise
+        self._land(key, flight, item, ttl)
+        return item
+
+    async def aget_or_load(self, key, loader, ttl=None, refresh_after=None):
+        """ Same as `get_or_load`, with `loader(key)` a coroutine function
+
+        Loads are shared with the other callers, sync or async. A load
+        refreshing a stale item runs as a task of the running event loop.
+        """
+        item, flight, leader = self._claim(key, refresh_after,
+                                           asyncio.get_running_loop())
+        if item is not None:
+            if leader:
+                task = asyncio.ensure_future(
+                    self._arefresh(key, loader, ttl, flight))
+                self.refreshes.add(task)
+                task.add_done_callback(self.refreshes.discard)
+            return item
+        if not leader:
+            return await asyncio.wrap_future(flight)
+        try:
+            item = await loader(key)
+        except BaseException as error:
+            self._land(key, flight, error=error)
+            raise
+        self._land(key, flight, item, ttl)
+        return item
+
+    def is_expired(self, key):
+        """ Tells whether the item of `key` outlived its TTL
+        """
+        deadline = self.deadlines.get(key)
+        return deadline is not None and deadline <= self.clock()
+
+    def _expire(self, key=None):
+        """ Drops the items whose TTL ran out: those found by the timer
+        wheel, and the item of `key` if it expired since the last tick
+        """
+        if not self.deadlines:
+            return
+        for expired_key in self.timers.advance(self.clock()):
+            self._remove(expired_key)
+        if key in self.deadlines and self.is_expired(key):
+            self._remove(key)
+
+    def _claim(self, key, refresh_after, loop=None):
+        """ Looks up an item and the load of its key
+
+        Args:
+            loop (asyncio.AbstractEventLoop): The event loop that runs the
+            load if the caller has to, None for a thread.
+
+        Returns:
+            tuple: The cached item (or None), the Future of the load to
+            run or wait for (or None), and whether the caller must run
+            that load: in the background if the item was found.
+        """
+        with self.lock:
+            item = self.get(key)
+            flight = self.flights.get(key)
+            if flight is not None:
+                return item, flight, False
+            if item is not None and not self._is_stale(key, refresh_after):
+                return item, None, False
+            flight = self.flights[key] = Future()
+            flight.loop = loop
+            return item, flight, True
+
+    def _is_stale(self, key, refresh_after):
+        """ Tells whether a loaded item is due for a background refresh
+        """
+        loaded_at = self.loaded_at.get(key)
+        return (refresh_after is not None and loaded_at is not None
+                and self.clock() - loaded_at >= refresh_after)
+
+    def _refresh(self, key, loader, ttl, flight):
+        """ Loads an item again in the background, keeping the old one if
+        the loader fails
+        """
+        try:
+            item = loader(key)
+        except Exception as error:
+            self._land(key, flight, error=error)
+        else:
+            self._land(key, flight, item, ttl)
+
+    async def _arefresh(self, key, loader, ttl, flight):
+        """ Loads an item again in the background, keeping the old one if
+        the loader fails
+        """
+        try:
+            item = await loader(key)
+        except Exception as error:
+            self._land(key, flight, error=error)
+        else:
+            self._land(key, flight, item, ttl)
+
+    def _land(self, key, flight, item=None, ttl=None, error=None):
+        """ Ends a load: caches its item and hands it (or its error) to
+        the callers waiting for it
+        """
+        with self.lock:
+            if error is None and item is not None:
+                self.put(key, item, ttl)
+                if key in self.cache_data:
+                    self.loaded_at[key] = self.clock()
+            del self.flights[key]
+        if error is None:
+            flight.set_result(item)
+        else:
+            flight.set_exception(error)
+
+    def _make_room(self, key=None, item=None):
+        """ Discards the items chosen by `_evict` until `item` fits
+        """
+        while self.is_full(key, item):
+            self._discard(self._evict(key))
+
+    def _evict(self, key):
+        """ Removes the next item to discard from the policy's bookkeeping
+        and returns its key, which must not be `key`
+        """
+        raise NotImplementedError("_evict must be implemented in your cache "
+                                  "class")
+
+    def _unlink(self, key):
+        """ Removes an expired key from the policy's bookkeeping
+        """
+
+    @staticmethod
+    def _oldest(keys, key):
+        """ Returns the first key of an ordered collection other than
+        `key`, or None
+        """
+        for k in keys:
+            if k != key:
+                return k
+        return None
+
+    def _store(self, key, item, ttl=None):
+        """ Stores an item, keeping track of its weight and expiry
+        """
+        self.cache_data[key] = item
+        if self.max_weight is not None:
+            weight = self.sizer(item)
+            self.weight += weight - self.weights.get(key, 0)
+            self.weights[key] = weight
+        if ttl is None:
+            ttl = self.default_ttl
+        if ttl is not None:
+            self.deadlines[key] = self.clock() + ttl
+            self.timers.schedule(key, self.deadlines[key])
+        elif self.deadlines.pop(key, None) is not None:
+            self.timers.cancel(key)
+
+    def _discard(self, key):
+        """ Drops an evicted item and reports it
+        """
+        self._forget(key)
+        self.evictions["capacity"] += 1
+        print("DISCARD: {}".format(key))
+
+    def _remove(self, key):
+        """ Drops an expired item
+        """
+        self._forget(key)
+        self._unlink(key)
+        self.evictions["expired"] += 1
+
+    def _forget(self, key):
+        """ Drops an item with its weight and expiry
+        """
+        del self.cache_data[key]
+        if self.max_weight is not None:
+            self.weight -= self.weights.pop(key, 0)
+        if self.deadlines.pop(key, None) is not None:
+            self.timers.cancel(key)
+        self.loaded_at.pop(key, None)
+
+
+def _running_loop():
+    """ Returns the event loop running in this thread, if any
+    """
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _counted_get(get):
+    """ Wraps the `get` of a cache class to count hits and misses,
+    unless it is called by another counted method
+    """
+    @functools.wraps(get)
+    def counted(self, key):
+        if self.depth:
+            return get(self, key)
+        self.depth += 1
+        try:
+            if self.latencies is None:
+                item = get(self, key)
+            else:
+                self.until_get -= 1
+                if self.until_get:
+                    item = get(self, key)
+                else:
+                    self.until_get = self.sample_every
+                    item = _timed(self, "get", get, key)
+        finally:
+            self.depth -= 1
+        if item is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return item
+    return counted
+
+
+def _counted_put(put):
+    """ Wraps the `put` of a cache class to count puts, unless it is
+    called by another counted method
+    """
+    @functools.wraps(put)
+    def counted(self, key, item, ttl=None):
+        if self.depth:
+            return put(self, key, item, ttl)
+        self.depth += 1
+        try:
+            if self.latencies is None:
+                put(self, key, item, ttl)
+            else:
+                self.until_put -= 1
+                if self.until_put:
+                    put(self, key, item, ttl)
+                else:
+                    self.until_put = self.sample_every
+                    _timed(self, "put", put, key, item, ttl)
+        finally:
+            self.depth -= 1
+        if key is not None and item is not None:
+            self.puts += 1
+    return counted
+
+
+def _timed(cache, op, method, *args):
+    """ Calls a method of `cache`, adding its duration to the latency
+    histogram of `op`
+    """
+    start = time.perf_counter()
+    result = method(cache, *args)
+    cache.latencies[op].observe(time.perf_counter() - start)
+    return result
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Per-operation cost of the caching policies as their capacity grows.
+
+For every capacity, each cache is filled, then driven with a mix of `get`
+and `put` calls on keys drawn uniformly from twice its capacity, so about
+half of the calls miss and half of the puts evict. `DISCARD` lines are
+written to a null stream. An O(1) policy shows a flat ns/op column.
+
+Usage (from 0x01-caching):
+    python3 benchmarks/cache_bench.py
+    python3 benchmarks/cache_bench.py --capacity 1000 100000 --ops 200000
+"""
+
+import argparse
+import contextlib
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                ".."))
+
+POLICIES = {
+    "lru": ("3-lru_cache", "LRUCache"),
+    "mru": ("4-mru_cache", "MRUCache"),
+    "lfu": ("100-lfu_cache", "LFUCache"),
+    "arc": ("101-arc_cache", "ARCCache"),
+    "2q": ("102-2q_cache", "TwoQueueCache"),
+    "tinylfu": ("103-tinylfu_cache", "TinyLFUCache"),
+}
+
+
+def make_cache(policy: str, capacity: int):
+    """Returns an empty cache of `policy` holding `capacity` items."""
+    module, name = POLICIES[policy]
+    return getattr(__import__(module), name)(max_items=capacity)
+
+
+def run(policy: str, capacity: int, ops: int, seed: int = 0) -> float:
+    """Returns the mean cost of one operation, in nanoseconds."""
+    rng = random.Random(seed)
+    cache = make_cache(policy, capacity)
+    keys = [rng.randrange(2 * capacity) for _ in range(ops)]
+    puts = [rng.random() < 0.5 for _ in range(ops)]
+    with open(os.devnull, "w") as null, contextlib.redirect_stdout(null):
+        for key in range(capacity):
+            cache.put(key, key)
+        start = time.perf_counter()
+        for key, put in zip(keys, puts):
+            if put:
+                cache.put(key, key)
+            else:
+                cache.get(key)
+        elapsed = time.perf_counter() - start
+    return elapsed / ops * 1e9
+
+
+def main() -> int:
+    """Prints the ns/op table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--capacity", type=int, nargs="+",
+                        default=[10, 1000, 10000, 100000])
+    parser.add_argument("--policy", nargs="+", default=list(POLICIES),
+                        choices=list(POLICIES))
+    parser.add_argument("--ops", type=int, default=100000)
+    args = parser.parse_args()
+
+    print("{:<8} {:>10} {:>10}".format("policy", "capacity", "ns/op"))
+    for policy in args.policy:
+        for capacity in args.capacity:
+            print("{:<8} {:>10} {:>10.0f}".format(
+                policy, capacity, run(policy, capacity, args.ops)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
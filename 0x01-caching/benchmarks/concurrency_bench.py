@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Multithreaded throughput of `ShardedCache` against one global lock.
+
+Every thread runs the same mix of `get` and `put` calls on keys drawn
+from twice the capacity. The global-lock baseline is a `ShardedCache` with
+a single shard, i.e. the policy behind one lock. `DISCARD` lines are
+written to a null stream.
+
+Usage (from 0x01-caching):
+    python3 benchmarks/concurrency_bench.py
+    python3 benchmarks/concurrency_bench.py --policy lfu --shards 32
+"""
+
+import argparse
+import contextlib
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                ".."))
+
+from cache_bench import POLICIES  # noqa: E402
+
+ShardedCache = __import__('5-sharded_cache').ShardedCache
+
+
+def run(policy: str, shards: int, threads: int, capacity: int,
+        ops: int) -> float:
+    """Returns the total throughput of `threads` threads, in ops/s."""
+    module, name = POLICIES[policy]
+    cache = ShardedCache(getattr(__import__(module), name), shards,
+                         max_items=capacity)
+    barrier = threading.Barrier(threads + 1)
+
+    def work(seed):
+        rng = random.Random(seed)
+        keys = [rng.randrange(2 * capacity) for _ in range(ops)]
+        barrier.wait()
+        for i, key in enumerate(keys):
+            if i & 1:
+                cache.put(key, key)
+            else:
+                cache.get(key)
+
+    workers = [threading.Thread(target=work, args=(seed,))
+               for seed in range(threads)]
+    with open(os.devnull, "w") as null, contextlib.redirect_stdout(null):
+        for worker in workers:
+            worker.start()
+        barrier.wait()
+        start = time.perf_counter()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - start
+    return threads * ops / elapsed
+
+
+def main() -> int:
+    """Prints the throughput table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--policy", default="lru", choices=list(POLICIES))
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--shards", type=int, default=16)
+    parser.add_argument("--capacity", type=int, default=10000)
+    parser.add_argument("--ops", type=int, default=50000,
+                        help="operations per thread")
+    args = parser.parse_args()
+
+    print("{:<8} {:>8} {:>14} {:>14} {:>8}".format(
+        "policy", "threads", "global ops/s", "sharded ops/s", "speedup"))
+    for threads in args.threads:
+        single = run(args.policy, 1, threads, args.capacity, args.ops)
+        sharded = run(args.policy, args.shards, threads, args.capacity,
+                      args.ops)
+        print("{:<8} {:>8} {:>14.0f} {:>14.0f} {:>7.2f}x".format(
+            args.policy, threads, single, sharded, sharded / single))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
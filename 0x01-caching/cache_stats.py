@@ -0,0 +1,192 @@
+#!/usr/bin/python3
+""" cache_stats module
+
+Latency histograms of the caches, and the export of their stats from a
+process: caches given a name with `register` are reported together by
+`snapshot` (a dict) and `prometheus` (Prometheus text format).
+"""
+import bisect
+import weakref
+
+_registry = weakref.WeakValueDictionary()  # name -> cache
+
+
+class LatencyHistogram():
+    """ Counts durations in buckets with fixed upper bounds, in seconds
+    """
+    BOUNDS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5,
+              1e-4, 2.5e-4, 5e-4, 1e-3, 1e-2, 1e-1)
+
+    def __init__(self, bounds=None):
+        """ Initiliaze
+
+        Args:
+            bounds (tuple): The increasing upper bounds of the buckets.
+            Defaults to BOUNDS; a last bucket holds the longer durations.
+        """
+        self.bounds = tuple(bounds or self.BOUNDS)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        """ Counts one duration
+        """
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def snapshot(self):
+        """ Returns the histogram as a dict: `buckets` lists the pairs
+        (upper bound, number of durations up to that bound), ending with
+        an infinite bound
+        """
+        buckets = []
+        count = 0
+        for bound, bucket in zip(self.bounds + (float("inf"),), self.counts):
+            count += bucket
+            buckets.append((bound, count))
+        return {"buckets": buckets, "sum": self.sum, "count": self.count}
+
+
+def merge(snapshots):
+    """ Adds up the `stats()` of several caches (the shards of one cache,
+    or the same cache in several processes)
+    """
+    merged = {"hits": 0, "misses": 0, "hit_ratio": 0.0, "puts": 0,
+              "evictions": {}, "size": 0, "weight": 0}
+    latencies = {}
+    for stats in snapshots:
+        for name in ("hits", "misses", "puts", "size"):
+            merged[name] += stats[name]
+        for reason, count in stats["evictions"].items():
+            merged["evictions"][reason] = (
+                merged["evictions"].get(reason, 0) + count)
+        if stats["weight"] is None or merged["weight"] is None:
+            merged["weight"] = None
+        else:
+            merged["weight"] += stats["weight"]
+        for op, histogram in stats.get("latency", {}).items():
+            latencies.setdefault(op, []).append(histogram)
+    lookups = merged["hits"] + merged["misses"]
+    if lookups:
+        merged["hit_ratio"] = merged["hits"] / lookups
+    if latencies:
+        merged["latency"] = {op: _merge_histograms(histograms)
+                             for op, histograms in latencies.items()}
+    return merged
+
+
+def register(name, cache):
+    """ Exports the stats of `cache` under `name`, until the cache is
+    garbage collected or unregistered; returns the cache
+    """
+    _registry[name] = cache
+    return cache
+
+
+def unregister(name):
+    """ Stops exporting the stats of the cache registered as `name`
+    """
+    _registry.pop(name, None)
+
+
+def snapshot():
+    """ Returns the `stats()` of every registered cache, by name
+    """
+    return {name: cache.stats()
+            for name, cache in sorted(list(_registry.items()))}
+
+
+def prometheus(prefix="cache"):
+    """ Returns the stats of every registered cache in the Prometheus text
+    exposition format, one series per cache (label `cache`)
+
+    Latency histograms are only exported for the caches that sample them.
+    """
+    caches = snapshot()
+    families = (
+        ("hits_total", "counter", "Lookups that found their key."),
+        ("misses_total", "counter", "Lookups that missed their key."),
+        ("puts_total", "counter", "Items stored."),
+        ("evictions_total", "counter", "Items dropped, by reason."),
+        ("items", "gauge", "Items currently stored."),
+        ("weight", "gauge", "Total weight of the stored items."),
+        ("operation_seconds", "histogram",
+         "Sampled duration of get and put calls."),
+    )
+    lines = []
+    for family, kind, text in families:
+        metric = "{}_{}".format(prefix, family)
+        samples = []
+        for name, stats in caches.items():
+            samples.extend(_samples(metric, family, name, stats))
+        if samples:
+            lines.append("# HELP {} {}".format(metric, text))
+            lines.append("# TYPE {} {}".format(metric, kind))
+            lines.extend(samples)
+    return "".join(line + "\n" for line in lines)
+
+
+def _samples(metric, family, name, stats):
+    """ Returns the lines of one metric family for one cache
+    """
+    cache = [("cache", name)]
+    if family == "evictions_total":
+        return [_sample(metric, cache + [("reason", reason)], count)
+                for reason, count in sorted(stats["evictions"].items())]
+    if family == "operation_seconds":
+        lines = []
+        for op, histogram in sorted(stats.get("latency", {}).items()):
+            labels = cache + [("op", op)]
+            for bound, count in histogram["buckets"]:
+                lines.append(_sample(metric + "_bucket",
+                                     labels + [("le", _number(bound))],
+                                     count))
+            lines.append(_sample(metric + "_sum", labels, histogram["sum"]))
+            lines.append(_sample(metric + "_count", labels,
+                                 histogram["count"]))
+        return lines
+    value = stats[{"hits_total": "hits", "misses_total": "misses",
+                   "puts_total": "puts", "items": "size"}.get(family,
+                                                             family)]
+    if value is None:
+        return []
+    return [_sample(metric, cache, value)]
+
+
+def _sample(metric, labels, value):
+    """ Formats one sample line
+    """
+    return "{}{{{}}} {}".format(metric, ",".join(
+        '{}="{}"'.format(label, _escape(text)) for label, text in labels),
+        _number(value))
+
+
+def _escape(text):
+    """ Escapes a label value
+    """
+    return str(text).replace("\\", "\\\\").replace('"', '\\"').replace(
+        "\n", "\\n")
+
+
+def _number(value):
+    """ Formats a sample value or bucket bound
+    """
+    if value == float("inf"):
+        return "+Inf"
+    return repr(value)
+
+
+def _merge_histograms(histograms):
+    """ Adds up histogram snapshots with the same bounds
+    """
+    buckets = [[bound, 0] for bound, _ in histograms[0]["buckets"]]
+    for histogram in histograms:
+        if len(histogram["buckets"]) != len(buckets):
+            raise ValueError("histograms have different bounds")
+        for bucket, (_, count) in zip(buckets, histogram["buckets"]):
+            bucket[1] += count
+    return {"buckets": [tuple(bucket) for bucket in buckets],
+            "sum": sum(histogram["sum"] for histogram in histograms),
+            "count": sum(histogram["count"] for histogram in histograms)}
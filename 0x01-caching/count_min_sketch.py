@@ -0,0 +1,68 @@
+#!/usr/bin/python3
+""" CountMinSketch module
+"""
+
+
+class CountMinSketch():
+    """ Approximate access counts of many keys in a fixed amount of memory
+
+    Every key is counted in one counter of each of `depth` rows, picked by
+    a different hash per row; its estimate is the smallest of them, which
+    may overcount (collisions) but never undercounts. Counters saturate at
+    15, and all of them are halved once `sample_size` increments were
+    made, so old popularity fades away.
+    """
+    MAX_COUNT = 15
+    # Odd multipliers spreading the key's hash over the rows
+    SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F,
+             0x165667B19E3779F9, 0x27D4EB2F165667C5)
+
+    def __init__(self, width, depth=4, sample_size=None):
+        """ Initiliaze
+
+        Args:
+            width (int): The number of counters per row, rounded up to a
+            power of two.
+            depth (int): The number of rows (at most 4).
+            sample_size (int): The number of increments between two
+            halvings. Defaults to 10 times the width.
+        """
+        self.width = 1 << max(int(width) - 1, 1).bit_length()
+        self.depth = min(depth, len(self.SEEDS))
+        self.mask = self.width - 1
+        self.sample_size = sample_size or 10 * self.width
+        self.rows = [bytearray(self.width) for _ in range(self.depth)]
+        self.hashes = list(zip(self.rows, self.SEEDS))  # (row, seed)
+        self.additions = 0
+
+    def add(self, key):
+        """ Counts one access to `key`
+        """
+        h = hash(key) & 0xFFFFFFFFFFFFFFFF
+        mask = self.mask
+        for row, seed in self.hashes:
+            i = (h * seed >> 32) & mask
+            if row[i] < self.MAX_COUNT:
+                row[i] += 1
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self.halve()
+
+    def estimate(self, key):
+        """ Returns the approximate access count of `key`
+        """
+        h = hash(key) & 0xFFFFFFFFFFFFFFFF
+        mask = self.mask
+        count = self.MAX_COUNT
+        for row, seed in self.hashes:
+            counter = row[(h * seed >> 32) & mask]
+            if counter < count:
+                count = counter
+        return count
+
+    def halve(self):
+        """ Halves every counter
+        """
+        for row in self.rows:
+            row[:] = bytes(count >> 1 for count in row)
+        self.additions //= 2
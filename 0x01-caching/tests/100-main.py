@@ -38,3 +38,44 @@ my_cache.put("L", "L")
 my_cache.print_cache()
 my_cache.put("M", "M")
 my_cache.print_cache()
+
+
+def buckets(cache):
+    """ The keys of each frequency bucket, least recently used first """
+    return {freq: list(keys) for freq, keys in sorted(cache.buckets.items())}
+
+
+# ties between keys of the same frequency go to the least recently used
+my_cache = LFUCache(max_items=3)
+for key in ("A", "B", "C"):
+    my_cache.put(key, key.lower())
+my_cache.get("B")
+my_cache.get("A")
+print(buckets(my_cache), my_cache.min_freq)
+my_cache.put("D", "d")
+print(buckets(my_cache), my_cache.min_freq)
+my_cache.get("D")
+my_cache.put("E", "e")
+print(buckets(my_cache), my_cache.min_freq)
+
+
+class AgingLFUCache(LFUCache):
+    """ An LFU cache halving its frequencies every 6 operations """
+    AGING_PERIOD = 6
+
+
+# aging halves the frequencies so that keys hot long ago can be evicted
+my_cache = AgingLFUCache(max_items=3)
+my_cache.put("A", "a")
+for _ in range(4):
+    my_cache.get("A")
+my_cache.put("B", "b")
+print(buckets(my_cache), my_cache.operations)
+my_cache.put("C", "c")
+my_cache.get("C")
+my_cache.get("C")
+print(buckets(my_cache), my_cache.operations)
+my_cache.age()
+print(buckets(my_cache), my_cache.min_freq)
+my_cache.put("D", "d")
+print(buckets(my_cache))
@@ -0,0 +1,54 @@
+#!/usr/bin/python3
+""" 101-main """
+ARCCache = __import__('101-arc_cache').ARCCache
+
+my_cache = ARCCache()
+my_cache.put("A", "Hello")
+my_cache.put("B", "World")
+my_cache.put("C", "Holberton")
+my_cache.put("D", "School")
+my_cache.print_cache()
+print(my_cache.get("B"))
+my_cache.put("E", "Battery")
+my_cache.print_cache()
+my_cache.put("C", "Street")
+my_cache.print_cache()
+print(my_cache.get("A"))
+print(my_cache.get("B"))
+print(my_cache.get("C"))
+my_cache.put("F", "Mission")
+my_cache.print_cache()
+my_cache.put("G", "San Francisco")
+my_cache.print_cache()
+my_cache.put("H", "H")
+my_cache.print_cache()
+my_cache.put("I", "I")
+my_cache.print_cache()
+my_cache.put("J", "J")
+my_cache.print_cache()
+my_cache.put("K", "K")
+my_cache.print_cache()
+
+# A hit in a ghost list moves the target size of T1 (p) towards that list
+
+
+def lists(cache):
+    """ T1, T2, B1 and B2, least recently used first, and p """
+    return (list(cache.recent), list(cache.frequent),
+            list(cache.recent_ghosts), list(cache.frequent_ghosts),
+            cache.target)
+
+
+my_cache = ARCCache(max_items=4)
+for key in ("A", "B", "C", "D"):
+    my_cache.put(key, key.lower())
+my_cache.get("A")
+my_cache.get("B")
+my_cache.put("E", "e")
+print(lists(my_cache))
+my_cache.put("C", "c")  # in B1: p grows
+print(lists(my_cache))
+my_cache.put("F", "f")
+print(lists(my_cache))
+my_cache.put("A", "a")  # in B2: p shrinks
+print(lists(my_cache))
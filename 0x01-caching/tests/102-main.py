@@ -0,0 +1,54 @@
+#!/usr/bin/python3
+""" 102-main """
+TwoQueueCache = __import__('102-2q_cache').TwoQueueCache
+
+my_cache = TwoQueueCache()
+my_cache.put("A", "Hello")
+my_cache.put("B", "World")
+my_cache.put("C", "Holberton")
+my_cache.put("D", "School")
+my_cache.print_cache()
+print(my_cache.get("B"))
+my_cache.put("E", "Battery")
+my_cache.print_cache()
+my_cache.put("C", "Street")
+my_cache.print_cache()
+print(my_cache.get("A"))
+print(my_cache.get("B"))
+print(my_cache.get("C"))
+my_cache.put("F", "Mission")
+my_cache.print_cache()
+my_cache.put("G", "San Francisco")
+my_cache.print_cache()
+my_cache.put("H", "H")
+my_cache.print_cache()
+my_cache.put("I", "I")
+my_cache.print_cache()
+my_cache.put("J", "J")
+my_cache.print_cache()
+my_cache.put("K", "K")
+my_cache.print_cache()
+
+# Keys go from A1in to A1out, and only reach Am when put again from A1out
+
+
+def queues(cache):
+    """ A1in, A1out and Am, oldest first """
+    return list(cache.incoming), list(cache.outgoing), list(cache.main)
+
+
+my_cache = TwoQueueCache(max_items=4)
+for key in ("A", "B", "C", "D"):
+    my_cache.put(key, key.lower())
+my_cache.get("B")  # hits in A1in do not promote
+my_cache.put("E", "e")
+print(queues(my_cache))
+print(my_cache.get("A"))
+my_cache.put("A", "a")  # remembered in A1out: promoted to Am
+print(queues(my_cache))
+my_cache.put("F", "f")
+my_cache.put("G", "g")
+print(queues(my_cache))
+my_cache.put("C", "c")
+my_cache.get("A")
+print(queues(my_cache))
@@ -0,0 +1,56 @@
+#!/usr/bin/python3
+""" 103-main """
+TinyLFUCache = __import__('103-tinylfu_cache').TinyLFUCache
+
+my_cache = TinyLFUCache()
+my_cache.put("A", "Hello")
+my_cache.put("B", "World")
+my_cache.put("C", "Holberton")
+my_cache.put("D", "School")
+my_cache.print_cache()
+print(my_cache.get("B"))
+my_cache.put("E", "Battery")
+my_cache.print_cache()
+my_cache.put("C", "Street")
+my_cache.print_cache()
+print(my_cache.get("A"))
+print(my_cache.get("B"))
+print(my_cache.get("C"))
+my_cache.put("F", "Mission")
+my_cache.print_cache()
+my_cache.put("G", "San Francisco")
+my_cache.print_cache()
+my_cache.put("H", "H")
+my_cache.print_cache()
+my_cache.put("I", "I")
+my_cache.print_cache()
+my_cache.put("J", "J")
+my_cache.print_cache()
+my_cache.put("K", "K")
+my_cache.print_cache()
+
+# The admission filter keeps keys used once out of the main cache
+
+
+def segments(cache):
+    """ window, probation and protected, least recently used first """
+    return (list(cache.window), list(cache.probation),
+            list(cache.protected))
+
+
+my_cache = TinyLFUCache(max_items=5)
+for key in ("A", "B", "C", "D"):
+    my_cache.put(key, key.lower())
+for key in ("A", "B", "C", "D"):
+    my_cache.get(key)
+print(segments(my_cache))
+for key in range(3):
+    my_cache.put("scan {}".format(key), key)  # each one only used once
+print(segments(my_cache))
+
+# a key used more often than the victim is admitted
+for _ in range(4):
+    my_cache.get("F")
+my_cache.put("F", "f")
+my_cache.put("G", "g")
+print(segments(my_cache))
@@ -28,3 +28,18 @@ my_cache.put("J", "J")
 my_cache.print_cache()
 my_cache.put("K", "K")
 my_cache.print_cache()
+
+# replacement order, and recency updates by get and by putting a key again
+my_cache = LRUCache(max_items=3)
+for key in ("A", "B", "C"):
+    my_cache.put(key, key.lower())
+print(list(my_cache.cache_order))
+my_cache.get("A")
+print(list(my_cache.cache_order))
+my_cache.put("B", "b2")
+print(list(my_cache.cache_order), my_cache.get("B"))
+my_cache.put("D", "d")
+print(list(my_cache.cache_order))
+my_cache.put("E", "e")
+print(list(my_cache.cache_order))
+print(my_cache.stats()["evictions"]["capacity"])
@@ -0,0 +1,51 @@
+#!/usr/bin/python3
+""" 5-main """
+import threading
+
+ShardedCache = __import__('5-sharded_cache').ShardedCache
+LFUCache = __import__('100-lfu_cache').LFUCache
+
+my_cache = ShardedCache(shards=2)
+for key in range(6):
+    my_cache.put(key, "item {}".format(key))
+my_cache.print_cache()
+print(my_cache.get(4))
+my_cache.put(6, "item 6")
+my_cache.put(7, "item 7")
+my_cache.print_cache()
+
+my_cache = ShardedCache(LFUCache, shards=4, max_items=100)
+
+
+def work(start):
+    for key in range(start, start + 1000):
+        my_cache.put(key % 100, key)
+        my_cache.get(key % 50)
+
+
+threads = [threading.Thread(target=work, args=(i * 1000,)) for i in range(8)]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+print(len(my_cache.cache_data))
+stats = my_cache.stats()
+print(stats["puts"], stats["hits"] + stats["misses"], stats["size"])
+
+my_cache = ShardedCache(max_items=4, max_weight=100, sizer=len)
+for key in range(8):
+    my_cache.put(key, "x" * 20)
+stats = my_cache.stats()
+print(len(my_cache.shards), stats["size"], stats["weight"], my_cache.weight)
+
+# max_weight alone bounds the cache, softly: each shard keeps one item
+# heavier than its share
+my_cache = ShardedCache(shards=2, max_weight=100, sizer=len)
+for key in range(8):
+    my_cache.put(key, "x" * 20)
+stats = my_cache.stats()
+print(stats["size"], stats["weight"])
+for key in (8, 9):
+    my_cache.put(key, "x" * 80)
+stats = my_cache.stats()
+print([len(shard.cache_data) for shard in my_cache.shards], stats["weight"])
@@ -0,0 +1,207 @@
+#!/usr/bin/python3
+""" base_caching-main """
+BasicCache = __import__('0-basic_cache').BasicCache
+FIFOCache = __import__('1-fifo_cache').FIFOCache
+LIFOCache = __import__('2-lifo_cache').LIFOCache
+LRUCache = __import__('3-lru_cache').LRUCache
+MRUCache = __import__('4-mru_cache').MRUCache
+LFUCache = __import__('100-lfu_cache').LFUCache
+
+
+class Clock():
+    """ A clock moved by hand """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+for cache_class in (BasicCache, FIFOCache, LIFOCache, LRUCache, MRUCache,
+                    LFUCache):
+    print(cache_class.__name__)
+    clock = Clock()
+    my_cache = cache_class(max_items=4, default_ttl=10, clock=clock)
+
+    # Per-entry ttl and default_ttl
+    my_cache.put("A", "short", ttl=2)
+    my_cache.put("B", "default")
+    my_cache.put("C", "long", ttl=100)
+    clock.now = 3
+    print(my_cache.get("A"), my_cache.get("B"))
+
+    # Putting a key again restarts its ttl
+    my_cache.put("B", "again", ttl=20)
+    clock.now = 15
+    print(my_cache.get("B"), my_cache.get("C"))
+
+    # The timer wheel drops expired items without them being read
+    my_cache.put("D", "soon", ttl=1)
+    my_cache.put("E", "soon", ttl=1)
+    clock.now = 40
+    my_cache.put("F", "new")
+    my_cache.print_cache()
+    print(len(my_cache.deadlines), len(my_cache.timers))
+
+    # Expired items make room without evicting the others
+    my_cache.put("G", "short", ttl=1)
+    my_cache.put("H", "short", ttl=1)
+    clock.now = 42
+    my_cache.put("I", "new")
+    my_cache.put("J", "new")
+    my_cache.print_cache()
+
+# Single-flight loads
+import asyncio
+import threading
+
+
+class CountingCache(LRUCache):
+    """ Counts the lookups of get_or_load """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.claims = 0
+
+    def _claim(self, *args):
+        claimed = super()._claim(*args)
+        with self.lock:
+            self.claims += 1
+        return claimed
+
+
+def run_threads(target, count):
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(target()))
+               for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+# 1- concurrent callers run one loader and share its item
+my_cache = CountingCache(max_items=4)
+calls = []
+
+
+def load(key):
+    calls.append(key)
+    while my_cache.claims < 8:
+        pass
+    return "loaded " + key
+
+
+print(set(run_threads(lambda: my_cache.get_or_load("A", load), 8)),
+      len(calls))
+
+
+# 2- the loader's error reaches every caller and is not cached
+my_cache = CountingCache(max_items=4)
+calls = []
+
+
+def fail(key):
+    calls.append(key)
+    while my_cache.claims < 8:
+        pass
+    raise KeyError(key)
+
+
+def call():
+    try:
+        return my_cache.get_or_load("A", fail)
+    except KeyError as error:
+        return error
+
+
+errors = run_threads(call, 8)
+print(len(errors), len(set(map(id, errors))), len(calls),
+      my_cache.get("A"), my_cache.flights)
+
+# 3- refresh_after returns the stale item and loads it again behind
+clock = Clock()
+my_cache = LRUCache(max_items=4, clock=clock)
+versions = iter(range(1, 10))
+print(my_cache.get_or_load("A", lambda key: next(versions)))
+clock.now = 4
+print(my_cache.get_or_load("A", lambda key: next(versions), refresh_after=5))
+clock.now = 6
+print(my_cache.get_or_load("A", lambda key: next(versions), refresh_after=5))
+flight = my_cache.flights.get("A")
+if flight is not None:
+    flight.result()
+print(my_cache.get("A"))
+
+
+# 4- the same with coroutines
+async def aload(key):
+    calls.append(key)
+    while my_cache.claims < 5:
+        await asyncio.sleep(0)
+    return "loaded " + key
+
+
+async def afail(key):
+    calls.append(key)
+    await asyncio.sleep(0)
+    raise KeyError(key)
+
+
+async def main():
+    global my_cache, calls
+    my_cache = CountingCache(max_items=4)
+    calls = []
+    results = await asyncio.gather(
+        *(my_cache.aget_or_load("A", aload) for _ in range(5)))
+    print(set(results), len(calls))
+
+    calls = []
+    errors = await asyncio.gather(
+        *(my_cache.aget_or_load("B", afail) for _ in range(5)),
+        return_exceptions=True)
+    print([type(error).__name__ for error in errors], len(calls))
+
+    # a sync caller on the loop cannot wait for the loop's own load
+    release = asyncio.Event()
+
+    async def slow(key):
+        await release.wait()
+        return "slow"
+
+    task = asyncio.ensure_future(my_cache.aget_or_load("C", slow))
+    await asyncio.sleep(0)
+    try:
+        my_cache.get_or_load("C", lambda key: "sync")
+    except RuntimeError as error:
+        print("RuntimeError:", error)
+    release.set()
+    print(await task)
+
+    clock.now = 0
+    my_cache = LRUCache(max_items=4, clock=clock)
+    versions = iter(range(1, 10))
+
+    async def version(key):
+        return next(versions)
+
+    print(await my_cache.aget_or_load("A", version))
+    clock.now = 6
+    print(await my_cache.aget_or_load("A", version, refresh_after=5))
+    await asyncio.gather(*my_cache.refreshes)
+    print(my_cache.get("A"))
+
+
+asyncio.run(main())
+
+# Caches bounded by weight alone
+my_cache = LRUCache(max_weight=100, sizer=len)
+for key in range(10):
+    my_cache.put(key, "x" * 10)
+print(my_cache.max_items, len(my_cache.cache_data), my_cache.weight)
+my_cache.put("big", "x" * 25)
+print(len(my_cache.cache_data), my_cache.weight)
+my_cache.put("huge", "x" * 150)
+print(list(my_cache.cache_data), my_cache.weight)
@@ -0,0 +1,92 @@
+#!/usr/bin/python3
+""" cache_stats-main """
+import gc
+
+cache_stats = __import__('cache_stats')
+LRUCache = __import__('3-lru_cache').LRUCache
+ShardedCache = __import__('5-sharded_cache').ShardedCache
+
+# 1- get and put are sampled one call out of `every` each
+my_cache = LRUCache(max_items=100)
+my_cache.sample_latency(every=4)
+for key in range(40):
+    my_cache.put(key, "x")
+for key in range(4):
+    my_cache.get(key)
+latency = my_cache.stats()["latency"]
+print(latency["put"]["count"], latency["get"]["count"])
+
+# 2- histograms count durations up to each bound
+histogram = cache_stats.LatencyHistogram((0.001, 0.01))
+for seconds in (0.0005, 0.001, 0.005, 0.5):
+    histogram.observe(seconds)
+print(histogram.snapshot())
+
+# 3- the histograms of the shards add up
+my_cache = ShardedCache(LRUCache, shards=4, max_items=100)
+my_cache.sample_latency(every=1)
+for key in range(100):
+    my_cache.put(key, "x")
+    my_cache.get(key)
+    my_cache.get(key + 1000)
+stats = my_cache.stats()
+print(stats["hits"], stats["misses"], stats["latency"]["get"]["count"],
+      stats["latency"]["put"]["count"],
+      stats["latency"]["get"]["buckets"][-1])
+
+shard_stats = [shard.stats() for shard in my_cache.shards]
+shard_stats[0]["latency"]["get"]["buckets"].pop()
+try:
+    cache_stats.merge(shard_stats)
+except ValueError as error:
+    print("ValueError:", error)
+
+# 4- registered caches are exported in the Prometheus text format
+first = cache_stats.register("first", LRUCache(max_items=2))
+second = cache_stats.register(
+    "second", LRUCache(max_items=2, max_weight=10, sizer=len))
+for key in ("A", "B", "C"):
+    first.put(key, "x")
+first.get("A")
+first.get("C")
+second.put("A", "xyz")
+second.sample_latency(every=1000, bounds=(0.001, 0.01))
+second.latencies["get"].observe(0.0005)
+second.latencies["get"].observe(0.005)
+second.latencies["put"].observe(0.05)
+print(cache_stats.prometheus(), end="")
+print(sorted(cache_stats.snapshot()))
+
+# 5- unregistered or collected caches are not exported any more
+cache_stats.unregister("first")
+del second
+gc.collect()
+print(cache_stats.snapshot(), repr(cache_stats.prometheus()))
+
+# 6- an override calling super().get() or super().put() counts once
+
+
+class TracedCache(LRUCache):
+    """ An LRU cache whose get and put log their keys """
+
+    def get(self, key):
+        """ Logs, then gets """
+        self.log.append(("get", key))
+        return super().get(key)
+
+    def put(self, key, item, ttl=None):
+        """ Logs, then puts """
+        self.log.append(("put", key))
+        super().put(key, item, ttl)
+
+
+my_cache = TracedCache(max_items=10)
+my_cache.log = []
+my_cache.sample_latency(every=1)
+my_cache.put("A", "x")
+my_cache.get("A")
+my_cache.get("B")
+stats = my_cache.stats()
+print(stats["hits"], stats["misses"], stats["puts"],
+      stats["latency"]["get"]["count"], stats["latency"]["put"]["count"],
+      len(my_cache.log))
@@ -0,0 +1,131 @@
+#!/usr/bin/python3
+""" TimerWheel module
+"""
+import math
+
+
+class TimerWheel():
+    """ Hierarchical timer wheel: finds the keys whose deadline passed
+    without looking at the others
+
+    Time is counted in ticks. Level 0 has one slot per tick; every slot of
+    level L covers `slots ** L` ticks. A key is filed at the lowest level
+    whose range reaches its deadline, and moves down a level each time the
+    wheel reaches its slot, so scheduling, cancelling and expiring a key
+    are O(1) (plus at most `levels` moves). Deadlines beyond the top level
+    wait in an overflow slot.
+    """
+
+    def __init__(self, start=0.0, tick=1.0, slots=64, levels=4):
+        """ Initiliaze
+
+        Args:
+            start (float): The current time.
+            tick (float): The resolution of the wheel, in time units.
+            Keys expire at the first tick at or after their deadline.
+            slots (int): The number of slots per level.
+            levels (int): The number of levels.
+        """
+        self.tick = tick
+        self.slots = slots
+        self.levels = levels
+        self.now = math.floor(start / tick)  # current time, in ticks
+        self.wheels = [[{} for _ in range(slots)] for _ in range(levels)]
+        self.sizes = [0] * (levels + 1)  # keys per level, overflow last
+        self.overflow = {}
+        self.where = {}  # key -> (level, slot)
+
+    def __len__(self):
+        """ Number of scheduled keys
+        """
+        return len(self.where)
+
+    def schedule(self, key, deadline):
+        """ Schedules `key` to expire at `deadline`, replacing any earlier
+        schedule of the same key
+        """
+        self.cancel(key)
+        self._file(key, math.ceil(deadline / self.tick))
+
+    def cancel(self, key):
+        """ Unschedules `key`, if it is scheduled
+        """
+        where = self.where.pop(key, None)
+        if where is not None:
+            level, slot = where
+            del slot[key]
+            self.sizes[level] -= 1
+
+    def advance(self, now):
+        """ Moves the wheel to time `now`
+
+        Returns:
+            list: The keys whose deadline passed, which are unscheduled.
+        """
+        target = math.floor(now / self.tick)
+        expired = []
+        while self.now < target:
+            if not self.where:
+                self.now = target
+                break
+            # Jump over the ticks where no slot can be reached: up to the
+            # next boundary of the lowest level holding keys.
+            span = 1
+            for level in range(self.levels):
+                if self.sizes[level]:
+                    break
+                span *= self.slots
+            boundary = (self.now // span + 1) * span
+            if boundary > target:
+                self.now = target
+                break
+            self.now = boundary
+            self._cascade(expired)
+            slot = self.wheels[0][self.now % self.slots]
+            for key in slot:
+                del self.where[key]
+                expired.append(key)
+            self.sizes[0] -= len(slot)
+            slot.clear()
+        return expired
+
+    def _cascade(self, expired):
+        """ Files again the keys of the higher level slots reached at the
+        current tick
+        """
+        span = 1
+        for level in range(1, self.levels + 1):
+            span *= self.slots
+            if self.now % span:
+                return
+            if level == self.levels:
+                slot = self.overflow
+            else:
+                slot = self.wheels[level][(self.now // span) % self.slots]
+            self.sizes[level] -= len(slot)
+            keys = list(slot.items())
+            slot.clear()
+            for key, deadline in keys:
+                del self.where[key]
+                if deadline <= self.now:
+                    expired.append(key)
+                else:
+                    self._file(key, deadline)
+
+    def _file(self, key, deadline):
+        """ Files `key` in the slot that will be reached at `deadline`
+        (in ticks)
+        """
+        deadline = max(deadline, self.now + 1)
+        delta = deadline - self.now
+        span = 1
+        for level in range(self.levels):
+            if delta < span * self.slots:
+                slot = self.wheels[level][(deadline // span) % self.slots]
+                break
+            span *= self.slots
+        else:
+            level, slot = self.levels, self.overflow
+        slot[key] = deadline
+        self.sizes[level] += 1
+        self.where[key] = (level, slot)